@@ -12,7 +12,7 @@ from pathlib import Path
 from .config import default_config_home, load_config
 from .control.translator_build import build_translator
 from .controller import SidecarController
-from .server import SidecarServer
+from .server import SERVER_CORES, SidecarServer
 from .watcher import HttpIngestClient, RolloutWatcher
 
 
@@ -48,10 +48,17 @@ def _parse_args(argv):
     )
     p.add_argument("--host", default="127.0.0.1", help="本地服务监听地址（默认: 127.0.0.1）")
     p.add_argument("--port", type=int, default=8787, help="本地服务端口（默认: 8787）")
+    p.add_argument(
+        "--server-core",
+        choices=SERVER_CORES,
+        default="threading",
+        help="本地服务实现：threading（每连接一个线程，默认）或 asyncio（SSE 为协程、API 走有界线程池）",
+    )
     p.add_argument("--max-messages", type=int, default=1000, help="内存中保留的最近消息条数（默认: 1000）")
     p.add_argument("--replay-last-lines", type=int, default=200, help="启动时从文件尾部回放的行数（默认: 200）")
     p.add_argument("--poll-interval", type=float, default=0.5, help="轮询间隔秒数（默认: 0.5）")
     p.add_argument("--file-scan-interval", type=float, default=2.0, help="扫描最新会话文件的间隔秒数（默认: 2.0）")
+    p.add_argument("--no-fs-events", action="store_true", help="禁用 inotify 事件驱动 tail，始终按 --poll-interval 轮询")
     p.add_argument("--follow-codex-process", action="store_true", help="优先基于 Codex 进程定位当前 rollout 文件（WSL2/Linux）")
     p.add_argument("--codex-process-regex", default=None, help="匹配 Codex 进程 cmdline 的正则（默认: codex）")
     p.add_argument("--allow-follow-without-process", action="store_true", help="允许在未检测到 Codex 进程时仍按 sessions 扫描回退")
@@ -116,7 +123,7 @@ def main(argv=None) -> int:
             lock_fh = None
 
         server_url = server_url or f"http://{args.host}:{args.port}"
-        server = SidecarServer(host=args.host, port=args.port, max_messages=args.max_messages)
+        server = SidecarServer(host=args.host, port=args.port, max_messages=args.max_messages, core=args.server_core)
         controller = SidecarController(config_home=config_home, server_url=server_url, state=server.state)
         # Apply CLI runtime overrides before the HTTP server starts, so /api/config and
         # offline endpoints immediately reflect the desired CODEX_HOME even in --ui mode.
@@ -130,6 +137,8 @@ def main(argv=None) -> int:
                 patch["poll_interval"] = float(args.poll_interval)
             if _argv_has("--file-scan-interval"):
                 patch["file_scan_interval"] = float(args.file_scan_interval)
+            if _argv_has("--no-fs-events"):
+                patch["watch_fs_events"] = False
             if _argv_has("--follow-codex-process"):
                 patch["follow_codex_process"] = True
             if _argv_has("--codex-process-regex"):
@@ -195,7 +204,8 @@ def main(argv=None) -> int:
             stop_event.wait()
         else:
             # no-server mode: behave like the original watcher-only sidecar.
-            ingest = HttpIngestClient(server_url=server_url)
+            # External server: buffer messages and POST them as NDJSON batches (/ingest/batch).
+            ingest = HttpIngestClient(server_url=server_url, batch_max=256, batch_interval_s=0.02)
             cfg = load_config(config_home)
             translator = build_translator(cfg)
             watcher = RolloutWatcher(
@@ -210,10 +220,19 @@ def main(argv=None) -> int:
                 follow_codex_process=bool(args.follow_codex_process),
                 codex_process_regex=str(args.codex_process_regex or "codex"),
                 only_follow_when_process=not bool(args.allow_follow_without_process),
+                fs_events=not bool(args.no_fs_events),
             )
-            watcher.run(stop_event=stop_event)
+            try:
+                watcher.run(stop_event=stop_event)
+            finally:
+                ingest.flush()
     finally:
         stop_event.set()
+        if controller is not None:
+            try:
+                controller.close()
+            except Exception:
+                pass
         if server is not None:
             server.shutdown()
             # Give the server a moment to exit cleanly.
@@ -42,7 +42,11 @@ class SidecarConfig:
     watch_max_sessions: int = 3
     poll_interval: float = 0.5
     file_scan_interval: float = 2.0
+    # Linux 下用 inotify 事件驱动 tail（不可用或 WSL /mnt 等文件系统时自动回退轮询）。
+    watch_fs_events: bool = True
     max_messages: int = 1000
+    # 离线会话解析缓存的内存预算（MB，按消息文本估算；0 = 不缓存）。
+    offline_cache_mb: int = 64
 
     # UI 友好：自动开始监听（通常用于 /ui 模式）。
     auto_start: bool = True
@@ -120,6 +124,9 @@ class SidecarConfig:
         if only_follow_when_process is None:
             only_follow_when_process = True
 
+        watch_fs_events_raw = d.get("watch_fs_events")
+        watch_fs_events = True if watch_fs_events_raw is None else bool(watch_fs_events_raw)
+
         auto_start_raw = d.get("auto_start")
         auto_start = True if auto_start_raw is None else bool(auto_start_raw)
 
@@ -139,7 +146,9 @@ class SidecarConfig:
             watch_max_sessions=_to_int(d.get("watch_max_sessions") or d.get("max_sessions"), 3),
             poll_interval=_to_float(d.get("poll_interval"), 0.5),
             file_scan_interval=_to_float(d.get("file_scan_interval"), 2.0),
+            watch_fs_events=watch_fs_events,
             max_messages=_to_int(d.get("max_messages"), 1000),
+            offline_cache_mb=_to_int(d.get("offline_cache_mb"), 64),
             auto_start=auto_start,
             follow_codex_process=bool(d.get("follow_codex_process") or False),
             codex_process_regex=str(d.get("codex_process_regex") or "codex"),
@@ -197,7 +206,9 @@ def default_config(config_home: Path) -> SidecarConfig:
         watch_max_sessions=3,
         poll_interval=0.5,
         file_scan_interval=2.0,
+        watch_fs_events=True,
         max_messages=1000,
+        offline_cache_mb=64,
         auto_start=True,
         follow_codex_process=False,
         codex_process_regex="codex",
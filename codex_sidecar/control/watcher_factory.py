@@ -3,6 +3,8 @@ from typing import Callable, Optional, Set
 
 from ..config import SidecarConfig
 from ..translator import Translator
+from ..watch.ingest_client import IngestSink
+from ..watch.session_catalog import open_session_catalog
 from ..watcher import HttpIngestClient, RolloutWatcher
 
 
@@ -17,6 +19,7 @@ def build_rollout_watcher(
     pinned_file: str,
     exclude_keys: Set[str],
     exclude_files: Set[str],
+    ingest: Optional[IngestSink] = None,
 ) -> RolloutWatcher:
     """
     构建 RolloutWatcher 并注入运行态 follow 状态（pin/excludes）。
@@ -24,6 +27,7 @@ def build_rollout_watcher(
     设计目标：
     - 将 controller 中的“组装代码”抽离到 control 层，降低 controller_core 耦合与体积。
     - 保持对外行为不变（参数透传与 runtime follow 逻辑等价于历史实现）。
+    - ingest 为空时回退到 HttpIngestClient(server_url)；同进程时由 controller 注入进程内 sink。
     """
     tr = None
     try:
@@ -33,9 +37,14 @@ def build_rollout_watcher(
     if tr is None:
         tr = build_translator_fallback(cfg)
 
+    codex_home = Path(cfg.watch_codex_home).expanduser()
+    # Session lookups (latest / by thread) go through the persistent catalog when it can be opened.
+    cfg_home = str(getattr(cfg, "config_home", "") or "").strip()
+    if cfg_home:
+        open_session_catalog(config_home=Path(cfg_home), codex_home=codex_home)
     w = RolloutWatcher(
-        codex_home=Path(cfg.watch_codex_home).expanduser(),
-        ingest=HttpIngestClient(server_url=str(server_url or "")),
+        codex_home=codex_home,
+        ingest=ingest if ingest is not None else HttpIngestClient(server_url=str(server_url or "")),
         translator=tr,
         replay_last_lines=int(cfg.replay_last_lines),
         watch_max_sessions=int(getattr(cfg, "watch_max_sessions", 3) or 3),
@@ -45,6 +54,7 @@ def build_rollout_watcher(
         follow_codex_process=bool(getattr(cfg, "follow_codex_process", False)),
         codex_process_regex=str(getattr(cfg, "codex_process_regex", "codex") or "codex"),
         only_follow_when_process=bool(getattr(cfg, "only_follow_when_process", True)),
+        fs_events=bool(getattr(cfg, "watch_fs_events", True)),
     )
     try:
         w.set_follow(str(selection_mode or ""), thread_id=str(pinned_thread_id or ""), file=str(pinned_file or ""))
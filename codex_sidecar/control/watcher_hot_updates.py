@@ -56,7 +56,7 @@ def apply_watcher_hot_updates(
         pass
 
     # Hot-apply watcher runtime settings where it's safe (no full restart required).
-    # Note: watch_codex_home still requires stop/start to take effect.
+    # Note: watch_codex_home / watch_fs_events still require stop/start to take effect.
     try:
         watcher.set_watch_max_sessions(int(getattr(cfg, "watch_max_sessions", 3) or 3))
         watcher.set_replay_last_lines(int(getattr(cfg, "replay_last_lines", 0) or 0))
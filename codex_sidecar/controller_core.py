@@ -22,7 +22,7 @@ from .control.follow_control_api import (
 from .control.translator_meta import translator_error as _translator_error, translator_model as _translator_model
 from .control.watcher_lifecycle import request_stop_and_join as _request_stop_and_join
 from .translator import Translator
-from .watcher import HttpIngestClient, RolloutWatcher
+from .watcher import HttpIngestClient, LocalIngestClient, RolloutWatcher
 
 
 class SidecarController:
@@ -30,6 +30,9 @@ class SidecarController:
         self._config_home = config_home
         self._server_url = server_url
         self._state = state
+        # In-process ingest: the watcher runs next to SidecarState, so skip the loopback
+        # HTTP round trip per message. /ingest stays available for external producers.
+        self._ingest_sink: Optional[LocalIngestClient] = LocalIngestClient(state) if state is not None else None
 
         self._lock = threading.Lock()
         self._cfg: SidecarConfig = load_config(config_home)
@@ -183,7 +186,21 @@ class SidecarController:
             build_translator_fallback=_build_translator_impl,
         )
 
+    def _flush_ingest(self) -> None:
+        """
+        Apply everything the in-process sink already acknowledged (bounded wait).
+        """
+        sink = self._ingest_sink
+        if sink is None:
+            return
+        try:
+            sink.flush()
+        except Exception:
+            pass
+
     def clear_messages(self) -> None:
+        # Queued (already acknowledged) messages would otherwise reappear after the clear.
+        self._flush_ingest()
         try:
             self._state.clear()
         except Exception:
@@ -208,6 +225,8 @@ class SidecarController:
         )
 
     def start(self) -> Dict[str, Any]:
+        # Items queued by a previous watcher land before the new one starts.
+        self._flush_ingest()
         with self._lock:
             if self._thread is not None and self._thread.is_alive():
                 return {"ok": True, "running": True}
@@ -227,6 +246,7 @@ class SidecarController:
                 pinned_file=self._pinned_file,
                 exclude_keys=set(self._follow_exclude_keys or set()),
                 exclude_files=set(self._follow_exclude_files or set()),
+                ingest=self._ingest_sink,
             )
             self._stop_event = stop_event
             self._watcher = watcher
@@ -305,6 +325,7 @@ class SidecarController:
             t = self._thread
             ev = self._stop_event
         still_running = _request_stop_and_join(stop_event=ev, thread=t, join_timeout_s=2.0)
+        self._flush_ingest()
         if not still_running:
             with self._lock:
                 self._thread = None
@@ -357,6 +378,22 @@ class SidecarController:
             "config": cfg,
         }
 
+    def close(self) -> None:
+        """
+        Process exit: stop the watcher, then drain and stop the in-process ingest sink.
+        """
+        try:
+            self.stop()
+        except Exception:
+            pass
+        sink = self._ingest_sink
+        if sink is None:
+            return
+        try:
+            sink.close()
+        except Exception:
+            pass
+
     def request_shutdown(self) -> Dict[str, Any]:
         """
         Stop the watcher (if running) and request the whole sidecar process to exit.
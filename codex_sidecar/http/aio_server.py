@@ -0,0 +1,308 @@
+"""
+asyncio HTTP server core (alternative to ThreadingHTTPServer, `--server-core asyncio`).
+
+- One event-loop thread accepts connections and parses requests.
+- `/events` runs as one coroutine per client, woken by its subscriber queue (no OS thread
+  blocked per open tab).
+- Every other route runs the existing SidecarHandler (routes_get / routes_post) on a bounded
+  thread pool against in-memory rfile/wfile, so both cores serve identical responses.
+- Connections are kept alive (HTTP/1.1) with the handler's idle timeout and per-connection cap.
+"""
+
+import asyncio
+import io
+import queue
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from http import HTTPStatus
+from http.client import parse_headers
+from typing import Any, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from .handler import SidecarHandler
+from .sse import SSE_HEARTBEAT_S, SSE_RESPONSE_HEADERS, SseSession
+
+_MAX_HEADER_BYTES = 64 * 1024
+_MAX_BODY_BYTES = 64 * 1024 * 1024
+_READ_TIMEOUT_S = 30.0
+_API_WORKERS = 8
+
+
+def _simple_response(status: HTTPStatus, version: str = "HTTP/1.0") -> bytes:
+    body = f"{int(status)} {status.phrase}\n".encode("utf-8")
+    head = (
+        f"{version} {int(status)} {status.phrase}\r\n"
+        "Content-Type: text/plain; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+class AsyncSidecarHTTPServer:
+    """
+    Same surface as the ThreadingHTTPServer used by SidecarServer: `state` / `controller`
+    attributes (read by SidecarHandler via self.server), server_address, serve_forever(),
+    shutdown(), server_close().
+    """
+
+    def __init__(self, server_address: Tuple[str, int], *, max_workers: int = _API_WORKERS) -> None:
+        host, port = server_address
+        family = socket.AF_INET6 if ":" in str(host or "") else socket.AF_INET
+        # create_server sets SO_REUSEADDR on POSIX (quick restarts, same as _ReuseHTTPServer).
+        self._sock = socket.create_server((host, int(port)), family=family, backlog=128)
+        self.server_address = self._sock.getsockname()[:2]
+        self.state: Any = None
+        self.controller: Any = None
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="sidecar-api")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._conns: Set["asyncio.Task[Any]"] = set()
+        self._ready = threading.Event()
+        self._stopped = threading.Event()
+
+    def serve_forever(self) -> None:
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._serve())
+        finally:
+            try:
+                loop.close()
+            finally:
+                self._stopped.set()
+
+    def shutdown(self) -> None:
+        if not self._ready.wait(timeout=2.0):
+            return
+        loop = self._loop
+        stop = self._stop
+        if loop is None or stop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(stop.set)
+        except RuntimeError:
+            return
+        self._stopped.wait(timeout=2.0)
+
+    def server_close(self) -> None:
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+        self._executor.shutdown(wait=False)
+
+    async def _serve(self) -> None:
+        self._stop = asyncio.Event()
+        srv = await asyncio.start_server(self._on_client, sock=self._sock, limit=_MAX_HEADER_BYTES)
+        self._ready.set()
+        try:
+            await self._stop.wait()
+        finally:
+            srv.close()
+            conns = list(self._conns)
+            for t in conns:
+                t.cancel()
+            if conns:
+                await asyncio.gather(*conns, return_exceptions=True)
+            try:
+                await asyncio.wait_for(srv.wait_closed(), timeout=1.0)
+            except Exception:
+                pass
+
+    async def _on_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._conns.add(task)
+        try:
+            # Keep-alive: serve requests on this connection until one asks to close, the
+            # per-connection cap is reached or the client stays idle past SidecarHandler.timeout.
+            served = 0
+            cap = max(1, int(SidecarHandler.max_requests_per_connection or 1))
+            while served < cap:
+                idle_s = _READ_TIMEOUT_S if served == 0 else float(SidecarHandler.timeout or _READ_TIMEOUT_S)
+                keep = await self._handle_request(reader, writer, served=served, idle_s=idle_s)
+                served += 1
+                if not keep:
+                    break
+        except (asyncio.CancelledError, ConnectionError):
+            pass
+        except Exception:
+            pass
+        finally:
+            if task is not None:
+                self._conns.discard(task)
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _handle_request(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        *,
+        served: int = 0,
+        idle_s: float = _READ_TIMEOUT_S,
+    ) -> bool:
+        """
+        Serve one request; returns True when the connection may carry another one.
+        """
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), idle_s)
+        except asyncio.LimitOverrunError:
+            writer.write(_simple_response(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE))
+            await writer.drain()
+            return False
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            return False
+        line, _, rest = head.partition(b"\r\n")
+        parts = line.decode("latin-1", errors="replace").split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+            writer.write(_simple_response(HTTPStatus.BAD_REQUEST))
+            await writer.drain()
+            return False
+        method, target, version = parts
+        headers = parse_headers(io.BytesIO(rest))
+        te = str(headers.get("Transfer-Encoding") or "").strip().lower()
+        if te and te != "identity":
+            # Chunked request bodies are not supported (the body boundary is unknown).
+            writer.write(_simple_response(HTTPStatus.NOT_IMPLEMENTED))
+            await writer.drain()
+            return False
+        try:
+            length = int(headers.get("Content-Length") or "0")
+        except ValueError:
+            length = -1
+        if length < 0:
+            writer.write(_simple_response(HTTPStatus.BAD_REQUEST))
+            await writer.drain()
+            return False
+        if length > _MAX_BODY_BYTES:
+            writer.write(_simple_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE))
+            await writer.drain()
+            return False
+        body = b""
+        if length:
+            try:
+                body = await asyncio.wait_for(reader.readexactly(length), _READ_TIMEOUT_S)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                return False
+
+        if method == "GET" and urlparse(target).path == "/events":
+            await self._serve_sse(reader, writer, target, headers)
+            # The stream has no Content-Length: it ends with the connection.
+            return False
+
+        peer = writer.get_extra_info("peername") or ("", 0)
+        loop = asyncio.get_running_loop()
+        out, close = await loop.run_in_executor(
+            self._executor, self._run_handler, method, target, version, headers, body, peer, served
+        )
+        writer.write(out)
+        await writer.drain()
+        return not close
+
+    def _run_handler(
+        self, method: str, target: str, version: str, headers: Any, body: bytes, peer: Any, served: int = 0
+    ) -> Tuple[bytes, bool]:
+        """
+        Run SidecarHandler.do_<METHOD> against in-memory streams.
+
+        Returns (raw response, close_connection).
+        """
+        h = SidecarHandler.__new__(SidecarHandler)
+        h.server = self  # type: ignore[assignment]
+        h.client_address = tuple(peer[:2]) if isinstance(peer, tuple) else ("", 0)
+        h.command = method
+        h.path = target
+        h.request_version = version
+        h.requestline = f"{method} {target} {version}"
+        h.headers = headers
+        h.rfile = io.BytesIO(body)  # type: ignore[assignment]
+        h.wfile = io.BytesIO()  # type: ignore[assignment]
+        # Same defaults as BaseHTTPRequestHandler.parse_request (send_header may still flip it).
+        conntype = str(headers.get("Connection") or "").strip().lower()
+        if conntype == "close":
+            h.close_connection = True
+        elif conntype == "keep-alive" or version >= "HTTP/1.1":
+            h.close_connection = False
+        else:
+            h.close_connection = True
+        # Responses already sent on this connection (SidecarHandler.send_response enforces the cap).
+        h._responses = int(served or 0)
+        try:
+            fn = getattr(h, "do_" + method, None)
+            if fn is None:
+                h.send_error(HTTPStatus.NOT_IMPLEMENTED, f"Unsupported method ({method!r})")
+            else:
+                fn()
+        except Exception:
+            if not h.wfile.getvalue():  # type: ignore[attr-defined]
+                return _simple_response(HTTPStatus.INTERNAL_SERVER_ERROR), True
+        return h.wfile.getvalue(), bool(h.close_connection)  # type: ignore[attr-defined]
+
+    async def _serve_sse(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, target: str, headers: Any) -> None:
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        sess = SseSession(self.state, target, headers)
+        # Publishers run on other threads: hop onto the loop only when the queue becomes non-empty.
+        sess.queue.set_waker(lambda: loop.call_soon_threadsafe(wake.set))
+        closed = False
+
+        async def _watch_eof() -> None:
+            nonlocal closed
+            try:
+                await reader.read()
+            except Exception:
+                pass
+            closed = True
+            wake.set()
+
+        eof_task = asyncio.ensure_future(_watch_eof())
+        try:
+            lines = [
+                f"{SidecarHandler.protocol_version} 200 OK",
+                f"Server: {SidecarHandler.server_version}",
+                f"Date: {formatdate(usegmt=True)}",
+            ]
+            lines.extend(f"{k}: {v}" for k, v in SSE_RESPONSE_HEADERS)
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            # Initial comment to establish the stream.
+            writer.write(b":ok\n\n")
+            await writer.drain()
+            # Last-Event-ID catch-up takes the state lock and encodes the whole backlog:
+            # build it off the loop, like API requests, so other connections keep flowing.
+            chunks: List[bytes] = []
+            if sess.last_event_id is not None:
+                chunks = await loop.run_in_executor(self._executor, sess.catchup_chunks)
+            for chunk in chunks:
+                writer.write(chunk)
+                await writer.drain()
+
+            while not closed:
+                try:
+                    item = sess.queue.get_nowait()
+                except queue.Empty:
+                    wake.clear()
+                    try:
+                        item = sess.queue.get_nowait()
+                    except queue.Empty:
+                        try:
+                            await asyncio.wait_for(wake.wait(), SSE_HEARTBEAT_S)
+                        except asyncio.TimeoutError:
+                            # heartbeat
+                            writer.write(b":ping\n\n")
+                            await writer.drain()
+                        continue
+                out = sess.drain_bytes(item)
+                if out:
+                    writer.write(out)
+                    await writer.drain()
+        finally:
+            eof_task.cancel()
+            sess.queue.set_waker(None)
+            sess.close()
@@ -1,3 +1,4 @@
+import io
 import queue
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler
@@ -10,11 +11,22 @@ from .routes_post import dispatch_post
 from .ui_assets import load_ui_text, resolve_ui_path, ui_content_type, ui_dir
 from .json_helpers import json_bytes, parse_json_object
 from .config_payload import apply_config_display_fields, build_config_payload, decorate_status_payload
-from .sse import parse_last_event_id, sse_message_event_bytes
+from .sse import SSE_HEARTBEAT_S, SSE_RESPONSE_HEADERS, SseSession
 
 
 class SidecarHandler(BaseHTTPRequestHandler):
     server_version = "codex-sidecar/0.1"
+    # Keep-alive: the UI polls /api/status, /api/threads, ... on timers; reuse connections.
+    # Every response path sends Content-Length (SSE is delimited by connection close).
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections (and stalled reads / writes) are dropped after this many
+    # seconds (socket timeout, applied in StreamRequestHandler.setup; cleared for /events).
+    timeout = 15
+    # A connection is closed (`Connection: close`) after this many responses.
+    max_requests_per_connection = 100
+    # Headers and body are separate writes: without TCP_NODELAY a kept-alive connection hits
+    # Nagle + delayed-ACK stalls (~40ms) on every response.
+    disable_nagle_algorithm = True
 
     @property
     def _state(self) -> SidecarState:
@@ -28,6 +40,37 @@ class SidecarHandler(BaseHTTPRequestHandler):
         # Silence default logging.
         return
 
+    def send_response(self, code: int, message: Optional[str] = None) -> None:
+        super().send_response(code, message)
+        self._responses = int(getattr(self, "_responses", 0) or 0) + 1
+        if self._responses >= int(self.max_requests_per_connection or 1):
+            # send_header() also sets close_connection.
+            self.send_header("Connection", "close")
+
+    def _buffer_request_body(self) -> None:
+        """
+        Read the request body up front (Content-Length bytes) into memory.
+
+        On a kept-alive connection, body bytes a route does not read (e.g. POST /api/control/start)
+        would otherwise be parsed as the next request.
+        """
+        te = str(self.headers.get("Transfer-Encoding") or "").strip().lower()
+        if te and te != "identity":
+            # Chunked request bodies are not supported: never reuse this connection.
+            self.close_connection = True
+            return
+        raw = self.headers.get("Content-Length")
+        if raw is None:
+            return
+        try:
+            n = int(str(raw).strip())
+        except ValueError:
+            n = -1
+        if n < 0:
+            self.close_connection = True
+            return
+        self.rfile = io.BytesIO(self.rfile.read(n) if n > 0 else b"")  # type: ignore[assignment]
+
     def _send_json(self, status: int, obj: dict) -> None:
         body = json_bytes(obj)
         self.send_response(status)
@@ -143,7 +186,12 @@ class SidecarHandler(BaseHTTPRequestHandler):
         self._send_json(HTTPStatus.OK, self._controller.translate_text(text))
 
     def do_GET(self) -> None:
-        dispatch_get(self)
+        rfile = self.rfile
+        try:
+            self._buffer_request_body()
+            dispatch_get(self)
+        finally:
+            self.rfile = rfile
 
     def _serve_ui_file(self, rel: str) -> None:
         """
@@ -267,74 +315,51 @@ class SidecarHandler(BaseHTTPRequestHandler):
         return id_line, out
 
     def _handle_sse(self) -> None:
-        # If present, resume from Last-Event-ID (EventSource reconnect).
-        last_event_id = parse_last_event_id(self.headers)
-        last_sent_add_seq = int(last_event_id or 0)
-
-        q = self._state.subscribe()
+        sess = SseSession(self._state, self.path, self.headers)
         try:
+            # `timeout` is the keep-alive idle limit; a stream legitimately sits idle between
+            # heartbeats and a slow reader may block a write for longer, like the asyncio core.
+            self.connection.settimeout(None)
             self.send_response(HTTPStatus.OK)
-            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
-            self.send_header("Cache-Control", "no-cache")
-            self.send_header("Connection", "keep-alive")
+            for k, v in SSE_RESPONSE_HEADERS:
+                self.send_header(k, v)
             self.end_headers()
 
             # Initial comment to establish the stream.
             self.wfile.write(b":ok\n\n")
             self.wfile.flush()
 
-            # Best-effort catch-up: only when the client provides Last-Event-ID.
-            # Avoid replaying full history on first connect (UI already does /api/messages).
-            if last_event_id is not None:
-                try:
-                    for m in self._state.list_messages():
-                        try:
-                            seq = int(m.get("seq") or 0)
-                        except Exception:
-                            continue
-                        if seq <= int(last_event_id or 0):
-                            continue
-                        id_line, out = sse_message_event_bytes(m)
-                        if id_line is not None:
-                            self.wfile.write(id_line)
-                        self.wfile.write(out)
-                        last_sent_add_seq = max(last_sent_add_seq, int(seq or 0))
-                    self.wfile.flush()
-                except Exception:
-                    pass
+            chunks = sess.catchup_chunks()
+            if chunks:
+                for chunk in chunks:
+                    self.wfile.write(chunk)
+                self.wfile.flush()
 
             while True:
                 try:
-                    msg = q.get(timeout=10.0)
+                    item = sess.queue.get(timeout=SSE_HEARTBEAT_S)
                 except queue.Empty:
                     # heartbeat
                     self.wfile.write(b":ping\n\n")
                     self.wfile.flush()
                     continue
 
-                # Skip duplicates already delivered via resume catch-up.
-                try:
-                    op = str(msg.get("op") or "").strip().lower()
-                except Exception:
-                    op = ""
-                if op != "update":
-                    try:
-                        seq = int(msg.get("seq") or 0)
-                    except Exception:
-                        seq = 0
-                    if seq and seq <= last_sent_add_seq:
-                        continue
-                    last_sent_add_seq = max(last_sent_add_seq, int(seq or 0))
-
-                id_line, out = sse_message_event_bytes(msg)
-                if id_line is not None:
-                    self.wfile.write(id_line)
+                out = sess.drain_bytes(item)
+                if not out:
+                    continue
                 self.wfile.write(out)
                 self.wfile.flush()
-        except (BrokenPipeError, ConnectionResetError):
+        except (BrokenPipeError, ConnectionResetError, TimeoutError, OSError):
             return
         finally:
-            self._state.unsubscribe(q)
+            # The stream has no Content-Length: it ends with the connection.
+            self.close_connection = True
+            sess.close()
 
     def do_POST(self) -> None:
-        dispatch_post(self)
+        rfile = self.rfile
+        try:
+            self._buffer_request_body()
+            dispatch_post(self)
+        finally:
+            self.rfile = rfile
@@ -1,9 +1,10 @@
-import json
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from .. import json_codec
 
 
 def json_bytes(obj: dict) -> bytes:
-    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return json_codec.dumps(obj)
 
 
 def parse_json_object(raw: bytes, *, allow_invalid_json: bool) -> Tuple[Optional[Dict[str, Any]], str]:
@@ -15,7 +16,7 @@ def parse_json_object(raw: bytes, *, allow_invalid_json: bool) -> Tuple[Optional
     - error: "" on success; otherwise "invalid_json" / "invalid_payload"
     """
     try:
-        obj = json.loads(raw.decode("utf-8", errors="replace"))
+        obj = json_codec.loads(raw)
     except Exception:
         if allow_invalid_json:
             obj = {}
@@ -25,3 +26,20 @@ def parse_json_object(raw: bytes, *, allow_invalid_json: bool) -> Tuple[Optional
         return None, "invalid_payload"
     return obj, ""
 
+
+
+def parse_ndjson_objects(raw: bytes) -> List[Tuple[int, Optional[Dict[str, Any]], str]]:
+    """
+    Parse newline-delimited JSON (one object per line).
+
+    Returns one (line_no, obj, error) triple per non-blank line, in order; line_no is the
+    1-based physical line number (blank lines count), error uses the same codes as
+    parse_json_object ("invalid_json" / "invalid_payload").
+    """
+    out: List[Tuple[int, Optional[Dict[str, Any]], str]] = []
+    for line_no, ln in enumerate((raw or b"").split(b"\n"), start=1):
+        if not ln.strip():
+            continue
+        obj, err = parse_json_object(ln, allow_invalid_json=False)
+        out.append((line_no, obj, err))
+    return out
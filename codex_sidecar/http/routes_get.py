@@ -1,6 +1,6 @@
 import os
 from http import HTTPStatus
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
 from .sfx import list_sfx, read_custom_sfx_bytes
@@ -8,8 +8,37 @@ from ..offline import (
     build_offline_messages,
     list_offline_rollout_files,
     offline_key_from_rel,
+    page_offline_messages,
     resolve_offline_rollout_path,
 )
+from ..offline_cache import offline_parse_cache
+from ..watch.session_catalog import open_session_catalog
+
+
+_PAGE_LIMIT_DEFAULT = 200
+_PAGE_LIMIT_MAX = 5000
+
+
+def _cursor_params(qs: Dict[str, Any]) -> Optional[Tuple[Optional[int], Optional[int], int]]:
+    """
+    Parse `before` / `after` / `limit` cursor query params.
+
+    Returns None when none is present (legacy full response), else (before, after, limit).
+    """
+    if not any(k in qs for k in ("before", "after", "limit")):
+        return None
+
+    def _int(name: str) -> Optional[int]:
+        raw = str((qs.get(name) or [""])[0] or "").strip()
+        if not raw:
+            return None
+        try:
+            return int(raw)
+        except Exception:
+            return None
+
+    limit = _int("limit") or _PAGE_LIMIT_DEFAULT
+    return _int("before"), _int("after"), max(1, min(_PAGE_LIMIT_MAX, int(limit)))
 
 
 def dispatch_get(h) -> None:
@@ -29,10 +58,14 @@ def dispatch_get(h) -> None:
         return
 
     if path == "/api/messages":
-        msgs = h._state.list_messages()
         thread_id = (qs.get("thread_id") or [""])[0]
-        if thread_id:
-            msgs = [m for m in msgs if str(m.get("thread_id") or "") == thread_id]
+        cursor = _cursor_params(qs)
+        if cursor is not None:
+            before, after, limit = cursor
+            page = h._state.page_messages(thread_id=thread_id, before=before, after=after, limit=limit)
+            h._send_json(HTTPStatus.OK, page)
+            return
+        msgs = h._state.list_messages(thread_id)
         h._send_json(HTTPStatus.OK, {"messages": msgs})
         return
 
@@ -47,6 +80,11 @@ def dispatch_get(h) -> None:
 
     if path == "/api/status":
         st = h._controller.status()
+        try:
+            if isinstance(st, dict):
+                st["offline_cache"] = offline_parse_cache().stats()
+        except Exception:
+            pass
         h._send_json(HTTPStatus.OK, h._decorate_status_payload(st))
         return
 
@@ -109,7 +147,12 @@ def dispatch_get(h) -> None:
         except Exception:
             limit = 60
         limit = max(0, min(500, int(limit)))
-        files = list_offline_rollout_files(codex_home, limit=limit)
+        since_day = str((qs.get("since") or [""])[0] or "").strip()[:10]
+        until_day = str((qs.get("until") or [""])[0] or "").strip()[:10]
+        # Registers the on-disk session catalog for this CODEX_HOME (no-op when already open).
+        if str((cfg or {}).get("config_home") or "").strip():
+            open_session_catalog(config_home=h._config_home_best_effort(cfg), codex_home=codex_home)
+        files = list_offline_rollout_files(codex_home, limit=limit, since_day=since_day, until_day=until_day)
         h._send_json(HTTPStatus.OK, {"ok": True, "files": files})
         return
 
@@ -140,7 +183,39 @@ def dispatch_get(h) -> None:
         while rel_norm.startswith("/"):
             rel_norm = rel_norm[1:]
         offline_key = offline_key_from_rel(rel_norm)
-        msgs = build_offline_messages(rel=rel_norm, file_path=p, tail_lines=tail_lines, offline_key=offline_key)
+        catalog = None
+        if str((cfg or {}).get("config_home") or "").strip():
+            catalog = open_session_catalog(config_home=h._config_home_best_effort(cfg), codex_home=codex_home)
+        try:
+            offline_parse_cache().set_budget(int((cfg or {}).get("offline_cache_mb", 64)) * 1024 * 1024)
+        except Exception:
+            pass
+        cursor = _cursor_params(qs)
+        if cursor is not None:
+            before, after, limit = cursor
+            try:
+                page = page_offline_messages(
+                    rel=rel_norm,
+                    file_path=p,
+                    offline_key=offline_key,
+                    before=before,
+                    after=after,
+                    limit=limit,
+                    catalog=catalog,
+                )
+            except Exception:
+                h._send_json(HTTPStatus.OK, {"ok": False, "error": "read_failed", "messages": []})
+                return
+            page.update({"ok": True, "rel": rel_norm, "key": offline_key, "file": str(p)})
+            h._send_json(HTTPStatus.OK, page)
+            return
+        msgs = build_offline_messages(
+            rel=rel_norm,
+            file_path=p,
+            tail_lines=tail_lines,
+            offline_key=offline_key,
+            catalog=catalog,
+        )
         h._send_json(
             HTTPStatus.OK,
             {
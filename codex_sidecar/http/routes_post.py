@@ -2,7 +2,22 @@ import threading
 import time
 from http import HTTPStatus
 
-from .json_helpers import parse_json_object
+from .json_helpers import parse_json_object, parse_ndjson_objects
+from .sse import sse_filter_set
+
+_BATCH_MAX_ERRORS = 20
+
+
+def ingest_error(obj: dict) -> str:
+    """
+    Minimal validation shared by /ingest and /ingest/batch ("" means valid).
+    """
+    op = str(obj.get("op") or "").strip().lower()
+    if op == "update":
+        return "" if "id" in obj else "missing_id"
+    if "id" not in obj or "kind" not in obj or "text" not in obj:
+        return "missing_fields"
+    return ""
 
 
 def dispatch_post(h) -> None:
@@ -102,6 +117,23 @@ def dispatch_post(h) -> None:
         threading.Thread(target=_restart_later, name="sidecar-restart", daemon=True).start()
         return
 
+    if h.path == "/api/control/events_filter":
+        # Change the thread/kind filter of a live `/events?sid=...` subscription
+        # (omitted / null / empty = no filter on that dimension).
+        obj = h._read_json_object(allow_invalid_json=False)
+        if obj is None:
+            return
+        sid = str(obj.get("sid") or "").strip()
+        if not sid:
+            h._send_error(HTTPStatus.BAD_REQUEST, "missing_sid")
+            return
+        n = h._state.set_event_filter(sid, sse_filter_set(obj.get("threads")), sse_filter_set(obj.get("kinds")))
+        if not n:
+            h._send_error(HTTPStatus.NOT_FOUND, "unknown_sid")
+            return
+        h._send_json(HTTPStatus.OK, {"ok": True, "subscriptions": n})
+        return
+
     if h.path == "/api/control/clear":
         h._controller.clear_messages()
         h._send_json(HTTPStatus.OK, {"ok": True})
@@ -129,6 +161,10 @@ def dispatch_post(h) -> None:
         h._handle_translate_text(obj)
         return
 
+    if h.path == "/ingest/batch":
+        _handle_ingest_batch(h)
+        return
+
     if h.path != "/ingest":
         h._send_json(HTTPStatus.NOT_FOUND, {"ok": False, "error": "not_found"})
         return
@@ -144,19 +180,51 @@ def dispatch_post(h) -> None:
         h._send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": err})
         return
 
-    op = str(obj.get("op") or "").strip().lower()
-    if op == "update":
-        if "id" not in obj:
-            h._send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "missing_id"})
-            return
-        h._state.add(obj)
-        h._send_json(HTTPStatus.OK, {"ok": True, "op": "update"})
+    err = ingest_error(obj)
+    if err:
+        h._send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": err})
         return
 
-    # Minimal validation for normal ingest.
-    if "id" not in obj or "kind" not in obj or "text" not in obj:
-        h._send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "missing_fields"})
+    op = str(obj.get("op") or "").strip().lower()
+    h._state.add(obj)
+    h._send_json(HTTPStatus.OK, {"ok": True, "op": "update" if op == "update" else "add"})
+
+
+def _handle_ingest_batch(h) -> None:
+    """
+    NDJSON bulk ingest: one message (or op=update patch) per line.
+
+    - Valid lines are applied in order under a single SidecarState lock acquisition.
+    - Invalid lines are counted as rejected (with the first few line errors reported);
+      they never fail the whole batch.
+    """
+    length = int(h.headers.get("Content-Length") or "0")
+    if length <= 0:
+        h._send_json(HTTPStatus.BAD_REQUEST, {"ok": False, "error": "empty_body"})
         return
 
-    h._state.add(obj)
-    h._send_json(HTTPStatus.OK, {"ok": True, "op": "add"})
+    raw = h.rfile.read(length)
+    valid = []
+    rejected = 0
+    errors = []
+    for line_no, obj, err in parse_ndjson_objects(raw):
+        if not err:
+            err = ingest_error(obj)
+        if err:
+            rejected += 1
+            if len(errors) < _BATCH_MAX_ERRORS:
+                errors.append({"line": line_no, "error": err})
+            continue
+        valid.append(obj)
+
+    counts = h._state.add_many(valid) if valid else {"accepted": 0, "duplicate": 0, "rejected": 0}
+    h._send_json(
+        HTTPStatus.OK,
+        {
+            "ok": True,
+            "accepted": int(counts.get("accepted") or 0),
+            "duplicate": int(counts.get("duplicate") or 0),
+            "rejected": rejected + int(counts.get("rejected") or 0),
+            "errors": errors,
+        },
+    )
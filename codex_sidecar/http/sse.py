@@ -1,4 +1,6 @@
-from typing import Optional, Tuple
+import queue
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
 
 from .json_helpers import json_bytes
 
@@ -29,33 +31,355 @@ def parse_last_event_id(headers) -> Optional[int]:
     return max(0, n)
 
 
-def sse_message_event_bytes(msg: dict) -> Tuple[Optional[bytes], bytes]:
+# Events that should survive SSE backpressure: UI notifications depend on receiving
+# them in real time, so a slow browser loses translation backfill / tool noise first,
+# never terminal approvals or final assistant output. Updates are never high priority.
+_HIGH_PRIORITY_KINDS = ("tool_gate", "assistant_message")
+
+
+def _query_flag(path: str, name: str) -> bool:
+    try:
+        raw = (parse_qs(urlparse(str(path or "")).query).get(name) or [""])[0]
+    except Exception:
+        return False
+    return str(raw or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def sse_wants_delta(path: str) -> bool:
     """
-    Build an SSE "message" event.
+    True when the `/events` request opted into field-level update deltas (`?delta=1`).
+    """
+    return _query_flag(path, "delta")
 
-    Returns:
-      (id_line_bytes_or_none, body_bytes)
+
+def sse_wants_batch(path: str) -> bool:
+    """
+    True when the `/events` client unpacks `event: batch` frames (`?batch=1`).
+    """
+    return _query_flag(path, "batch")
+
+
+def sse_filter_set(raw: Any) -> Optional[FrozenSet[str]]:
+    """
+    Filter values from a comma-separated string or a JSON list; None = no filter.
+    """
+    if raw is None:
+        return None
+    items = raw if isinstance(raw, (list, tuple, set, frozenset)) else str(raw).split(",")
+    out = frozenset(v for v in (str(x or "").strip() for x in items) if v)
+    return out or None
+
+
+def sse_subscription_params(path: str) -> Tuple[str, Optional[FrozenSet[str]], Optional[FrozenSet[str]]]:
+    """
+    (sid, threads, kinds) from `/events?sid=&threads=a,b&kinds=x,y`.
+
+    - sid    : client-chosen subscription id, used to change the filter later via
+               POST /api/control/events_filter
+    - threads: thread keys (thread_id, else file; same as the UI's keyOf)
+    - kinds  : message kinds
+    """
+    try:
+        qs = parse_qs(urlparse(str(path or "")).query)
+    except Exception:
+        return "", None, None
+    sid = str((qs.get("sid") or [""])[0] or "").strip()[:128]
+    threads = sse_filter_set(",".join(qs["threads"])) if "threads" in qs else None
+    kinds = sse_filter_set(",".join(qs["kinds"])) if "kinds" in qs else None
+    return sid, threads, kinds
+
+
+class SseEvent(NamedTuple):
     """
-    op = ""
+    One SSE "message" event, encoded once at publish time and shared (immutable)
+    by every subscriber queue; SSE handlers only write `frame` to the socket.
+
+    - seq  : add seq (used for Last-Event-ID resume dedupe); 0 for updates
+    - high : survives subscriber backpressure (see _Broadcaster)
+    - frame: `id:` line (adds only) + `event: message` + `data:` JSON
+    - delta_frame: op=update only; the patched fields + id/seq (+ routing fields) for
+      clients that connected with `/events?delta=1`
+    - data / delta_data: the JSON payloads of frame / delta_frame (kept for `event: batch`)
+    - resync: `event: resync` control frame (never merged into a batch)
+    """
+
+    seq: int
+    high: bool
+    frame: bytes
+    msg_id: str
+    kind: str
+    delta_frame: bytes = b""
+    update: bool = False
+    # op=update only: patched field names (delta coalescing keeps earlier patches they don't cover)
+    patch_keys: Tuple[str, ...] = ()
+    # Thread key (same as the UI's keyOf) for filtered subscriptions.
+    thread: str = ""
+    data: bytes = b""
+    delta_data: bytes = b""
+    resync: bool = False
+
+    def frame_for(self, delta: bool) -> bytes:
+        """
+        Bytes for a subscriber of the given mode (b"" when that mode was not encoded).
+        """
+        if delta and self.delta_frame:
+            return self.delta_frame
+        return self.frame
+
+    def data_for(self, delta: bool) -> bytes:
+        """
+        The JSON payload of frame_for(delta).
+        """
+        if delta and self.delta_frame:
+            return self.delta_data
+        return self.data
+
+
+# Always carried by delta updates so clients can route them (keyOf / kind) without
+# having the base message at hand.
+_DELTA_BASE_KEYS = ("id", "seq", "thread_id", "file", "kind")
+
+
+def _msg_op(msg: dict) -> str:
     try:
-        op = str(msg.get("op") or "").strip().lower()
+        return str(msg.get("op") or "").strip().lower()
     except Exception:
-        op = ""
+        return ""
+
 
+def sse_thread_key(msg: dict) -> str:
+    try:
+        return str(msg.get("key") or "") or str(msg.get("thread_id") or "") or str(msg.get("file") or "") or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def _event_from_data(msg: dict, data: bytes, op: str) -> SseEvent:
     # Only attach `id:` for non-update events.
     # Updates can arrive for older messages (e.g. translation backfill); if we
     # used the message `seq` as the SSE id for updates, browsers may "rewind"
     # Last-Event-ID and cause duplicate replays on reconnect.
-    id_line: Optional[bytes] = None
+    seq = 0
     if op != "update":
         try:
-            seq = int(msg.get("seq") or 0)
+            seq = max(0, int(msg.get("seq") or 0))
         except Exception:
             seq = 0
-        if seq > 0:
-            id_line = f"id: {seq}\n".encode("utf-8")
+    id_line = f"id: {seq}\n".encode("utf-8") if seq > 0 else b""
+    try:
+        mid = str(msg.get("id") or "")
+        kind = str(msg.get("kind") or "")
+    except Exception:
+        mid = ""
+        kind = ""
+    return SseEvent(
+        seq=seq,
+        high=op != "update" and kind.strip() in _HIGH_PRIORITY_KINDS,
+        frame=id_line + b"event: message\ndata: " + data + b"\n\n",
+        msg_id=mid,
+        kind=kind,
+        update=op == "update",
+        thread=sse_thread_key(msg),
+        data=data,
+    )
+
+
+def sse_event_from_message(msg: dict) -> SseEvent:
+    """
+    Encode `msg` (an add, or an already op=update payload) into a shared event.
+    """
+    return _event_from_data(msg, json_bytes(msg), _msg_op(msg))
+
+
+def sse_update_event(cur: dict, patch: Optional[dict] = None, *, full: bool = True, delta: bool = False) -> SseEvent:
+    """
+    Encode the stored message `cur` as an op=update event without copying it.
+
+    - full : whole message + op=update (legacy clients)
+    - delta: only the keys of `patch` (+ id/seq/routing fields) in `delta_frame`
+
+    Call under the state lock: the bytes capture `cur` as of now, so later patches to
+    the same dict cannot leak into an event that is already queued.
+    """
+    frame = b""
+    data = b""
+    delta_frame = b""
+    delta_data = b""
+    if full:
+        data = json_bytes(cur)
+        if "op" in cur or len(data) < 3 or not data.endswith(b"}"):
+            out = dict(cur)
+            out["op"] = "update"
+            data = json_bytes(out)
+        else:
+            # Compact object encoding: splice the op field before the closing brace.
+            data = data[:-1] + b',"op":"update"}'
+        frame = _event_from_data(cur, data, "update").frame
+    if delta:
+        d: Dict[str, Any] = {k: cur[k] for k in _DELTA_BASE_KEYS if k in cur}
+        for k in patch or {}:
+            if k not in ("op", "id", "seq") and k in cur:
+                d[k] = cur[k]
+        d["op"] = "update"
+        delta_data = json_bytes(d)
+        delta_frame = b"event: message\ndata: " + delta_data + b"\n\n"
+    keys = tuple(sorted(str(k) for k in (patch or {}) if k not in ("op", "id", "seq")))
+    ev = _event_from_data(cur, b"", "update")
+    return ev._replace(frame=frame, data=data, delta_frame=delta_frame, delta_data=delta_data, patch_keys=keys)
+
+
+def sse_resync_event(last_seq: int) -> SseEvent:
+    """
+    `event: resync` telling a client that its subscriber queue overflowed and lost events:
+    it should reload state from /api/messages (`seq` = newest add seq published so far).
+    """
+    data = json_bytes({"op": "resync", "seq": max(0, int(last_seq or 0))})
+    return SseEvent(
+        seq=0,
+        high=True,
+        frame=b"event: resync\ndata: " + data + b"\n\n",
+        msg_id="",
+        kind="",
+        data=data,
+        resync=True,
+    )
+
+
+def sse_batch_bytes(events: List[SseEvent], *, delta: bool, batch: bool) -> bytes:
+    """
+    One write buffer for several queued events.
+
+    - batch=False: the events' frames concatenated (one write + flush instead of N)
+    - batch=True : runs of `event: message` frames become one `event: batch` frame whose data is
+      a JSON array of the payloads (`id:` = newest add seq in the run); other events (resync)
+      stay separate frames
+    """
+    if not batch:
+        return b"".join(ev.frame_for(delta) for ev in events)
+    out: List[bytes] = []
+    run: List[SseEvent] = []
+
+    def _flush_run() -> None:
+        if len(run) == 1:
+            out.append(run[0].frame_for(delta))
+        elif run:
+            seq = max(ev.seq for ev in run)
+            if seq > 0:
+                out.append(f"id: {seq}\n".encode("utf-8"))
+            out.append(b"event: batch\ndata: [" + b",".join(ev.data_for(delta) for ev in run) + b"]\n\n")
+        run.clear()
+
+    for ev in events:
+        if ev.resync:
+            _flush_run()
+            out.append(ev.frame_for(delta))
+        elif ev.frame_for(delta):
+            run.append(ev)
+    _flush_run()
+    return b"".join(out)
+
+
+def sse_message_event_bytes(msg: dict) -> Tuple[Optional[bytes], bytes]:
+    """
+    Build an SSE "message" event.
+
+    Returns:
+      (id_line_bytes_or_none, body_bytes)
+    """
+    ev = sse_event_from_message(msg)
+    i = ev.frame.find(b"event: message\n")
+    return (ev.frame[:i] or None), ev.frame[i:]
+
+
+# Per-flush budget when draining an SSE subscriber queue.
+SSE_WRITE_MAX_BYTES = 256 * 1024
+SSE_WRITE_MAX_EVENTS = 512
+SSE_HEARTBEAT_S = 10.0
+
+SSE_RESPONSE_HEADERS = (
+    ("Content-Type", "text/event-stream; charset=utf-8"),
+    ("Cache-Control", "no-cache"),
+    ("Connection", "keep-alive"),
+)
+
+
+class SseSession:
+    """
+    One `/events` connection, independent of the server core (threaded handler / asyncio).
+
+    Parses the query options, owns the subscriber queue, and turns queued events into the
+    bytes to write; the caller only does socket I/O (+ heartbeats) and calls close().
+    """
+
+    def __init__(self, state: Any, path: str, headers: Any) -> None:
+        self._state = state
+        # If present, resume from Last-Event-ID (EventSource reconnect).
+        self.last_event_id = parse_last_event_id(headers)
+        self.last_sent_add_seq = int(self.last_event_id or 0)
+        # Capability flag: `/events?delta=1` clients merge field-level op=update patches;
+        # others keep receiving whole-message copies.
+        self.delta = sse_wants_delta(path)
+        # `/events?batch=1`: several queued messages may arrive as one `event: batch` JSON array.
+        self.batch = sse_wants_batch(path)
+        # `/events?sid=&threads=&kinds=`: only matching events are enqueued for this client;
+        # the filter can be changed later via POST /api/control/events_filter {sid, threads, kinds}.
+        sid, threads, kinds = sse_subscription_params(path)
+        self.queue = state.subscribe(delta=self.delta, sid=sid, threads=threads, kinds=kinds)
+
+    def close(self) -> None:
+        self._state.unsubscribe(self.queue)
+
+    def catchup_chunks(self) -> List[bytes]:
+        """
+        Best-effort catch-up: only when the client provides Last-Event-ID.
+        Avoid replaying full history on first connect (UI already does /api/messages).
+        """
+        if self.last_event_id is None:
+            return []
+        out: List[bytes] = []
+        try:
+            missed: List[SseEvent] = []
+            for m in self._state.list_messages():
+                try:
+                    seq = int(m.get("seq") or 0)
+                except Exception:
+                    continue
+                if seq <= int(self.last_event_id or 0):
+                    continue
+                ev = sse_event_from_message(m)
+                if self.queue.accepts(ev.thread, ev.kind):
+                    missed.append(ev)
+                self.last_sent_add_seq = max(self.last_sent_add_seq, int(seq or 0))
+            for i in range(0, len(missed), SSE_WRITE_MAX_EVENTS):
+                out.append(sse_batch_bytes(missed[i : i + SSE_WRITE_MAX_EVENTS], delta=self.delta, batch=self.batch))
+        except Exception:
+            pass
+        return out
 
-    data = json_bytes(msg)
-    out = b"event: message\n" + b"data: " + data + b"\n\n"
-    return id_line, out
+    def drain_bytes(self, first: Any) -> bytes:
+        """
+        `first` plus whatever else is already queued (bounded), as one write buffer:
+        replays / imports then cost one syscall per batch instead of per event.
+        """
+        q = self.queue
+        items = [first]
+        size = len(getattr(first, "frame", b""))
+        while size < SSE_WRITE_MAX_BYTES and len(items) < SSE_WRITE_MAX_EVENTS:
+            try:
+                nxt = q.get_nowait()
+            except queue.Empty:
+                break
+            items.append(nxt)
+            size += len(getattr(nxt, "frame", b""))
 
+        evs: List[SseEvent] = []
+        for it in items:
+            # Pre-encoded once by the broadcaster; raw dicts are tolerated.
+            ev = it if isinstance(it, SseEvent) else sse_event_from_message(it)
+            # Skip duplicates already delivered via resume catch-up.
+            if ev.seq:
+                if ev.seq <= self.last_sent_add_seq:
+                    continue
+                self.last_sent_add_seq = ev.seq
+            evs.append(ev)
+        return sse_batch_bytes(evs, delta=self.delta, batch=self.batch)
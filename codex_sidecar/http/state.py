@@ -1,72 +1,415 @@
 import queue
 import threading
 import time
-from collections import deque
-from typing import Deque, Dict, List, Optional
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Optional, Tuple, Union
 
+from .sse import SseEvent, sse_event_from_message, sse_resync_event, sse_thread_key, sse_update_event
 
-class _Broadcaster:
-    def __init__(self) -> None:
-        self._lock = threading.Lock()
-        self._subscribers: List["queue.Queue[dict]"] = []
 
-    @staticmethod
-    def _is_high_priority(msg: dict) -> bool:
-        """
-        High-priority events should survive SSE backpressure.
+# Per-subscriber bounds: pending adds (FIFO), pending coalesced updates (distinct ids), and
+# the total frame bytes held for one slow client.
+_SUB_MAX_ADDS = 256
+_SUB_MAX_UPDATES = 1024
+_SUB_MAX_BYTES = 16 * 1024 * 1024
+
+
+class _SubscriberQueue:
+    """
+    SSE 订阅队列：add 走有界 FIFO，op=update 按消息 id 合并（新的覆盖旧的，保留原排队位置）。
+
+    - 慢客户端不会因 update 洪峰丢失任何消息的最终状态；delta 模式下保留未被新补丁覆盖的旧字段补丁
+    - 仍然溢出（add 超限 / update id 数超限 / 字节超限）时丢弃低优先级事件，并在下一次 get
+      时先投递一次 `event: resync`（携带最新 add seq），由客户端回源同步
+    - 接口与 queue.Queue 的 get/get_nowait/put_nowait 保持一致（队空抛 queue.Empty）
+    - 可选过滤（threads / kinds，None 表示不过滤）：不匹配的事件不会入队
+    """
+
+    def __init__(
+        self,
+        *,
+        delta: bool = False,
+        maxsize: int = _SUB_MAX_ADDS,
+        last_seq: int = 0,
+        sid: str = "",
+        threads: Optional[FrozenSet[str]] = None,
+        kinds: Optional[FrozenSet[str]] = None,
+    ) -> None:
+        self.delta = bool(delta)
+        self.sid = str(sid or "")
+        # (threads, kinds) swapped as one tuple so publishers never see a half-applied filter.
+        self._filter: Tuple[Optional[FrozenSet[str]], Optional[FrozenSet[str]]] = (threads, kinds)
+        self.maxsize = max(1, int(maxsize))
+        self._cond = threading.Condition(threading.Lock())
+        # ("a", n) -> [add event] | ("u", msg_id) -> [update events] in delivery order.
+        self._items: "OrderedDict[Tuple[str, Any], List[SseEvent]]" = OrderedDict()
+        self._n = 0
+        self._adds = 0
+        self._bytes = 0
+        self._last_seq = int(last_seq or 0)
+        self._lost = 0
+        self._resync = False
+        self._waker: Optional[Callable[[], None]] = None
+
+    def set_filter(self, threads: Optional[FrozenSet[str]], kinds: Optional[FrozenSet[str]]) -> None:
+        self._filter = (threads, kinds)
+
+    def accepts(self, thread: str, kind: str) -> bool:
+        threads, kinds = self._filter
+        if threads is not None and thread not in threads:
+            return False
+        if kinds is not None and kind not in kinds:
+            return False
+        return True
 
-        Rationale:
-        - UI notifications depend on receiving these events in real time.
-        - SSE subscriber queues are bounded; if the browser can't keep up, we
-          prefer dropping low-value noise (e.g. translation backfill updates)
-          rather than terminal approval / final assistant output.
+    def qsize(self) -> int:
+        with self._cond:
+            return sum(len(evs) for evs in self._items.values())
+
+    def set_waker(self, waker: Optional[Callable[[], None]]) -> None:
         """
-        try:
-            op = str(msg.get("op") or "").strip().lower()
-        except Exception:
-            op = ""
-        if op == "update":
+        Callback run (outside the lock) when the queue goes from empty to non-empty,
+        for consumers that wait on an event loop instead of blocking in get().
+        """
+        self._waker = waker
+
+    def put_nowait(self, item: Union[dict, SseEvent]) -> None:
+        ev = item if isinstance(item, SseEvent) else sse_event_from_message(item)
+        with self._cond:
+            was_empty = not self._items and not self._resync
+            if ev.seq > self._last_seq:
+                self._last_seq = ev.seq
+            if ev.update and ev.msg_id:
+                self._put_update_locked(ev)
+            else:
+                self._put_add_locked(ev)
+            while self._bytes > _SUB_MAX_BYTES and self._evict_locked(high_ok=False):
+                pass
+            self._cond.notify()
+            wake = was_empty and (bool(self._items) or self._resync)
+        waker = self._waker
+        if wake and waker is not None:
+            try:
+                waker()
+            except Exception:
+                pass
+
+    def get(self, timeout: Optional[float] = None) -> SseEvent:
+        with self._cond:
+            if not self._resync and not self._items:
+                self._cond.wait(timeout)
+            return self._pop_locked()
+
+    def get_nowait(self) -> SseEvent:
+        with self._cond:
+            return self._pop_locked()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"pending": len(self._items), "adds": self._adds, "bytes": self._bytes, "lost": self._lost}
+
+    def _pop_locked(self) -> SseEvent:
+        if self._resync:
+            self._resync = False
+            return sse_resync_event(self._last_seq)
+        while self._items:
+            key, evs = next(iter(self._items.items()))
+            ev = evs.pop(0)
+            self._bytes -= len(ev.frame_for(self.delta))
+            if not evs:
+                del self._items[key]
+                if key[0] == "a":
+                    self._adds -= 1
+            return ev
+        raise queue.Empty
+
+    def _put_update_locked(self, ev: SseEvent) -> None:
+        key = ("u", ev.msg_id)
+        nb = len(ev.frame_for(self.delta))
+        prev = self._items.get(key)
+        if prev is not None:
+            # Newer update for the same id: supersede in place (the add is already ahead of it).
+            # Full copies carry the whole message; deltas keep earlier patches of other fields.
+            cover = set(ev.patch_keys)
+            keep: List[SseEvent] = []
+            for p in prev:
+                if self.delta and p.patch_keys and not set(p.patch_keys) <= cover:
+                    keep.append(p)
+                else:
+                    self._bytes -= len(p.frame_for(self.delta))
+            keep.append(ev)
+            self._items[key] = keep
+            self._bytes += nb
+            return
+        if len(self._items) - self._adds >= _SUB_MAX_UPDATES:
+            self._mark_lost_locked()
+            return
+        self._items[key] = [ev]
+        self._bytes += nb
+
+    def _put_add_locked(self, ev: SseEvent) -> None:
+        if self._adds >= self.maxsize:
+            # Client can't keep up: low-priority adds are dropped, high-priority ones evict the
+            # oldest pending add (either way the client is told to resync).
+            if not ev.high or not self._evict_locked(high_ok=True, adds_only=True):
+                self._mark_lost_locked()
+                return
+        self._n += 1
+        self._items[("a", self._n)] = [ev]
+        self._adds += 1
+        self._bytes += len(ev.frame_for(self.delta))
+
+    def _evict_locked(self, *, high_ok: bool, adds_only: bool = False) -> bool:
+        victim = None
+        fallback = None
+        for key, evs in self._items.items():
+            if adds_only and key[0] != "a":
+                continue
+            if not any(e.high for e in evs):
+                victim = key
+                break
+            if fallback is None:
+                fallback = key
+        if victim is None:
+            victim = fallback if high_ok else None
+        if victim is None:
             return False
-        try:
-            kind = str(msg.get("kind") or "").strip()
-        except Exception:
-            kind = ""
-        return kind in ("tool_gate", "assistant_message")
+        for e in self._items.pop(victim):
+            self._bytes -= len(e.frame_for(self.delta))
+        if victim[0] == "a":
+            self._adds -= 1
+        self._mark_lost_locked()
+        return True
 
-    def subscribe(self) -> "queue.Queue[dict]":
-        q: "queue.Queue[dict]" = queue.Queue(maxsize=256)
+    def _mark_lost_locked(self) -> None:
+        self._lost += 1
+        self._resync = True
+
+
+class _Broadcaster:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: List[_SubscriberQueue] = []
+        self._last_seq = 0
+
+    def subscribe(
+        self,
+        *,
+        delta: bool = False,
+        sid: str = "",
+        threads: Optional[FrozenSet[str]] = None,
+        kinds: Optional[FrozenSet[str]] = None,
+    ) -> _SubscriberQueue:
         with self._lock:
+            q = _SubscriberQueue(delta=delta, last_seq=self._last_seq, sid=sid, threads=threads, kinds=kinds)
             self._subscribers.append(q)
         return q
 
-    def unsubscribe(self, q: "queue.Queue[dict]") -> None:
+    def set_filter(self, sid: str, threads: Optional[FrozenSet[str]], kinds: Optional[FrozenSet[str]]) -> int:
+        """
+        Change the filter of live subscriptions opened with `sid`; returns how many matched.
+        """
+        k = str(sid or "")
+        if not k:
+            return 0
+        with self._lock:
+            subs = [q for q in self._subscribers if q.sid == k]
+        for q in subs:
+            q.set_filter(threads, kinds)
+        return len(subs)
+
+    def unsubscribe(self, q: _SubscriberQueue) -> None:
         with self._lock:
             try:
                 self._subscribers.remove(q)
             except ValueError:
                 return
 
-    def publish(self, msg: dict) -> None:
-        high = self._is_high_priority(msg) if isinstance(msg, dict) else False
+    def modes(self, thread: str, kind: str) -> Tuple[bool, bool]:
+        """
+        (any full-copy subscriber, any delta subscriber) among those whose filter accepts
+        (thread, kind): which update encodings are needed.
+        """
         with self._lock:
-            subs = list(self._subscribers)
+            vals = set(q.delta for q in self._subscribers if q.accepts(thread, kind))
+        return False in vals, True in vals
+
+    def modes_for(self, msg: dict) -> Tuple[bool, bool]:
+        try:
+            kind = str(msg.get("kind") or "")
+        except Exception:
+            kind = ""
+        return self.modes(sse_thread_key(msg), kind)
+
+    def publish(self, msg: Union[dict, SseEvent]) -> None:
+        """
+        Fan out one event: encoded once here, the same immutable bytes go to every queue.
+        """
+        if not isinstance(msg, SseEvent):
+            try:
+                seq = 0 if str(msg.get("op") or "").strip().lower() == "update" else int(msg.get("seq") or 0)
+                kind = str(msg.get("kind") or "")
+            except Exception:
+                seq = 0
+                kind = ""
+            thread = sse_thread_key(msg)
+        else:
+            seq, kind, thread = msg.seq, msg.kind, msg.thread
+        with self._lock:
+            if seq > self._last_seq:
+                self._last_seq = seq
+            subs = [q for q in self._subscribers if q.accepts(thread, kind)]
+        if not subs:
+            return
+        ev = msg if isinstance(msg, SseEvent) else sse_event_from_message(msg)
         for q in subs:
+            # Never blocks: overflow is handled per subscriber (coalesce / drop + resync).
+            q.put_nowait(ev)
+
+
+def _thread_key(m: dict) -> str:
+    try:
+        return str(m.get("thread_id") or "") or str(m.get("file") or "") or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def _depth_of(m: dict) -> Optional[int]:
+    try:
+        depth = m.get("subagent_depth")
+        if isinstance(depth, int):
+            return int(depth)
+        if isinstance(depth, str) and str(depth).strip().isdigit():
+            return int(str(depth).strip())
+    except Exception:
+        pass
+    return None
+
+
+class _ThreadIndex:
+    """
+    Per-thread message refs (ascending seq) + aggregates served by list_threads().
+
+    count/kinds/last_seq and file (that of the oldest stored message) are kept exact on
+    add and eviction. Fields that depend on which messages remain (last_ts, first
+    non-empty source_kind / parent_thread_id, last subagent_depth) are recomputed lazily
+    from `msgs` after an eviction or patch that could have changed them.
+    """
+
+    __slots__ = (
+        "key",
+        "thread_id",
+        "file",
+        "msgs",
+        "kinds",
+        "last_ts",
+        "source_kind",
+        "parent_thread_id",
+        "subagent_depth",
+        "dirty",
+    )
+
+    def __init__(self, key: str, thread_id: str, file_path: str) -> None:
+        self.key = key
+        self.thread_id = thread_id
+        self.file = file_path
+        self.msgs: Deque[dict] = deque()
+        self.kinds: Dict[str, int] = {}
+        self.last_ts = ""
+        self.source_kind = ""
+        self.parent_thread_id = ""
+        self.subagent_depth = 0
+        self.dirty = False
+
+    def add(self, m: dict) -> None:
+        self.msgs.append(m)
+        kind = str(m.get("kind") or "")
+        if kind:
+            self.kinds[kind] = int(self.kinds.get(kind, 0)) + 1
+        if self.dirty:
+            return
+        self._fold(m)
+
+    def _fold(self, m: dict) -> None:
+        ts = str(m.get("ts") or "")
+        if ts and (not self.last_ts or ts > self.last_ts):
+            self.last_ts = ts
+        try:
+            sk = str(m.get("source_kind") or "").strip()
+        except Exception:
+            sk = ""
+        if sk and not self.source_kind:
+            self.source_kind = sk
+        try:
+            pid = str(m.get("parent_thread_id") or "").strip()
+        except Exception:
+            pid = ""
+        if pid and not self.parent_thread_id:
+            self.parent_thread_id = pid
+        depth = _depth_of(m)
+        if depth is not None:
+            self.subagent_depth = depth
+
+    def evict_oldest(self) -> None:
+        if not self.msgs:
+            return
+        m = self.msgs.popleft()
+        if self.msgs:
+            self.file = str(self.msgs[0].get("file") or "")
+        kind = str(m.get("kind") or "")
+        if kind:
+            n = int(self.kinds.get(kind, 0)) - 1
+            if n > 0:
+                self.kinds[kind] = n
+            else:
+                self.kinds.pop(kind, None)
+        if not self.dirty:
+            ts = str(m.get("ts") or "")
+            if (ts and ts == self.last_ts) or m.get("source_kind") or m.get("parent_thread_id") or _depth_of(m) is not None:
+                self.dirty = True
+
+    def recount(self) -> None:
+        self.kinds = {}
+        for m in self.msgs:
+            kind = str(m.get("kind") or "")
+            if kind:
+                self.kinds[kind] = int(self.kinds.get(kind, 0)) + 1
+        self.dirty = True
+
+    def summary(self) -> dict:
+        if self.dirty:
+            self.last_ts = ""
+            self.source_kind = ""
+            self.parent_thread_id = ""
+            self.subagent_depth = 0
+            if self.msgs:
+                self.file = str(self.msgs[0].get("file") or "")
+            for m in self.msgs:
+                self._fold(m)
+            self.dirty = False
+        last_seq = 0
+        if self.msgs:
             try:
-                q.put_nowait(msg)
-            except queue.Full:
-                # Client can't keep up:
-                # - For low-priority events, drop to avoid blocking producers.
-                # - For high-priority events, evict one oldest item to make room.
-                if not high:
-                    continue
-                try:
-                    _ = q.get_nowait()
-                except queue.Empty:
-                    continue
-                try:
-                    q.put_nowait(msg)
-                except queue.Full:
-                    continue
+                last_seq = int(self.msgs[-1].get("seq") or 0)
+            except Exception:
+                last_seq = 0
+        return {
+            "key": self.key,
+            "thread_id": self.thread_id,
+            "file": self.file,
+            "count": len(self.msgs),
+            "last_ts": self.last_ts,
+            "last_seq": last_seq,
+            "kinds": dict(self.kinds),
+            "source_kind": self.source_kind,
+            "parent_thread_id": self.parent_thread_id,
+            "subagent_depth": self.subagent_depth,
+        }
+
+
+# Patch keys that move a message to another thread, or change per-thread aggregates.
+_REINDEX_KEYS = ("thread_id", "file")
+_AGG_KEYS = ("kind", "ts", "source_kind", "parent_thread_id", "subagent_depth")
 
 
 class SidecarState:
@@ -75,6 +418,8 @@ class SidecarState:
         self._max_messages = max(1, int(max_messages or 1000))
         self._messages: Deque[dict] = deque()
         self._by_id: Dict[str, dict] = {}
+        # thread key (thread_id / file / "unknown") -> refs + aggregates, in first-seen order.
+        self._threads: Dict[str, _ThreadIndex] = {}
         self._next_seq = 1
         self._broadcaster = _Broadcaster()
 
@@ -88,78 +433,266 @@ class SidecarState:
             self.update(msg)
             return
 
+        with self._lock:
+            added = self._add_locked(msg)
+        if added:
+            self._broadcaster.publish(msg)
+
+    def add_many(self, msgs: List[dict]) -> Dict[str, int]:
+        """
+        Apply a batch of adds / op=update patches under a single lock acquisition.
+
+        Broadcasts happen after the lock is released, in input order.
+
+        Returns counters: {"accepted": n, "duplicate": n, "rejected": n}
+        - duplicate: add whose id is already stored
+        - rejected : non-dict item, or update without id / for an unknown id
+        """
+        accepted = 0
+        duplicate = 0
+        rejected = 0
+        out: List[Union[dict, SseEvent]] = []
+        with self._lock:
+            for msg in msgs or []:
+                if not isinstance(msg, dict):
+                    rejected += 1
+                    continue
+                try:
+                    op = str(msg.get("op") or "").strip().lower()
+                except Exception:
+                    op = ""
+                if op == "update":
+                    cur = self._update_locked(msg)
+                    if cur is None:
+                        rejected += 1
+                        continue
+                    accepted += 1
+                    full, delta = self._broadcaster.modes_for(cur)
+                    if full or delta:
+                        out.append(sse_update_event(cur, msg, full=full, delta=delta))
+                    continue
+                if self._add_locked(msg):
+                    accepted += 1
+                    out.append(msg)
+                else:
+                    duplicate += 1
+        for m in out:
+            self._broadcaster.publish(m)
+        return {"accepted": accepted, "duplicate": duplicate, "rejected": rejected}
+
+    def _add_locked(self, msg: dict) -> bool:
         mid = ""
         try:
             mid = str(msg.get("id") or "")
         except Exception:
             mid = ""
+        if mid and mid in self._by_id:
+            return False
+        # Enforce bounded history while keeping id-set / thread index in sync.
+        while len(self._messages) >= self._max_messages:
+            old = self._messages.popleft()
+            try:
+                oid = str(old.get("id") or "")
+                if oid:
+                    self._by_id.pop(oid, None)
+            except Exception:
+                pass
+            self._unindex_oldest_locked(old)
+        try:
+            msg["seq"] = int(self._next_seq)
+            self._next_seq += 1
+        except Exception:
+            try:
+                msg["seq"] = int(time.time() * 1000)
+            except Exception:
+                pass
+        self._messages.append(msg)
+        if mid:
+            self._by_id[mid] = msg
+        self._index_locked(msg)
+        return True
 
-        added = False
-        with self._lock:
-            if mid and mid in self._by_id:
-                added = False
-            else:
-                # Enforce bounded history while keeping id-set in sync.
-                while len(self._messages) >= self._max_messages:
-                    old = self._messages.popleft()
-                    try:
-                        oid = str(old.get("id") or "")
-                        if oid:
-                            self._by_id.pop(oid, None)
-                    except Exception:
-                        pass
-                try:
-                    msg["seq"] = int(self._next_seq)
-                    self._next_seq += 1
-                except Exception:
-                    try:
-                        msg["seq"] = int(time.time() * 1000)
-                    except Exception:
-                        pass
-                self._messages.append(msg)
-                if mid:
-                    self._by_id[mid] = msg
-                added = True
-        if added:
-            self._broadcaster.publish(msg)
+    def _index_locked(self, msg: dict) -> None:
+        key = _thread_key(msg)
+        t = self._threads.get(key)
+        if t is None:
+            t = _ThreadIndex(key, str(msg.get("thread_id") or ""), str(msg.get("file") or ""))
+            self._threads[key] = t
+        t.add(msg)
+
+    def _unindex_oldest_locked(self, old: dict) -> None:
+        t = self._threads.get(_thread_key(old))
+        if t is None or not t.msgs:
+            return
+        if t.msgs[0] is old:
+            t.evict_oldest()
+        else:
+            # Out of order (patched thread fields): fall back to removal by identity.
+            try:
+                t.msgs = deque(m for m in t.msgs if m is not old)
+            except Exception:
+                pass
+            t.recount()
+        if not t.msgs:
+            self._threads.pop(t.key, None)
+
+    def _move_thread_locked(self, m: dict, old_key: str) -> None:
+        """
+        Re-file one message whose thread_id / file was patched (O(thread size), not O(N)).
+        """
+        new_key = _thread_key(m)
+        old = self._threads.get(old_key)
+        if new_key == old_key:
+            # Same thread (e.g. file patched while thread_id keys it): aggregates may still change.
+            if old is not None:
+                old.recount()
+            return
+        if old is not None:
+            try:
+                old.msgs = deque(x for x in old.msgs if x is not m)
+            except Exception:
+                pass
+            old.recount()
+            if not old.msgs:
+                self._threads.pop(old_key, None)
+        t = self._threads.get(new_key)
+        if t is None:
+            t = _ThreadIndex(new_key, str(m.get("thread_id") or ""), str(m.get("file") or ""))
+            self._threads[new_key] = t
+        try:
+            seq = int(m.get("seq") or 0)
+        except Exception:
+            seq = 0
+        # Keep ascending seq: patched messages are usually recent, so scan from the tail.
+        i = len(t.msgs)
+        while i > 0:
+            try:
+                if int(t.msgs[i - 1].get("seq") or 0) <= seq:
+                    break
+            except Exception:
+                break
+            i -= 1
+        t.msgs.insert(i, m)
+        t.recount()
 
     def update(self, patch: dict) -> None:
+        ev: Optional[SseEvent] = None
+        with self._lock:
+            cur = self._update_locked(patch)
+            full, delta = self._broadcaster.modes_for(cur) if cur is not None else (False, False)
+            if full or delta:
+                # Encode while `cur` is consistent (no per-update full-message copy).
+                ev = sse_update_event(cur, patch, full=full, delta=delta)
+        if ev is not None:
+            self._broadcaster.publish(ev)
+
+    def _update_locked(self, patch: dict) -> Optional[dict]:
+        """
+        Apply `patch` to the stored message in place; returns it (None when unknown).
+        """
         mid = ""
         try:
             mid = str(patch.get("id") or "")
         except Exception:
             mid = ""
         if not mid:
-            return
-
-        out: Optional[dict] = None
-        with self._lock:
-            cur = self._by_id.get(mid)
-            if cur is None:
-                # If update arrives before initial add (shouldn't happen), ignore.
-                out = None
-            else:
-                seq = cur.get("seq")
-                for k, v in patch.items():
-                    if k in ("op", "id", "seq"):
-                        continue
-                    cur[k] = v
-                if seq is not None:
-                    cur["seq"] = seq
-                out = dict(cur)
-                out["op"] = "update"
-
-        if out is not None:
-            self._broadcaster.publish(out)
+            return None
+        cur = self._by_id.get(mid)
+        if cur is None:
+            # If update arrives before initial add (shouldn't happen), ignore.
+            return None
+        seq = cur.get("seq")
+        old_key = _thread_key(cur)
+        reindex = False
+        touched = False
+        for k, v in patch.items():
+            if k in ("op", "id", "seq"):
+                continue
+            if k in _REINDEX_KEYS and cur.get(k) != v:
+                reindex = True
+            elif k in _AGG_KEYS:
+                touched = True
+            cur[k] = v
+        if seq is not None:
+            cur["seq"] = seq
+        if reindex:
+            self._move_thread_locked(cur, old_key)
+        elif touched:
+            t = self._threads.get(_thread_key(cur))
+            if t is not None:
+                t.recount()
+        return cur
 
     def clear(self) -> None:
         with self._lock:
             self._messages.clear()
             self._by_id.clear()
+            self._threads.clear()
 
-    def list_messages(self) -> List[dict]:
+    def list_messages(self, thread_id: str = "") -> List[dict]:
+        """
+        All stored messages (ascending seq); with thread_id only that thread's (O(thread size)).
+        """
+        tid = str(thread_id or "")
         with self._lock:
-            return list(self._messages)
+            if not tid:
+                return list(self._messages)
+            t = self._threads.get(tid)
+            if t is None:
+                return []
+            return [m for m in t.msgs if str(m.get("thread_id") or "") == tid]
+
+    def page_messages(
+        self,
+        *,
+        thread_id: str = "",
+        before: Optional[int] = None,
+        after: Optional[int] = None,
+        limit: int = 200,
+    ) -> Dict[str, Any]:
+        """
+        Seq-cursor page over the in-memory history (ascending seq in the result).
+
+        - before: only seq < before (walks backwards from the newest; default page = newest)
+        - after : only seq > after (walks forwards; takes precedence over before)
+        - prev  : pass as `before=` to fetch older messages (None when nothing older is held)
+        - next  : pass as `after=` to fetch newer messages (None when the page reaches the head)
+        """
+        tid = str(thread_id or "")
+        n = max(1, int(limit or 0))
+        out: List[dict] = []
+        more = False  # further matches beyond the page in scan direction
+        behind = False  # matches skipped by the cursor (the other direction)
+        with self._lock:
+            src: Deque[dict] = self._messages
+            if tid:
+                t = self._threads.get(tid)
+                src = t.msgs if t is not None else deque()
+            if after is not None:
+                seq_iter = iter(src)
+                cur = int(after)
+            else:
+                seq_iter = reversed(src)
+                cur = None if before is None else int(before)
+            for m in seq_iter:
+                if tid and str(m.get("thread_id") or "") != tid:
+                    continue
+                s = int(m.get("seq") or 0)
+                if cur is not None and (s <= cur if after is not None else s >= cur):
+                    behind = True
+                    continue
+                if len(out) >= n:
+                    more = True
+                    break
+                out.append(m)
+        if after is None:
+            out.reverse()
+            older, newer = more, behind
+        else:
+            older, newer = behind, more
+        prev = int(out[0].get("seq") or 0) if (out and older) else None
+        nxt = int(out[-1].get("seq") or 0) if (out and newer) else None
+        return {"messages": out, "prev": prev, "next": nxt}
 
     def get_message(self, mid: str) -> Optional[dict]:
         """
@@ -173,68 +706,26 @@ class SidecarState:
             return dict(cur) if isinstance(cur, dict) else None
 
     def list_threads(self) -> List[dict]:
+        """
+        Per-thread summaries from the incrementally maintained index (O(threads)).
+        """
         with self._lock:
-            msgs = list(self._messages)
-        agg: Dict[str, dict] = {}
-        for m in msgs:
-            thread_id = str(m.get("thread_id") or "")
-            file_path = str(m.get("file") or "")
-            key = thread_id or file_path or "unknown"
-            if key not in agg:
-                agg[key] = {
-                    "key": key,
-                    "thread_id": thread_id,
-                    "file": file_path,
-                    "count": 0,
-                    "last_ts": "",
-                    "last_seq": 0,
-                    "kinds": {},
-                    "source_kind": "",
-                    "parent_thread_id": "",
-                    "subagent_depth": 0,
-                }
-            a = agg[key]
-            a["count"] += 1
-            ts = str(m.get("ts") or "")
-            if ts and (not a["last_ts"] or ts > a["last_ts"]):
-                a["last_ts"] = ts
-            try:
-                seq = int(m.get("seq") or 0)
-            except Exception:
-                seq = 0
-            if seq and seq > int(a.get("last_seq") or 0):
-                a["last_seq"] = seq
-            kind = str(m.get("kind") or "")
-            if kind:
-                a["kinds"][kind] = int(a["kinds"].get(kind, 0)) + 1
-
-            # Best-effort session metadata (e.g. subagent parent linkage).
-            try:
-                sk = str(m.get("source_kind") or "").strip()
-            except Exception:
-                sk = ""
-            if sk and not str(a.get("source_kind") or "").strip():
-                a["source_kind"] = sk
-            try:
-                pid = str(m.get("parent_thread_id") or "").strip()
-            except Exception:
-                pid = ""
-            if pid and not str(a.get("parent_thread_id") or "").strip():
-                a["parent_thread_id"] = pid
-            try:
-                depth = m.get("subagent_depth")
-                if isinstance(depth, int):
-                    a["subagent_depth"] = int(depth)
-                elif isinstance(depth, str) and str(depth).strip().isdigit():
-                    a["subagent_depth"] = int(str(depth).strip())
-            except Exception:
-                pass
-        items = list(agg.values())
+            items = [t.summary() for t in self._threads.values()]
         items.sort(key=lambda x: (int(x.get("last_seq") or 0), x.get("last_ts") or ""), reverse=True)
         return items
 
-    def subscribe(self) -> "queue.Queue[dict]":
-        return self._broadcaster.subscribe()
+    def subscribe(
+        self,
+        *,
+        delta: bool = False,
+        sid: str = "",
+        threads: Optional[FrozenSet[str]] = None,
+        kinds: Optional[FrozenSet[str]] = None,
+    ) -> _SubscriberQueue:
+        return self._broadcaster.subscribe(delta=delta, sid=sid, threads=threads, kinds=kinds)
+
+    def set_event_filter(self, sid: str, threads: Optional[FrozenSet[str]], kinds: Optional[FrozenSet[str]]) -> int:
+        return self._broadcaster.set_filter(sid, threads, kinds)
 
-    def unsubscribe(self, q: "queue.Queue[dict]") -> None:
+    def unsubscribe(self, q: _SubscriberQueue) -> None:
         self._broadcaster.unsubscribe(q)
@@ -0,0 +1,253 @@
+"""
+Shared keep-alive HTTP/1.1 connection pool (stdlib `http.client`).
+
+`urllib.request.urlopen` opens a new TCP connection (and TLS handshake) per call.
+Translators and the ingest client call the same few hosts over and over, so they go
+through `pooled_urlopen`, which keeps idle connections per (scheme, host, port).
+
+Compatibility notes:
+- Takes a `urllib.request.Request` and mirrors urlopen's error contract:
+  HTTP >= 400 raises `urllib.error.HTTPError` (body readable via `e.read()`),
+  connection failures raise `urllib.error.URLError`, read timeouts raise `TimeoutError`.
+- Requests that need urllib features the pool does not implement (proxies from env,
+  non-http schemes) fall back to `urllib.request.urlopen`.
+- Redirects are followed once for GET/HEAD (to the `Location` target); any other 3xx
+  raises `HTTPError` instead of re-sending a (non-idempotent) request body.
+"""
+
+import http.client
+import io
+import ssl
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Any, Dict, List, Optional, Tuple
+
+_PoolKey = Tuple[str, str, int]
+
+_DEFAULT_UA = f"Python-urllib/{sys.version_info[0]}.{sys.version_info[1]}"
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+# Errors that mean "the server closed an idle keep-alive socket"; safe to retry once on a fresh one.
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+
+
+class PooledResponse:
+    """
+    Fully-read response (the socket is already back in the pool when callers see it).
+    """
+
+    def __init__(self, *, url: str, status: int, reason: str, headers: Any, body: bytes) -> None:
+        self.url = url
+        self.status = int(status)
+        self.reason = str(reason or "")
+        self.headers = headers
+        self._fp = io.BytesIO(body)
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._fp.read() if amt is None else self._fp.read(amt)
+
+    def getcode(self) -> int:
+        return self.status
+
+    def geturl(self) -> str:
+        return self.url
+
+    def info(self) -> Any:
+        return self.headers
+
+    def close(self) -> None:
+        self._fp.close()
+
+    def __enter__(self) -> "PooledResponse":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+
+class HttpConnectionPool:
+    """
+    Thread-safe HTTP/1.1 keep-alive pool keyed by (scheme, host, port).
+
+    - max_per_host   : concurrent connections per key; extra callers wait for a free slot
+                       (bounded by the request timeout), then get `TimeoutError`.
+    - idle_timeout_s : idle sockets older than this are closed instead of reused.
+    - stale retry    : a reused socket that turns out to be closed by the peer is retried
+                       once on a fresh connection.
+    """
+
+    def __init__(self, *, max_per_host: int = 4, idle_timeout_s: float = 30.0) -> None:
+        self._max_per_host = max(1, int(max_per_host or 1))
+        self._idle_timeout_s = max(0.0, float(idle_timeout_s or 0.0))
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: Dict[_PoolKey, List[Tuple[http.client.HTTPConnection, float]]] = {}
+        self._active: Dict[_PoolKey, int] = {}
+        self._ssl_ctx: Optional[ssl.SSLContext] = None
+
+        # Observability (best-effort).
+        self._created = 0
+        self._reused = 0
+        self._stale_retries = 0
+
+    def urlopen(self, req: urllib.request.Request, timeout: float = 10.0, *, _redirected: bool = False) -> Any:
+        try:
+            u = urllib.parse.urlsplit(req.full_url)
+        except Exception:
+            return urllib.request.urlopen(req, timeout=timeout)
+        scheme = str(u.scheme or "").lower()
+        host = str(u.hostname or "")
+        if scheme not in ("http", "https") or not host or self._uses_proxy(scheme, host):
+            return urllib.request.urlopen(req, timeout=timeout)
+        try:
+            port = int(u.port or (443 if scheme == "https" else 80))
+        except ValueError:
+            return urllib.request.urlopen(req, timeout=timeout)
+
+        key: _PoolKey = (scheme, host, port)
+        method = req.get_method()
+        headers = {k: v for k, v in req.header_items()}
+        if not any(k.lower() == "user-agent" for k in headers):
+            headers["User-Agent"] = _DEFAULT_UA
+        body = req.data
+
+        for attempt in (0, 1):
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                conn.request(method, req.selector, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except _STALE_ERRORS as e:
+                self._release(key, conn, keep=False)
+                if reused and attempt == 0:
+                    self._stale_retries += 1
+                    continue
+                raise urllib.error.URLError(e)
+            except TimeoutError:
+                self._release(key, conn, keep=False)
+                raise
+            except OSError as e:
+                self._release(key, conn, keep=False)
+                raise urllib.error.URLError(e)
+            except BaseException:
+                self._release(key, conn, keep=False)
+                raise
+            self._release(key, conn, keep=not resp.will_close)
+            break
+
+        status = int(resp.status)
+        location = resp.headers.get("Location") if status in _REDIRECT_STATUSES else None
+        if location and method in ("GET", "HEAD") and not _redirected:
+            # Rare for API endpoints: follow one hop; the request carries no body to replay.
+            target = urllib.parse.urljoin(req.full_url, str(location))
+            nxt = urllib.request.Request(target, headers=dict(req.header_items()), method=method)
+            return self.urlopen(nxt, timeout=timeout, _redirected=True)
+        if status >= 400 or location:
+            raise urllib.error.HTTPError(req.full_url, status, str(resp.reason or ""), resp.headers, io.BytesIO(data))
+        return PooledResponse(url=req.full_url, status=status, reason=str(resp.reason or ""), headers=resp.headers, body=data)
+
+    @staticmethod
+    def _uses_proxy(scheme: str, host: str) -> bool:
+        try:
+            proxies = urllib.request.getproxies()
+        except Exception:
+            return False
+        if not proxies.get(scheme):
+            return False
+        try:
+            return not bool(urllib.request.proxy_bypass(host))
+        except Exception:
+            return True
+
+    def _acquire(self, key: _PoolKey, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        try:
+            deadline = time.monotonic() + max(0.0, float(timeout or 0.0))
+        except Exception:
+            deadline = time.monotonic()
+        with self._cond:
+            while True:
+                idle = self._idle.get(key) or []
+                now = time.monotonic()
+                while idle:
+                    conn, since = idle.pop()
+                    if self._idle_timeout_s > 0.0 and (now - since) > self._idle_timeout_s:
+                        self._close_quietly(conn)
+                        continue
+                    self._active[key] = self._active.get(key, 0) + 1
+                    self._reused += 1
+                    return conn, True
+                if self._active.get(key, 0) < self._max_per_host:
+                    break
+                remaining = deadline - now
+                if remaining <= 0.0:
+                    raise TimeoutError(f"no free connection for {key[1]}:{key[2]} (max_per_host={self._max_per_host})")
+                self._cond.wait(timeout=remaining)
+            self._active[key] = self._active.get(key, 0) + 1
+            self._created += 1
+        return self._new_connection(key, timeout), False
+
+    def _release(self, key: _PoolKey, conn: http.client.HTTPConnection, *, keep: bool) -> None:
+        with self._cond:
+            self._active[key] = max(0, self._active.get(key, 0) - 1)
+            idle = self._idle.setdefault(key, [])
+            if keep and conn.sock is not None and len(idle) < self._max_per_host:
+                idle.append((conn, time.monotonic()))
+                conn = None  # type: ignore[assignment]
+            self._cond.notify()
+        if conn is not None:
+            self._close_quietly(conn)
+
+    def _new_connection(self, key: _PoolKey, timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            if self._ssl_ctx is None:
+                self._ssl_ctx = ssl.create_default_context()
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_ctx)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    @staticmethod
+    def _close_quietly(conn: http.client.HTTPConnection) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        with self._cond:
+            idle = self._idle
+            self._idle = {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                self._close_quietly(conn)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            idle_n = sum(len(v) for v in self._idle.values())
+            active_n = sum(self._active.values())
+        return {
+            "created": int(self._created),
+            "reused": int(self._reused),
+            "stale_retries": int(self._stale_retries),
+            "idle": int(idle_n),
+            "active": int(active_n),
+        }
+
+
+_DEFAULT_POOL = HttpConnectionPool()
+
+
+def default_pool() -> HttpConnectionPool:
+    return _DEFAULT_POOL
+
+
+def pooled_urlopen(req: urllib.request.Request, timeout: float = 10.0) -> Any:
+    """
+    Drop-in replacement for `urllib.request.urlopen(req, timeout=...)` using the shared pool.
+    """
+    return _DEFAULT_POOL.urlopen(req, timeout=timeout)
@@ -0,0 +1,95 @@
+"""
+JSON codec for hot paths (rollout parsing, SSE / API bodies, ingest, translator requests).
+
+Backend is picked once at import: orjson, then msgspec, then the stdlib `json`
+(override with CODEX_SIDECAR_JSON=orjson|msgspec|stdlib). All backends share the
+same contract:
+- dumps(obj) -> bytes: compact UTF-8 (non-ASCII left unescaped, no str -> encode round trip)
+- loads(data) -> Any: accepts bytes or str; invalid UTF-8 is decoded with replacement
+  (same as the previous `json.loads(b.decode("utf-8", errors="replace"))` call sites)
+
+Fast backends fall back to the stdlib for inputs they reject (invalid UTF-8, non-str
+dict keys, ints beyond 64 bits), so callers see stdlib semantics either way.
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_stdlib_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return _stdlib_encoder.encode(obj).encode("utf-8")
+
+
+def _stdlib_loads(data: Any) -> Any:
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode("utf-8", errors="replace")
+    return json.loads(data)
+
+
+def _with_fallback(fast: Callable[[Any], Any], slow: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def _call(x: Any) -> Any:
+        try:
+            return fast(x)
+        except Exception:
+            return slow(x)
+
+    return _call
+
+
+def _load_orjson() -> Optional[Tuple[Callable[[Any], bytes], Callable[[Any], Any]]]:
+    try:
+        import orjson  # type: ignore
+    except Exception:
+        return None
+    opts = int(getattr(orjson, "OPT_NON_STR_KEYS", 0))
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=opts)
+
+    return _with_fallback(_dumps, _stdlib_dumps), _with_fallback(orjson.loads, _stdlib_loads)
+
+
+def _load_msgspec() -> Optional[Tuple[Callable[[Any], bytes], Callable[[Any], Any]]]:
+    try:
+        import msgspec  # type: ignore
+    except Exception:
+        return None
+    enc = msgspec.json.Encoder()
+    dec = msgspec.json.Decoder()
+    return _with_fallback(enc.encode, _stdlib_dumps), _with_fallback(dec.decode, _stdlib_loads)
+
+
+_LOADERS: Dict[str, Callable[[], Optional[Tuple[Callable[[Any], bytes], Callable[[Any], Any]]]]] = {
+    "orjson": _load_orjson,
+    "msgspec": _load_msgspec,
+    "stdlib": lambda: (_stdlib_dumps, _stdlib_loads),
+}
+
+
+def available_backends() -> List[str]:
+    return [name for name, load in _LOADERS.items() if load() is not None]
+
+
+def get_backend(name: str) -> Optional[Tuple[Callable[[Any], bytes], Callable[[Any], Any]]]:
+    """
+    (dumps, loads) for a named backend, or None when it is not importable.
+    """
+    load = _LOADERS.get(str(name or "").strip().lower())
+    return load() if load is not None else None
+
+
+def _select() -> Tuple[str, Callable[[Any], bytes], Callable[[Any], Any]]:
+    want = str(os.environ.get("CODEX_SIDECAR_JSON") or "").strip().lower()
+    order = [want] if want in _LOADERS else []
+    order += [n for n in _LOADERS if n not in order]
+    for name in order:
+        pair = _LOADERS[name]()
+        if pair is not None:
+            return name, pair[0], pair[1]
+    return "stdlib", _stdlib_dumps, _stdlib_loads
+
+
+BACKEND, dumps, loads = _select()
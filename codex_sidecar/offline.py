@@ -1,11 +1,17 @@
 import hashlib
-import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from urllib.parse import quote
 
-from .watch.rollout_extract import extract_rollout_items
-from .watch.rollout_paths import _ROLLOUT_RE, _latest_rollout_files, _parse_thread_id_from_filename
+from . import json_codec
+from .offline_cache import offline_parse_cache
+from .watch.rollout_extract import extract_rollout_items, rollout_line_may_have_items
+from .watch.rollout_paths import (
+    _ROLLOUT_RE,
+    _catalog as _session_catalog,
+    _latest_rollout_files,
+    _parse_thread_id_from_filename,
+)
 from .watch.tail_lines import read_tail_lines
 
 
@@ -83,19 +89,78 @@ def resolve_offline_rollout_path(codex_home: Path, rel: str) -> Optional[Path]:
     return cand
 
 
-def list_offline_rollout_files(codex_home: Path, limit: int = 60) -> List[Dict[str, Any]]:
+def _catalog_rows(base: Path, limit: int, since_day: str, until_day: str) -> Optional[List[Dict[str, Any]]]:
+    cat = _session_catalog(base)
+    if cat is None:
+        return None
+    try:
+        if since_day or until_day:
+            rows = cat.between_days(since_day or "0000-00-00", until_day or "9999-99-99", limit=limit)
+        else:
+            rows = cat.latest(limit=limit)
+    except Exception:
+        return None
+    out: List[Dict[str, Any]] = []
+    for r in rows:
+        p = Path(str(r.get("path") or ""))
+        try:
+            rel = str(p.relative_to(base)).replace("\\", "/")
+        except Exception:
+            rel = f"sessions/{p.name}"
+        out.append(
+            {
+                "rel": _norm_rel(rel),
+                "file": str(p),
+                "thread_id": str(r.get("thread_id") or ""),
+                "mtime": float(r.get("mtime") or 0.0),
+                "size": int(r.get("size") or 0),
+                "day": str(r.get("day") or ""),
+                "source_kind": str(r.get("source_kind") or ""),
+                "parent_thread_id": str(r.get("parent_thread_id") or ""),
+                "first_user_message": str(r.get("first_user_message") or ""),
+            }
+        )
+    return out
+
+
+def list_offline_rollout_files(
+    codex_home: Path,
+    limit: int = 60,
+    *,
+    since_day: str = "",
+    until_day: str = "",
+) -> List[Dict[str, Any]]:
+    """
+    List recent rollout files for the offline picker.
+
+    - since_day/until_day: optional YYYY-MM-DD bounds on the sessions/YYYY/MM/DD day dir.
+    - Served from the session catalog when one is registered (extra fields: day,
+      source_kind, parent_thread_id, first_user_message); otherwise globbed.
+    """
     out: List[Dict[str, Any]] = []
     try:
         base = Path(str(codex_home or "")).expanduser()
     except Exception:
         return out
+    since_s = str(since_day or "").strip()
+    until_s = str(until_day or "").strip()
+    rows = _catalog_rows(base, max(0, int(limit or 0)), since_s, until_s)
+    if rows is not None:
+        return rows
+    ranged = bool(since_s or until_s)
     try:
-        xs = _latest_rollout_files(base, limit=max(0, int(limit or 0)))
+        xs = _latest_rollout_files(base, limit=0 if ranged else max(0, int(limit or 0)))
     except Exception:
         xs = []
     for p in xs:
         if not p:
             continue
+        if ranged:
+            day = "-".join(p.parts[-4:-1])
+            if (since_s and day < since_s) or (until_s and day > until_s):
+                continue
+            if int(limit or 0) > 0 and len(out) >= int(limit):
+                break
         try:
             if not p.exists() or not p.is_file():
                 continue
@@ -134,50 +199,54 @@ def list_offline_rollout_files(codex_home: Path, limit: int = 60) -> List[Dict[s
     return out
 
 
-def build_offline_messages(
+def _file_thread_id(file_path: Path) -> str:
+    try:
+        return str(_parse_thread_id_from_filename(file_path) or "")
+    except Exception:
+        return ""
+
+
+# Offline messages carry seq = line * _SEQ_PER_LINE + k so rows from different pages sort together.
+_SEQ_PER_LINE = 16
+
+
+def _messages_from_lines(
+    lines: List[bytes],
     *,
-    rel: str,
+    first_line_no: int,
+    off_key: str,
+    tid: str,
     file_path: Path,
-    tail_lines: int,
-    offline_key: str,
 ) -> List[Dict[str, Any]]:
-    """
-    Parse rollout-*.jsonl into the same message schema as /api/messages.
-    """
-    rel_s = _norm_rel(rel)
-    off_key = str(offline_key or "").strip() or offline_key_from_rel(rel_s)
-    try:
-        tid = str(_parse_thread_id_from_filename(file_path) or "")
-    except Exception:
-        tid = ""
-    tail = read_tail_lines(file_path, last_lines=max(0, int(tail_lines or 0)))
     msgs: List[Dict[str, Any]] = []
-    seq = 1
-    line_no = 0
-    for bline in tail:
+    line_no = int(first_line_no) - 1
+    file_s = str(file_path)
+    for bline in lines:
         line_no += 1
-        if not bline:
+        if not bline or not rollout_line_may_have_items(bline):
             continue
         try:
-            obj = json.loads(bline.decode("utf-8", errors="replace"))
+            obj = json_codec.loads(bline)
         except Exception:
             continue
         ts, extracted = extract_rollout_items(obj)
+        if not extracted:
+            continue
+        # Stable offline id: off:${key}:${sha1(rawLine)}
+        # - Avoid collision with live 16-hex ids (DOM ids / caches / exports).
+        # - Raw-line hash is resilient to insertions that shift line numbers.
+        mid = f"off:{off_key}:{_sha1_hex_bytes(bline)}"
+        k = 0
         for item in extracted:
             try:
                 kind = str(item.get("kind") or "")
                 text = str(item.get("text") or "")
             except Exception:
                 continue
-            # Stable offline id: off:${key}:${sha1(rawLine)}
-            # - Avoid collision with live 16-hex ids (DOM ids / caches / exports).
-            # - Raw-line hash is resilient to insertions that shift line numbers.
-            raw_hex = _sha1_hex_bytes(bline)
-            mid = f"off:{off_key}:{raw_hex}"
             msgs.append(
                 {
                     "id": mid,
-                    "seq": int(seq),
+                    "seq": line_no * _SEQ_PER_LINE + min(k, _SEQ_PER_LINE - 1),
                     "ts": str(ts or ""),
                     "kind": kind,
                     "text": text,
@@ -186,9 +255,95 @@ def build_offline_messages(
                     "replay": True,
                     "key": str(off_key),
                     "thread_id": tid,
-                    "file": str(file_path),
+                    "file": file_s,
                     "line": int(line_no),
                 }
             )
-            seq += 1
+            k += 1
     return msgs
+
+
+def _cached_range(
+    file_path: Path,
+    off_key: str,
+    catalog: Any,
+    resolve: Callable[[int], Tuple[int, int]],
+) -> Tuple[List[Dict[str, Any]], int, int, int]:
+    tid = _file_thread_id(file_path)
+
+    def _parse(lines: List[bytes], first_line_no: int) -> List[Dict[str, Any]]:
+        return _messages_from_lines(lines, first_line_no=first_line_no, off_key=off_key, tid=tid, file_path=file_path)
+
+    msgs, start, end, total = offline_parse_cache().get(
+        file_path, tag=off_key, parse=_parse, resolve=resolve, catalog=catalog
+    )
+    return [dict(m) for m in msgs], start, end, total
+
+
+def build_offline_messages(
+    *,
+    rel: str,
+    file_path: Path,
+    tail_lines: int,
+    offline_key: str,
+    catalog: Any = None,
+) -> List[Dict[str, Any]]:
+    """
+    Parse rollout-*.jsonl into the same message schema as /api/messages.
+
+    Served from the parsed offline cache (offline_cache.py): reopening / re-exporting a
+    session only parses lines appended since the last request. `line` is the 1-based
+    file line number (lines are located through the sparse line index).
+    """
+    rel_s = _norm_rel(rel)
+    off_key = str(offline_key or "").strip() or offline_key_from_rel(rel_s)
+    n = max(0, int(tail_lines or 0))
+    try:
+        msgs, _, _, _ = _cached_range(file_path, off_key, catalog, lambda total: (max(0, total - n) if n > 0 else 0, total))
+        return msgs
+    except Exception:
+        pass
+    # File unreadable through the index (e.g. replaced mid-read): plain tail parse.
+    tail = read_tail_lines(file_path, last_lines=n)
+    return _messages_from_lines(tail, first_line_no=1, off_key=off_key, tid=_file_thread_id(file_path), file_path=file_path)
+
+
+def page_offline_messages(
+    *,
+    rel: str,
+    file_path: Path,
+    offline_key: str,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    limit: int = 200,
+    catalog: Any = None,
+) -> Dict[str, Any]:
+    """
+    Line-cursor page over a rollout file (cursors are 1-based line numbers).
+
+    - before: lines < before (default page = last `limit` lines)
+    - after : lines > after (takes precedence over before)
+    - prev  : pass as `before=` for older lines (None at line 1)
+    - next  : pass as `after=` for newer lines (None at the last complete line)
+    - lines : complete lines currently in the file
+
+    Served from the parsed offline cache, so paging back only parses the lines not yet seen.
+    """
+    rel_s = _norm_rel(rel)
+    off_key = str(offline_key or "").strip() or offline_key_from_rel(rel_s)
+    n = max(1, int(limit or 0))
+
+    def _resolve(total: int) -> Tuple[int, int]:
+        if after is not None:
+            start = max(0, min(total, int(after)))
+            return start, min(total, start + n)
+        end = total if before is None else max(0, min(total, int(before) - 1))
+        return max(0, end - n), end
+
+    msgs, start, end, total = _cached_range(file_path, off_key, catalog, _resolve)
+    return {
+        "messages": msgs,
+        "prev": (start + 1) if start > 0 else None,
+        "next": end if (end > start and end < total) else None,
+        "lines": total,
+    }
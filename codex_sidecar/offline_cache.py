@@ -0,0 +1,202 @@
+"""
+Parsed offline session cache (LRU, bounded by an estimated memory budget).
+
+One entry per rollout file holds the parsed messages of a contiguous line range that
+always ends at the last complete line seen. Entries are validated by file identity
+(path, inode, size, mtime):
+- unchanged identity         -> hit, no file IO
+- same inode, file grew      -> only the appended lines are parsed and appended
+- older lines requested      -> only the missing lines are parsed and prepended
+- replaced / shrunk / rewritten in place -> rebuilt
+
+Lines are located through the sparse line index (session catalog when available,
+otherwise an in-memory index kept in the entry).
+"""
+
+import os
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .watch.line_index import LineIndex, read_indexed_lines, update_line_index
+
+DEFAULT_BUDGET_BYTES = 64 * 1024 * 1024
+# Rough per-message overhead (dict + fixed fields) on top of text/id lengths.
+_MSG_OVERHEAD_BYTES = 480
+
+# parse(lines, first_line_no) -> messages (each with an int "line")
+ParseFn = Callable[[List[bytes], int], List[Dict[str, Any]]]
+# resolve(total_lines) -> (start, end): 0-based half-open line range to return
+ResolveFn = Callable[[int], Tuple[int, int]]
+
+
+def _msg_bytes(m: Dict[str, Any]) -> int:
+    try:
+        return _MSG_OVERHEAD_BYTES + len(m.get("text") or "") + len(m.get("id") or "")
+    except Exception:
+        return _MSG_OVERHEAD_BYTES
+
+
+@dataclass
+class _Entry:
+    tag: str
+    dev: int
+    ino: int
+    size: int
+    mtime_ns: int
+    # Parsed line range [start, end) (0-based) and total complete lines at last refresh.
+    start: int = 0
+    end: int = 0
+    msgs: List[Dict[str, Any]] = field(default_factory=list)
+    lines_of: List[int] = field(default_factory=list)
+    nbytes: int = 0
+    idx: Optional[LineIndex] = None
+
+
+class OfflineParseCache:
+    def __init__(self, max_bytes: int = DEFAULT_BUDGET_BYTES) -> None:
+        self._lock = threading.Lock()
+        self._max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._extends = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def set_budget(self, max_bytes: int) -> None:
+        with self._lock:
+            self._max_bytes = max(0, int(max_bytes))
+            self._evict_locked()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": int(self._bytes),
+                "max_bytes": int(self._max_bytes),
+                "hits": int(self._hits),
+                "extends": int(self._extends),
+                "misses": int(self._misses),
+                "evictions": int(self._evictions),
+            }
+
+    def get(
+        self,
+        path: Path,
+        *,
+        tag: str,
+        parse: ParseFn,
+        resolve: ResolveFn,
+        catalog: Any = None,
+    ) -> Tuple[List[Dict[str, Any]], int, int, int]:
+        """
+        Return (messages, start, end, total_lines) for the line range chosen by `resolve`.
+
+        `tag` must change whenever `parse` would produce different output for the same
+        bytes (e.g. the offline key embedded in ids). Raises OSError when the file is
+        unreadable. Returned message dicts are shared; callers copy before mutating.
+        """
+        key = str(path)
+        st = os.stat(path)
+        ident = (int(st.st_dev), int(st.st_ino), int(st.st_size), int(st.st_mtime_ns))
+        with self._lock:
+            ent = self._entries.get(key)
+            if ent is not None:
+                self._bytes -= ent.nbytes
+                self._entries.pop(key, None)
+            try:
+                ent, state = self._refresh_locked(path, ent, ident, tag, parse, catalog)
+                s, e = resolve(ent.end)
+                s = max(0, min(int(s), ent.end))
+                e = max(s, min(int(e), ent.end))
+                if s < ent.start:
+                    self._prepend_locked(path, ent, s, parse, catalog)
+                    if state == "hit":
+                        state = "extend"
+            except Exception:
+                self._evict_locked()
+                raise
+            if state == "hit":
+                self._hits += 1
+            elif state == "extend":
+                self._extends += 1
+            else:
+                self._misses += 1
+            lo = bisect_left(ent.lines_of, s + 1)
+            hi = bisect_left(ent.lines_of, e + 1)
+            out = ent.msgs[lo:hi]
+            self._entries[key] = ent
+            self._bytes += ent.nbytes
+            self._evict_locked()
+            return out, s, e, ent.end
+
+    def _index(self, path: Path, ent: _Entry, catalog: Any) -> LineIndex:
+        if catalog is not None:
+            try:
+                return catalog.line_index(path)
+            except Exception:
+                pass
+        ent.idx, _ = update_line_index(path, ent.idx)
+        return ent.idx
+
+    def _refresh_locked(
+        self,
+        path: Path,
+        ent: Optional[_Entry],
+        ident: Tuple[int, int, int, int],
+        tag: str,
+        parse: ParseFn,
+        catalog: Any,
+    ) -> Tuple[_Entry, str]:
+        dev, ino, size, mtime_ns = ident
+        if ent is not None and ent.tag == tag and (ent.dev, ent.ino) == (dev, ino):
+            if (ent.size, ent.mtime_ns) == (size, mtime_ns):
+                return ent, "hit"
+            if size > ent.size:
+                idx = self._index(path, ent, catalog)
+                total = int(idx.lines)
+                if total >= ent.end:
+                    new = parse(read_indexed_lines(path, idx, ent.end, total - ent.end), ent.end + 1)
+                    ent.msgs.extend(new)
+                    ent.lines_of.extend(int(m.get("line") or 0) for m in new)
+                    ent.nbytes += sum(_msg_bytes(m) for m in new)
+                    ent.end = total
+                    ent.size, ent.mtime_ns = size, mtime_ns
+                    return ent, "extend"
+        ent = _Entry(tag=tag, dev=dev, ino=ino, size=size, mtime_ns=mtime_ns)
+        idx = self._index(path, ent, catalog)
+        ent.start = ent.end = int(idx.lines)
+        return ent, "miss"
+
+    def _prepend_locked(self, path: Path, ent: _Entry, start: int, parse: ParseFn, catalog: Any) -> None:
+        idx = self._index(path, ent, catalog)
+        if int(idx.lines) < ent.start:
+            raise OSError("rollout file shrank while reading")
+        new = parse(read_indexed_lines(path, idx, start, ent.start - start), start + 1)
+        ent.msgs[:0] = new
+        ent.lines_of[:0] = [int(m.get("line") or 0) for m in new]
+        ent.nbytes += sum(_msg_bytes(m) for m in new)
+        ent.start = start
+
+    def _evict_locked(self) -> None:
+        # Least recently used first; an entry larger than the whole budget is not kept.
+        while self._bytes > self._max_bytes and self._entries:
+            _, ent = self._entries.popitem(last=False)
+            self._bytes -= ent.nbytes
+            self._evictions += 1
+
+
+_CACHE = OfflineParseCache()
+
+
+def offline_parse_cache() -> OfflineParseCache:
+    return _CACHE
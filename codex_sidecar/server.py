@@ -3,6 +3,7 @@ import time
 from http.server import ThreadingHTTPServer
 from typing import Any, Optional
 
+from .http.aio_server import AsyncSidecarHTTPServer
 from .http.handler import SidecarHandler
 from .http.state import SidecarState
 
@@ -12,12 +13,27 @@ class _ReuseHTTPServer(ThreadingHTTPServer):
     allow_reuse_address = True
 
 
+SERVER_CORES = ("threading", "asyncio")
+
+
 class SidecarServer:
-    def __init__(self, host: str, port: int, max_messages: int, controller: Optional[Any] = None) -> None:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        max_messages: int,
+        controller: Optional[Any] = None,
+        *,
+        core: str = "threading",
+    ) -> None:
         self._host = host
         self._port = port
         self._state = SidecarState(max_messages=max_messages)
-        self._httpd = _ReuseHTTPServer((host, port), SidecarHandler)
+        if str(core or "").strip().lower() == "asyncio":
+            # SSE clients as coroutines + bounded API worker pool (no thread per connection).
+            self._httpd: Any = AsyncSidecarHTTPServer((host, port))
+        else:
+            self._httpd = _ReuseHTTPServer((host, port), SidecarHandler)
         # Attach state to server instance for handler access.
         self._httpd.state = self._state  # type: ignore[attr-defined]
         self._httpd.controller = controller  # type: ignore[attr-defined]
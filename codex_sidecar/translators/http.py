@@ -8,6 +8,8 @@ from dataclasses import dataclass
 from socket import timeout as _SocketTimeout
 from typing import Dict, List, Tuple, Optional
 
+from ..http_pool import pooled_urlopen
+from .. import json_codec
 from .utils import compose_auth_value, log_warn, normalize_url, sanitize_url
 
 
@@ -367,7 +369,7 @@ class HttpTranslator:
                 "source_lang": "EN",
                 "target_lang": "ZH",
             }
-            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            data = json_codec.dumps(payload)
             req = urllib.request.Request(base_url, data=data, method="POST")
             req.add_header("Content-Type", "application/json; charset=utf-8")
 
@@ -377,7 +379,7 @@ class HttpTranslator:
         if token and not (is_google_pa or is_google_a):
             req.add_header(self.auth_header, compose_auth_value(self.auth_prefix, token))
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
+            with pooled_urlopen(req, timeout=self.timeout_s) as resp:
                 raw = resp.read()
                 ctype = str(resp.headers.get("Content-Type") or "")
             def _maybe_restore(txt: str) -> str:
@@ -388,7 +390,7 @@ class HttpTranslator:
                 except Exception:
                     return txt
             try:
-                obj = json.loads(raw.decode("utf-8", errors="replace"))
+                obj = json_codec.loads(raw)
             except ValueError:
                 # If server returns plain text (non-JSON), try to use it.
                 try:
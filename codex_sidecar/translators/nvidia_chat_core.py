@@ -1,4 +1,3 @@
-import json
 import os
 import time
 import hashlib
@@ -9,6 +8,8 @@ from collections import OrderedDict
 from dataclasses import dataclass, field
 from socket import timeout as _SocketTimeout
 
+from .. import json_codec
+from ..http_pool import pooled_urlopen
 from .batch_prompt import looks_like_translate_batch_prompt as _looks_like_translate_batch_prompt
 from .nvidia_chat_helpers import (
     _extract_chat_completions_text,
@@ -234,17 +235,17 @@ class NvidiaChatTranslator:
 
             try:
                 try:
-                    data = json.dumps({**base_payload, "model": model}, ensure_ascii=False).encode("utf-8")
+                    data = json_codec.dumps({**base_payload, "model": model})
                 except Exception:
                     self.last_error = _log_nvidia_translate_error(endpoint, detail="json_encode_failed")
                     return ""
 
                 req = _make_req(data)
-                with urllib.request.urlopen(req, timeout=float(effective_timeout_s)) as resp:
+                with pooled_urlopen(req, timeout=float(effective_timeout_s)) as resp:
                     raw = resp.read()
                     ctype = str(resp.headers.get("Content-Type") or "")
                 try:
-                    obj = json.loads(raw.decode("utf-8", errors="replace"))
+                    obj = json_codec.loads(raw)
                 except ValueError:
                     # If server returns plain text (non-JSON), try to use it.
                     try:
@@ -1,4 +1,3 @@
-import json
 import os
 import hashlib
 import urllib.error
@@ -7,6 +6,8 @@ from collections import OrderedDict
 from dataclasses import dataclass, field
 from socket import timeout as _SocketTimeout
 
+from .. import json_codec
+from ..http_pool import pooled_urlopen
 from .utils import compose_auth_value, log_warn, normalize_url, sanitize_url
 from .batch_prompt import looks_like_translate_batch_prompt as _looks_like_translate_batch_prompt
 
@@ -116,7 +117,7 @@ def _extract_openai_responses_text_from_sse(raw: bytes) -> str:
         if not payload or payload == "[DONE]":
             continue
         try:
-            obj = json.loads(payload)
+            obj = json_codec.loads(payload)
         except Exception:
             continue
         if not isinstance(obj, dict):
@@ -238,7 +239,7 @@ class OpenAIResponsesTranslator:
         if effort and _model_supports_reasoning(payload["model"]):
             payload["reasoning"] = {"effort": effort}
 
-        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        data = json_codec.dumps(payload)
         req = urllib.request.Request(endpoint, data=data, method="POST")
         req.add_header("Content-Type", "application/json; charset=utf-8")
         # Prefer a single JSON response when gateways support content negotiation.
@@ -254,11 +255,11 @@ class OpenAIResponsesTranslator:
             req.add_header(ah, compose_auth_value(self.auth_prefix, token))
 
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
+            with pooled_urlopen(req, timeout=self.timeout_s) as resp:
                 raw = resp.read()
                 ctype = str(resp.headers.get("Content-Type") or "")
             try:
-                obj = json.loads(raw.decode("utf-8", errors="replace"))
+                obj = json_codec.loads(raw)
             except ValueError:
                 # Some gateways may return SSE even when `stream:false`.
                 if "text/event-stream" in (ctype or "").lower() or raw.lstrip().startswith(b"event:") or b"\ndata:" in raw:
@@ -1,34 +1,102 @@
-from typing import Set
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+# Rough per-entry cost: OrderedDict node + value tuple, on top of the key itself.
+_ENTRY_OVERHEAD_BYTES = 160
+
+
+def _key_bytes(key: Hashable) -> int:
+    if isinstance(key, str):
+        return 49 + len(key)
+    if isinstance(key, tuple):
+        return 56 + 36 * len(key)
+    return 64
 
 
 class DedupeCache:
     """
-    轻量去重缓存。
+    去重缓存（LRU + 可选按 kind 的 TTL），按估算字节数限制内存。
 
     说明：
-    - 该 sidecar 的去重目标是“避免重复推送”，无需严格 LRU/TTL。
-    - 超过阈值后直接清空集合是可接受的近似（重复数据是有界且无害的）。
-    - 保留 (key, kind) 形参以兼容旧调用（例如 TUI gate tailer）。
+    - key 可以是任意可哈希值：rollout 行使用结构化 key (dev, ino, offset, item_idx)，
+      无偏移信息时回退 sha1 字符串（TUI gate 等旧调用方保持不变）。
+    - 命中会刷新 LRU 位置；超过 max_bytes 时从最久未用的一端淘汰（不再整体清空）。
+    - ttl_s_by_kind：指定 kind 的条目过期后视为未见过（重新放行一次）。
+    - 保留 (key, kind) 调用签名以兼容旧调用。
     """
 
-    def __init__(self, max_size: int = 5000) -> None:
+    def __init__(
+        self,
+        max_size: int = 0,
+        *,
+        max_bytes: int = 8 * 1024 * 1024,
+        ttl_s_by_kind: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         try:
             n = int(max_size)
         except Exception:
-            n = 5000
-        self._max_size = n if n > 0 else 5000
-        self._seen: Set[str] = set()
-
-    def __call__(self, key: str, kind: str = "") -> bool:
-        _ = kind  # 兼容旧签名；当前实现不按 kind 分桶
-        k = str(key or "")
-        if not k:
+            n = 0
+        # Optional entry-count cap (0 = bytes only); kept for older callers.
+        self._max_entries = n if n > 0 else 0
+        self._max_bytes = max(1024, int(max_bytes or 0))
+        self._ttl: Dict[str, float] = {str(k): float(v) for k, v in (ttl_s_by_kind or {}).items() if float(v) > 0}
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at or 0.0, estimated bytes)
+        self._seen: "OrderedDict[Hashable, Tuple[float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+
+    def __call__(self, key: Hashable, kind: str = "") -> bool:
+        """
+        True when `key` was seen (and has not expired); otherwise records it and returns False.
+        """
+        if key is None or key == "":
+            return False
+        ttl = self._ttl.get(str(kind or "")) if self._ttl else None
+        with self._lock:
+            now = self._clock() if ttl else 0.0
+            cur = self._seen.get(key)
+            if cur is not None:
+                exp = cur[0]
+                if not exp or (now or self._clock()) < exp:
+                    self._seen.move_to_end(key)
+                    self._hits += 1
+                    return True
+                self._expired += 1
+                self._seen[key] = (now + ttl if ttl else 0.0, cur[1])
+                self._seen.move_to_end(key)
+                self._misses += 1
+                return False
+            nb = _ENTRY_OVERHEAD_BYTES + _key_bytes(key)
+            self._seen[key] = (now + ttl if ttl else 0.0, nb)
+            self._bytes += nb
+            self._misses += 1
+            while self._seen and (
+                self._bytes > self._max_bytes or (self._max_entries and len(self._seen) > self._max_entries)
+            ):
+                _, (_, old_nb) = self._seen.popitem(last=False)
+                self._bytes -= old_nb
+                self._evictions += 1
             return False
-        if k in self._seen:
-            return True
-        self._seen.add(k)
-        if len(self._seen) > self._max_size:
-            self._seen.clear()
-            self._seen.add(k)
-        return False
 
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._seen),
+                "bytes": int(self._bytes),
+                "max_bytes": int(self._max_bytes),
+                "hits": int(self._hits),
+                "misses": int(self._misses),
+                "expired": int(self._expired),
+                "evictions": int(self._evictions),
+            }
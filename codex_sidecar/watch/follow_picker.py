@@ -5,15 +5,13 @@ from pathlib import Path
 from typing import List, Optional, Pattern, Sequence, Tuple
 
 from .procfs import (
-    _proc_iter_fd_targets_with_flags,
     _proc_list_pids,
     _proc_read_argv0_basename,
     _proc_read_exe_basename,
-    _proc_read_ppid,
+    _proc_read_fd_flags,
 )
+from .proc_table import FdTable, ProcTable, _proc_list_fds, _proc_read_fd_link, _proc_read_stat
 from .process_follow_scan import (
-    collect_process_tree as _collect_process_tree_impl,
-    detect_processes as _detect_processes_impl,
     find_rollout_opened_by_pids as _find_rollout_opened_by_pids_impl,
     pid_matches_regex as _pid_matches_regex_impl,
 )
@@ -57,6 +55,25 @@ class FollowPicker:
             self._codex_process_re = re.compile(self._codex_process_regex_raw, flags=re.IGNORECASE)
         except Exception:
             self._codex_process_re = None
+        # Cached /proc table: each scan only examines new pids (see ProcTable).
+        # Readers resolve module globals at call time (tests patch them here).
+        self._proc_table = ProcTable(
+            list_pids=lambda: _proc_list_pids(),
+            read_stat=lambda pid: _proc_read_stat(pid),
+            read_exe_basename=lambda pid: _proc_read_exe_basename(pid),
+            read_argv0_basename=lambda pid: _proc_read_argv0_basename(pid),
+        )
+        self._fd_table = FdTable(
+            list_fds=lambda pid: _proc_list_fds(pid),
+            read_link=lambda pid, fd: _proc_read_fd_link(pid, fd),
+            read_flags=lambda pid, fd: _proc_read_fd_flags(pid, fd),
+        )
+        prefixes = [str(codex_home).rstrip(os.sep) + os.sep]
+        try:
+            prefixes.append(str(codex_home.resolve()).rstrip(os.sep) + os.sep)
+        except Exception:
+            pass
+        self._home_prefixes = tuple(prefixes)
 
     @property
     def codex_process_regex(self) -> str:
@@ -257,35 +274,54 @@ class FollowPicker:
             read_argv0_basename=_proc_read_argv0_basename,
         )
 
+    def request_fd_rescan(self) -> None:
+        """
+        Next process scan re-reads every fd link (a new rollout may sit on a reused fd number).
+        """
+        self._fd_table.request_full_scan()
+
+    def proc_stats(self) -> dict:
+        return {"procs": self._proc_table.stats(), "fds": self._fd_table.stats()}
+
     def _detect_codex_processes(self) -> List[int]:
         """
-        Full scan of /proc to find candidate Codex processes (strong match only).
+        Refresh the cached /proc table and return candidate Codex processes (strong match only).
 
         约定（更精准，默认不误伤）：
         - 仅匹配 /proc/<pid>/exe basename 与 argv0 basename（fullmatch）
         - 不再回退到整条 cmdline 的弱匹配（避免“名字里带 codex”的非目标进程污染名单）
         """
         re_pat = self._codex_process_re
+        if re_pat is None:
+            return []
         try:
             my_pid = int(os.getpid())
         except Exception:
             my_pid = None
-        return _detect_processes_impl(
-            re_pat=re_pat,
-            list_pids=_proc_list_pids,
-            read_exe_basename=_proc_read_exe_basename,
-            read_argv0_basename=_proc_read_argv0_basename,
-            exclude_pid=my_pid,
-            limit=64,
-        )
+        try:
+            self._proc_table.refresh(re_pat)
+        except Exception:
+            return []
+        return self._proc_table.matching(exclude_pid=my_pid, limit=64)
 
     def _collect_process_tree(self, roots: Sequence[int]) -> List[int]:
-        return _collect_process_tree_impl(roots, list_pids=_proc_list_pids, read_ppid=_proc_read_ppid)
+        # Uses the table refreshed by the preceding _detect_codex_processes() call.
+        return self._proc_table.tree(roots)
+
+    def _is_rollout_fd_target(self, target: str) -> bool:
+        # Cheap string checks first: most descriptors are sockets, pipes, libraries, ...
+        if not target.endswith(".jsonl") or "rollout-" not in target:
+            return False
+        if not target.startswith(self._home_prefixes):
+            return False
+        return bool(_ROLLOUT_RE.match(os.path.basename(target)))
 
     def _find_rollout_opened_by_pids(self, pids: Sequence[int], *, limit: int = 12) -> Tuple[List[Path], List[int]]:
+        # Incremental fd scan; fdinfo flags are only read for rollout files under CODEX_HOME.
+        hits = self._fd_table.scan(pids, self._is_rollout_fd_target)
         return _find_rollout_opened_by_pids_impl(
-            pids,
+            sorted(hits),
             codex_home=self._codex_home,
-            iter_fd_targets_with_flags=_proc_iter_fd_targets_with_flags,
+            iter_fd_targets_with_flags=lambda pid: hits.get(pid, []),
             limit=limit,
         )
@@ -0,0 +1,280 @@
+"""
+Linux inotify event source for the rollout watcher (ctypes, no extra dependency).
+
+The watcher loop normally sleeps `poll_interval_s` between polls. When inotify is
+available it instead blocks on directory watches (sessions day dirs, parents of the
+followed rollout files, log/) and wakes as soon as Codex writes something.
+
+Fallback: returns None from `open_fs_event_source` when inotify is unavailable or the
+watched tree lives on a filesystem that does not deliver events reliably (e.g. WSL's
+`/mnt/*` drvfs/9p mounts, NFS/CIFS); the watcher then keeps the polling loop.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_DIR_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+_EVENT_HDR = struct.Struct("iIII")
+# Events that mean "this file now has new content".
+_WRITE_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_CREATE | IN_MOVED_TO
+# Changed file paths remembered between take_changed_paths() calls (extra ones are dropped;
+# the periodic full re-scan covers them).
+_MAX_CHANGED_PATHS = 1024
+
+# Filesystems where inotify misses changes made by the "other side" (host/remote writers).
+_NO_INOTIFY_FSTYPES = {"9p", "drvfs", "nfs", "nfs4", "cifs", "smb3", "smbfs", "vboxsf", "fuse.sshfs"}
+
+_LIBC = None
+
+
+def _libc():
+    global _LIBC
+    if _LIBC is None:
+        name = ctypes.util.find_library("c")
+        lib = ctypes.CDLL(name or None, use_errno=True)
+        lib.inotify_init1.argtypes = [ctypes.c_int]
+        lib.inotify_init1.restype = ctypes.c_int
+        lib.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        lib.inotify_add_watch.restype = ctypes.c_int
+        lib.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        lib.inotify_rm_watch.restype = ctypes.c_int
+        _LIBC = lib
+    return _LIBC
+
+
+def _mount_fstype(path: Path) -> str:
+    """
+    Best-effort filesystem type of the mount containing `path` (longest mountpoint prefix).
+    """
+    try:
+        target = str(path.resolve())
+    except Exception:
+        target = str(path)
+    best = ""
+    best_type = ""
+    try:
+        with open("/proc/self/mounts", "r", encoding="utf-8", errors="replace") as f:
+            for ln in f:
+                parts = ln.split()
+                if len(parts) < 3:
+                    continue
+                mnt = parts[1].replace("\\040", " ")
+                if not (target == mnt or target.startswith(mnt.rstrip("/") + "/") or mnt == "/"):
+                    continue
+                if len(mnt) >= len(best):
+                    best = mnt
+                    best_type = parts[2]
+    except Exception:
+        return ""
+    return best_type
+
+
+def fs_events_supported(path: Path) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        lib = _libc()
+        _ = lib.inotify_init1
+    except Exception:
+        return False
+    fstype = _mount_fstype(path).lower()
+    return fstype not in _NO_INOTIFY_FSTYPES
+
+
+def wait_readable(fds: Sequence[int], timeout_s: float) -> List[int]:
+    """
+    poll(2) for readability: unlike select() it has no FD_SETSIZE limit (this process keeps
+    many fds open: cached rollouts, SQLite, SSE sockets, pidfds).
+
+    Never returns early without sleeping: on error, or when only invalid fds fired, it waits
+    out the timeout so callers looping on it cannot spin.
+    """
+    timeout = max(0.0, float(timeout_s))
+    try:
+        p = select.poll()
+        for fd in fds:
+            p.register(fd, select.POLLIN)
+        events = p.poll(timeout * 1000.0)
+    except (OSError, ValueError):
+        time.sleep(timeout)
+        return []
+    ready = [fd for fd, ev in events if ev & (select.POLLIN | select.POLLHUP | select.POLLERR)]
+    if events and not ready:
+        time.sleep(timeout)
+    return ready
+
+
+class InotifyEventSource:
+    """
+    Directory watches + a self-pipe so other threads (stop / follow changes) can wake `wait()`.
+    """
+
+    def __init__(self) -> None:
+        lib = _libc()
+        fd = lib.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e))
+        self._lib = lib
+        self._fd = fd
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._wd_by_dir: Dict[str, int] = {}
+        self._dir_by_wd: Dict[int, str] = {}
+        self._changed: Dict[str, None] = {}
+        self._closed = False
+
+    def set_dirs(self, dirs: Iterable[Path]) -> None:
+        """
+        Sync the watch set to exactly `dirs` (missing dirs are skipped).
+        """
+        want: Dict[str, Path] = {}
+        for d in dirs:
+            try:
+                if d is not None and d.is_dir():
+                    want[str(d)] = d
+            except Exception:
+                continue
+        for key in list(self._wd_by_dir.keys()):
+            if key in want:
+                continue
+            wd = self._wd_by_dir.pop(key)
+            self._dir_by_wd.pop(wd, None)
+            try:
+                self._lib.inotify_rm_watch(self._fd, wd)
+            except Exception:
+                pass
+        for key in want:
+            if key in self._wd_by_dir:
+                continue
+            wd = self._lib.inotify_add_watch(self._fd, os.fsencode(key), _DIR_MASK)
+            if wd >= 0:
+                self._wd_by_dir[key] = wd
+                self._dir_by_wd[wd] = key
+
+    def watched_dirs(self) -> int:
+        return len(self._wd_by_dir)
+
+    def take_changed_paths(self) -> List[Path]:
+        """
+        Files written / created in watched dirs since the last call (in event order).
+        """
+        out = [Path(p) for p in self._changed]
+        self._changed = {}
+        return out
+
+    def wait(self, timeout_s: float) -> int:
+        """
+        Block until a watched directory changes, `wake()` is called, or timeout.
+
+        Returns the OR of all drained event masks (0 on timeout / plain wake).
+        """
+        return self.wait_fds(timeout_s, ())[0]
+
+    def wait_fds(self, timeout_s: float, extra_fds: Sequence[int]) -> Tuple[int, List[int]]:
+        """
+        Like wait(), but also wakes when one of `extra_fds` (e.g. pidfds) becomes readable.
+
+        Returns (event mask, ready extra fds).
+        """
+        if self._closed:
+            return 0, []
+        extra = list(extra_fds or ())
+        r = wait_readable([self._fd, self._wake_r] + extra, timeout_s)
+        if self._wake_r in r:
+            try:
+                while os.read(self._wake_r, 4096):
+                    pass
+            except (BlockingIOError, OSError):
+                pass
+        ready = [fd for fd in r if fd in extra]
+        if self._fd not in r:
+            return 0, ready
+        return self._drain(), ready
+
+    def _drain(self) -> int:
+        mask = 0
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                break
+            if not buf:
+                break
+            pos = 0
+            n = len(buf)
+            while pos + _EVENT_HDR.size <= n:
+                wd, m, _cookie, name_len = _EVENT_HDR.unpack_from(buf, pos)
+                name = buf[pos + _EVENT_HDR.size : pos + _EVENT_HDR.size + name_len].rstrip(b"\0")
+                pos += _EVENT_HDR.size + name_len
+                mask |= m
+                if name and (m & _WRITE_MASK) and len(self._changed) < _MAX_CHANGED_PATHS:
+                    d = self._dir_by_wd.get(wd)
+                    if d is not None:
+                        self._changed[os.path.join(d, os.fsdecode(name))] = None
+                if m & IN_IGNORED:
+                    # Watch removed by the kernel (dir deleted/moved); forget it so set_dirs can re-add.
+                    for key, val in list(self._wd_by_dir.items()):
+                        if val == wd:
+                            self._wd_by_dir.pop(key, None)
+                    self._dir_by_wd.pop(wd, None)
+        return mask
+
+    def wake(self) -> None:
+        if self._closed:
+            return
+        try:
+            os.write(self._wake_w, b"x")
+        except (BlockingIOError, OSError):
+            pass
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._wd_by_dir.clear()
+        self._dir_by_wd.clear()
+        self._changed = {}
+
+
+def open_fs_event_source(codex_home: Path) -> Optional[InotifyEventSource]:
+    """
+    Return an inotify source for CODEX_HOME, or None when the polling fallback should be used.
+    """
+    if not fs_events_supported(codex_home):
+        return None
+    try:
+        return InotifyEventSource()
+    except Exception:
+        return None
@@ -1,23 +1,225 @@
-import json
+import http.client
+import threading
+import time
 import urllib.error
 import urllib.request
-from dataclasses import dataclass
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Protocol
+
+from .. import json_codec
+from ..http_pool import pooled_urlopen
+
+
+class IngestSink(Protocol):
+    """
+    Watcher 的消息出口（HTTP /ingest 或进程内直连 SidecarState）。
+
+    约定：返回 True 表示消息已被接收（入库或入队）；入队的确认是延迟的（见各实现说明），
+    返回 False 时调用方不应再为该消息计数或排队翻译。
+    """
+
+    def ingest(self, msg: Dict[str, Any]) -> bool:
+        ...
+
+
+def _retryable(status: Optional[int]) -> bool:
+    """
+    None (connection error / timeout), 5xx, 408 and 429 are worth retrying; other statuses are final.
+    """
+    return status is None or status >= 500 or status in (408, 429)
 
 
 @dataclass
 class HttpIngestClient:
+    """
+    HTTP ingest client for external producers.
+
+    - batch_max <= 0: one POST /ingest per message (legacy behavior).
+    - batch_max > 0 : buffer messages and POST them as NDJSON to /ingest/batch when the
+      buffer reaches batch_max or batch_interval_s after the first buffered message.
+      Falls back to per-message /ingest if the server does not know /ingest/batch.
+
+    Acknowledgement is deferred: True means "accepted or buffered for delivery". Messages
+    that hit a transient failure (connection error, timeout, 5xx/408/429) go back to the
+    buffer in order (bounded by max_buffered; the oldest overflow is dropped and counted)
+    and the background flusher retries them every retry_interval_s. Messages the server
+    rejects for good (other 4xx) are dropped and counted; ingest() only returns False for
+    such a message sent on its own.
+    """
+
     server_url: str
     timeout_s: float = 2.0
+    batch_max: int = 0
+    batch_interval_s: float = 0.02
+    max_buffered: int = 4096
+    retry_interval_s: float = 1.0
+    _buf: List[Dict[str, Any]] = field(default_factory=list, init=False, repr=False)
+    _buf_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _send_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _wake: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _flusher: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+    _batch_supported: bool = field(default=True, init=False, repr=False)
+    _dropped: int = field(default=0, init=False, repr=False)
+    _failing: bool = field(default=False, init=False, repr=False)
 
     def ingest(self, msg: Dict[str, Any]) -> bool:
-        url = self.server_url.rstrip("/") + "/ingest"
-        data = json.dumps(msg, ensure_ascii=False).encode("utf-8")
+        if int(self.batch_max or 0) <= 0 or not self._batch_supported:
+            if self._buf and not self.flush():
+                # Keep order behind messages still waiting for a retry.
+                self._append(msg)
+                return True
+            with self._send_lock:
+                # Nothing buffered and no send in flight: posting now cannot overtake a retry.
+                sent = not self._buf
+                st = self._post_one(msg) if sent else None
+                if st is not None and 200 <= st < 300:
+                    return True
+                if st is not None and not _retryable(st):
+                    with self._buf_lock:
+                        self._dropped += 1
+                    return False
+                if sent:
+                    self._failing = True
+                with self._buf_lock:
+                    self._buf.append(msg)
+                    self._cap_locked()
+            self._ensure_flusher()
+            self._wake.set()
+            return True
+        self._append(msg, wake=False)
+        with self._buf_lock:
+            full = len(self._buf) >= int(self.batch_max)
+        # While the server is unreachable the flusher retries in the background; do not
+        # block the caller on a synchronous send per message.
+        if full and not self._failing:
+            self.flush()
+            return True
+        self._ensure_flusher()
+        self._wake.set()
+        return True
+
+    def flush(self) -> bool:
+        """
+        Send everything buffered so far (batches are sent strictly in order).
+
+        Returns False when a transient failure left messages buffered for a retry.
+        """
+        with self._send_lock:
+            with self._buf_lock:
+                batch = self._buf
+                self._buf = []
+            if not batch:
+                return True
+            failed = self._send_batch(batch)
+            self._failing = bool(failed)
+            if failed:
+                self._rebuffer(failed)
+            return not failed
+
+    def _rebuffer(self, failed: List[Dict[str, Any]]) -> None:
+        with self._buf_lock:
+            self._buf = failed + self._buf
+            self._cap_locked()
+
+    def _append(self, msg: Dict[str, Any], *, wake: bool = True) -> None:
+        with self._buf_lock:
+            self._buf.append(msg)
+            self._cap_locked()
+        if wake:
+            self._ensure_flusher()
+            self._wake.set()
+
+    def _cap_locked(self) -> None:
+        over = len(self._buf) - max(1, int(self.max_buffered or 1))
+        if over > 0:
+            del self._buf[:over]
+            self._dropped += over
+
+    def _ensure_flusher(self) -> None:
+        t = self._flusher
+        if t is not None and t.is_alive():
+            return
+        with self._buf_lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            t = threading.Thread(target=self._flush_loop, name="sidecar-ingest-flush", daemon=True)
+            self._flusher = t
+        t.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            # Sleep until something is buffered, then give the buffer one interval to fill up.
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                time.sleep(max(0.0, float(self.batch_interval_s or 0.0)))
+            except Exception:
+                pass
+            try:
+                ok = self.flush()
+            except Exception:
+                ok = False
+            if not ok:
+                # Messages are still buffered: retry after a pause (also when nothing new arrives).
+                try:
+                    time.sleep(max(0.0, float(self.retry_interval_s or 0.0)))
+                except Exception:
+                    pass
+                self._wake.set()
+
+    def _send_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        POST one batch; returns the messages to retry (in order).
+
+        A batch rejected with a non-retryable 4xx is split into per-message POSTs, so one bad
+        message is dropped (and counted) instead of blocking everything queued behind it.
+        """
+        if self._batch_supported:
+            body = b"".join(json_codec.dumps(m) + b"\n" for m in batch)
+            st = self._post(
+                "/ingest/batch",
+                body,
+                content_type="application/x-ndjson; charset=utf-8",
+            )
+            if st is not None and 200 <= st < 300:
+                return []
+            if _retryable(st):
+                return batch
+            if st in (404, 405):
+                # Older server without /ingest/batch: fall back to per-message POSTs.
+                self._batch_supported = False
+        for i, m in enumerate(batch):
+            st = self._post_one(m)
+            if st is not None and 200 <= st < 300:
+                continue
+            if _retryable(st):
+                return batch[i:]
+            with self._buf_lock:
+                self._dropped += 1
+        return []
+
+    def _post_one(self, msg: Dict[str, Any]) -> Optional[int]:
+        data = json_codec.dumps(msg)
+        return self._post("/ingest", data, content_type="application/json; charset=utf-8")
+
+    def _post(self, path: str, data: bytes, *, content_type: str) -> Optional[int]:
+        url = self.server_url.rstrip("/") + path
         req = urllib.request.Request(url, data=data, method="POST")
-        req.add_header("Content-Type", "application/json; charset=utf-8")
+        req.add_header("Content-Type", content_type)
         try:
-            with urllib.request.urlopen(req, timeout=self.timeout_s) as resp:
-                return 200 <= resp.status < 300
-        except (urllib.error.URLError, urllib.error.HTTPError):
-            return False
+            with pooled_urlopen(req, timeout=self.timeout_s) as resp:
+                return int(resp.status)
+        except urllib.error.HTTPError as e:
+            return int(getattr(e, "code", 0) or 0)
+        except (urllib.error.URLError, TimeoutError, http.client.HTTPException):
+            return None
 
+    def stats(self) -> Dict[str, Any]:
+        with self._buf_lock:
+            buffered = len(self._buf)
+        return {
+            "transport": "http",
+            "batch": bool(int(self.batch_max or 0) > 0 and self._batch_supported),
+            "buffered": int(buffered),
+            "dropped": int(self._dropped),
+        }
@@ -0,0 +1,152 @@
+"""
+Sparse byte-offset line index for rollout JSONL files.
+
+Stores the byte offset of every `stride`-th line (default 256), so any line range can
+be read with one seek + a bounded forward read instead of re-reading the file tail.
+The index covers complete lines only (a partially written last line is left out) and
+is extended incrementally from `size` as the file grows; a different inode or a
+shrunk file triggers a rebuild.
+
+Persistence lives in the session catalog DB (see SessionCatalog.load/save_line_index).
+"""
+
+import os
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .rollout_tailer import _pread
+
+DEFAULT_STRIDE = 256
+_SCAN_CHUNK_BYTES = 1 << 20
+_READ_CHUNK_BYTES = 256 * 1024
+
+
+@dataclass
+class LineIndex:
+    path: str
+    dev: int
+    ino: int
+    stride: int = DEFAULT_STRIDE
+    # Bytes covered (end of the last complete line) and number of complete lines.
+    size: int = 0
+    lines: int = 0
+    # offsets[k] = byte offset where line k*stride (0-based) starts.
+    offsets: "array[int]" = field(default_factory=lambda: array("Q", [0]))
+
+    def offsets_blob(self) -> bytes:
+        return self.offsets.tobytes()
+
+    @staticmethod
+    def offsets_from_blob(blob: bytes) -> "array[int]":
+        a = array("Q")
+        a.frombytes(bytes(blob or b""))
+        if not a:
+            a.append(0)
+        return a
+
+
+def _open_ro(path: Path) -> int:
+    return os.open(str(path), os.O_RDONLY | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0))
+
+
+def update_line_index(path: Path, idx: Optional[LineIndex], *, stride: int = DEFAULT_STRIDE) -> Tuple[LineIndex, bool]:
+    """
+    Build or extend the index for `path`. Returns (index, changed).
+
+    Raises OSError when the file cannot be read.
+    """
+    st = os.stat(path)
+    size = int(st.st_size)
+    dev, ino = int(st.st_dev), int(st.st_ino)
+    if (
+        idx is None
+        or idx.dev != dev
+        or idx.ino != ino
+        or int(idx.stride) != int(stride)
+        or size < int(idx.size)
+    ):
+        idx = LineIndex(path=str(path), dev=dev, ino=ino, stride=max(1, int(stride)))
+        fresh = True
+    else:
+        fresh = False
+    if size == idx.size:
+        return idx, fresh
+
+    stride_n = int(idx.stride)
+    offsets = idx.offsets
+    lines = int(idx.lines)
+    pos = int(idx.size)
+    covered = pos
+    # Newlines still to skip before the next indexed line start.
+    to_next = stride_n - (lines % stride_n)
+    fd = _open_ro(path)
+    try:
+        while pos < size:
+            chunk = _pread(fd, min(_SCAN_CHUNK_BYTES, size - pos), pos)
+            if not chunk:
+                break
+            n = chunk.count(b"\n")
+            if n:
+                if n < to_next:
+                    to_next -= n
+                else:
+                    # Walk newlines only inside a chunk that crosses stride boundaries.
+                    i = -1
+                    left = n
+                    while left >= to_next:
+                        for _ in range(to_next):
+                            i = chunk.find(b"\n", i + 1)
+                        offsets.append(pos + i + 1)
+                        left -= to_next
+                        to_next = stride_n
+                    to_next -= left
+                lines += n
+                covered = pos + chunk.rfind(b"\n") + 1
+            pos += len(chunk)
+    finally:
+        os.close(fd)
+
+    changed = fresh or lines != idx.lines
+    idx.lines = lines
+    idx.size = covered
+    return idx, changed
+
+
+def read_indexed_lines(path: Path, idx: LineIndex, start: int, count: int) -> List[bytes]:
+    """
+    Read complete lines [start, start+count) (0-based) using the index; clamps to idx.lines.
+    """
+    s = max(0, int(start))
+    e = min(int(idx.lines), s + max(0, int(count)))
+    if e <= s:
+        return []
+    k = s // int(idx.stride)
+    off = int(idx.offsets[k])
+    skip = s - k * int(idx.stride)
+    want = e - s
+    out: List[bytes] = []
+    pending = b""
+    fd = _open_ro(path)
+    try:
+        pos = off
+        end = int(idx.size)
+        while pos < end and len(out) < want:
+            chunk = _pread(fd, min(_READ_CHUNK_BYTES, end - pos), pos)
+            if not chunk:
+                break
+            pos += len(chunk)
+            buf = pending + chunk if pending else chunk
+            parts = buf.split(b"\n")
+            pending = parts.pop()
+            if skip:
+                if skip >= len(parts):
+                    skip -= len(parts)
+                    continue
+                parts = parts[skip:]
+                skip = 0
+            out.extend(parts[: want - len(out)])
+    finally:
+        os.close(fd)
+    return out
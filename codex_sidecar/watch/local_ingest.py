@@ -0,0 +1,159 @@
+import queue
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class LocalIngestClient:
+    """
+    进程内 ingest sink：watcher 与 SidecarState 同进程时，直接入库，跳过 loopback HTTP。
+
+    说明：
+    - 与 HttpIngestClient 同形（ingest(msg) -> bool），可直接替换注入 RolloutWatcher。
+    - 生产者只负责入队；单个后台线程按 FIFO 批量取出并调用 state.add_many（op=update 同批按序应用），
+      因此同一条消息的 add/update 顺序与 HTTP 路径一致。
+    - 队列有界：满时阻塞生产者最多 put_timeout_s（背压），超时返回 False（等价于 HTTP 失败）。
+    - HTTP /ingest 仍保留给外部生产者（--no-server / --server-url 模式）。
+    """
+
+    def __init__(
+        self,
+        state: Any,
+        *,
+        max_queue: int = 4096,
+        put_timeout_s: float = 2.0,
+        drain_max: int = 256,
+    ) -> None:
+        self._state = state
+        try:
+            n = int(max_queue)
+        except Exception:
+            n = 4096
+        self._q: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max(16, n))
+        try:
+            self._put_timeout_s = max(0.0, float(put_timeout_s))
+        except Exception:
+            self._put_timeout_s = 2.0
+        try:
+            self._drain_max = max(1, int(drain_max))
+        except Exception:
+            self._drain_max = 256
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        # Observability (best-effort).
+        self._accepted = 0
+        self._applied = 0
+        self._dropped = 0
+        self._errors = 0
+
+    def _ensure_worker(self) -> None:
+        t = self._thread
+        if t is not None and t.is_alive():
+            return
+        with self._lock:
+            if self._closed:
+                return
+            if self._thread is not None and self._thread.is_alive():
+                return
+            t = threading.Thread(target=self._worker, name="sidecar-ingest", daemon=True)
+            t.start()
+            self._thread = t
+
+    def ingest(self, msg: Dict[str, Any]) -> bool:
+        if not isinstance(msg, dict) or self._closed:
+            return False
+        self._ensure_worker()
+        try:
+            self._q.put(msg, timeout=self._put_timeout_s)
+        except queue.Full:
+            self._dropped += 1
+            return False
+        self._accepted += 1
+        return True
+
+    def _worker(self) -> None:
+        while True:
+            first = self._q.get()
+            batch = [first]
+            # Drain whatever is already queued so a replay burst is applied under a
+            # single SidecarState lock acquisition (see SidecarState.add_many).
+            while len(batch) < self._drain_max:
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            msgs = []
+            for m in batch:
+                if m is None:
+                    stop = True
+                    break
+                msgs.append(m)
+            try:
+                self._apply(msgs)
+            finally:
+                for _ in batch:
+                    self._q.task_done()
+            if stop:
+                return
+
+    def _apply(self, msgs: List[Dict[str, Any]]) -> None:
+        if not msgs:
+            return
+        add_many = getattr(self._state, "add_many", None)
+        if callable(add_many) and len(msgs) > 1:
+            try:
+                add_many(msgs)
+                self._applied += len(msgs)
+            except Exception:
+                self._errors += len(msgs)
+            return
+        for m in msgs:
+            try:
+                self._state.add(m)
+                self._applied += 1
+            except Exception:
+                self._errors += 1
+
+    def flush(self, timeout_s: float = 2.0) -> bool:
+        """
+        Wait until every queued message has been applied (best-effort, bounded).
+        """
+        done = threading.Event()
+
+        def _join() -> None:
+            try:
+                self._q.join()
+            finally:
+                done.set()
+
+        threading.Thread(target=_join, name="sidecar-ingest-flush", daemon=True).start()
+        return done.wait(timeout=max(0.0, float(timeout_s or 0.0)))
+
+    def close(self, timeout_s: float = 1.0) -> None:
+        """
+        Drain pending messages and stop the worker thread.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            t = self._thread
+        if t is None or not t.is_alive():
+            return
+        try:
+            self._q.put(None, timeout=max(0.0, float(timeout_s or 0.0)))
+        except queue.Full:
+            return
+        t.join(timeout=max(0.0, float(timeout_s or 0.0)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "transport": "local",
+            "queued": int(self._q.qsize()),
+            "accepted": int(self._accepted),
+            "applied": int(self._applied),
+            "dropped": int(self._dropped),
+            "errors": int(self._errors),
+        }
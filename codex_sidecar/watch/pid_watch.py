@@ -0,0 +1,128 @@
+"""
+Process-exit notifications via pidfd (Linux >= 5.3, Python >= 3.9).
+
+A pidfd becomes readable when its process exits, so tracked Codex pids can sit in the
+watcher's poll() set next to inotify: the follow plan is re-evaluated the moment a
+Codex run ends instead of on the next file scan. Without os.pidfd_open (other
+platforms / old kernels) every method is a no-op and the scan cadence applies.
+"""
+
+import os
+from typing import Dict, Iterable, List
+
+from .fs_events import wait_readable
+
+
+def pidfd_supported() -> bool:
+    return hasattr(os, "pidfd_open")
+
+
+class PidWatch:
+    def __init__(self) -> None:
+        self._fd_by_pid: Dict[int, int] = {}
+        self._pid_by_fd: Dict[int, int] = {}
+        self._wake_r = -1
+        self._wake_w = -1
+        self._closed = False
+        if pidfd_supported():
+            try:
+                self._wake_r, self._wake_w = os.pipe()
+                os.set_blocking(self._wake_r, False)
+                os.set_blocking(self._wake_w, False)
+            except OSError:
+                self._wake_r = self._wake_w = -1
+
+    def active(self) -> bool:
+        """
+        True while at least one pid is tracked (the loop then selects on pidfds).
+        """
+        return bool(self._fd_by_pid) and self._wake_r >= 0
+
+    def pids(self) -> List[int]:
+        return sorted(self._fd_by_pid)
+
+    def fds(self) -> List[int]:
+        return list(self._pid_by_fd)
+
+    def sync(self, pids: Iterable[int]) -> None:
+        """
+        Track exactly `pids` (open pidfds for new ones, close the rest).
+        """
+        if self._closed or not pidfd_supported():
+            return
+        want = set()
+        for p in pids or []:
+            try:
+                want.add(int(p))
+            except Exception:
+                continue
+        for pid in [p for p in self._fd_by_pid if p not in want]:
+            self._close_pid(pid)
+        for pid in want:
+            if pid in self._fd_by_pid or pid <= 0:
+                continue
+            try:
+                fd = os.pidfd_open(pid)  # type: ignore[attr-defined]  # O_CLOEXEC by default
+            except OSError:
+                # Already gone (or not permitted): the next scan sees the new state anyway.
+                continue
+            self._fd_by_pid[pid] = fd
+            self._pid_by_fd[fd] = pid
+
+    def exited(self, ready_fds: Iterable[int]) -> List[int]:
+        """
+        Pids whose pidfd is in `ready_fds` (stops tracking them).
+        """
+        out: List[int] = []
+        for fd in ready_fds or []:
+            pid = self._pid_by_fd.get(fd)
+            if pid is not None:
+                out.append(pid)
+                self._close_pid(pid)
+        return sorted(out)
+
+    def wait(self, timeout_s: float) -> List[int]:
+        """
+        Block until a tracked process exits, `wake()` is called, or timeout; returns exited pids.
+        """
+        if self._closed or self._wake_r < 0:
+            return []
+        r = wait_readable(self.fds() + [self._wake_r], timeout_s)
+        if self._wake_r in r:
+            try:
+                while os.read(self._wake_r, 4096):
+                    pass
+            except (BlockingIOError, OSError):
+                pass
+        return self.exited(fd for fd in r if fd != self._wake_r)
+
+    def wake(self) -> None:
+        if self._closed or self._wake_w < 0:
+            return
+        try:
+            os.write(self._wake_w, b"x")
+        except (BlockingIOError, OSError):
+            pass
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for pid in list(self._fd_by_pid):
+            self._close_pid(pid)
+        for fd in (self._wake_r, self._wake_w):
+            if fd >= 0:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+    def _close_pid(self, pid: int) -> None:
+        fd = self._fd_by_pid.pop(pid, None)
+        if fd is None:
+            return
+        self._pid_by_fd.pop(fd, None)
+        try:
+            os.close(fd)
+        except OSError:
+            pass
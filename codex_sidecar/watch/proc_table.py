@@ -0,0 +1,327 @@
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Pattern, Sequence, Set, Tuple
+
+from .process_follow_scan import pid_matches_regex
+from .procfs import (
+    _PROC_ROOT,
+    _proc_list_pids,
+    _proc_read_argv0_basename,
+    _proc_read_exe_basename,
+    _proc_read_fd_flags,
+)
+
+# A freshly forked child still shows its parent's exe/cmdline until it execs; entries first
+# seen younger than this are examined again on the next refresh.
+_YOUNG_PROC_S = 2.0
+# fd numbers seen before are trusted (not re-readlinked) between full revalidations.
+_FD_FULL_SCAN_EVERY = 10
+
+
+def _clk_tck() -> int:
+    try:
+        return max(1, int(os.sysconf("SC_CLK_TCK")))
+    except Exception:
+        return 100
+
+
+def _proc_read_stat(pid: int) -> Optional[Tuple[int, int]]:
+    """
+    (ppid, starttime in clock ticks since boot) from /proc/<pid>/stat, or None.
+    """
+    try:
+        raw = (_PROC_ROOT / str(pid) / "stat").read_bytes()
+    except Exception:
+        return None
+    # comm may contain spaces / parentheses: fields start after the last ')'.
+    i = raw.rfind(b")")
+    if i < 0:
+        return None
+    parts = raw[i + 1 :].split()
+    try:
+        return int(parts[1]), int(parts[19])
+    except Exception:
+        return None
+
+
+def _proc_list_fds(pid: int) -> Optional[List[str]]:
+    try:
+        return os.listdir(str(_PROC_ROOT / str(pid) / "fd"))
+    except Exception:
+        return None
+
+
+def _proc_read_fd_link(pid: int, fd: str) -> str:
+    try:
+        target = os.readlink(str(_PROC_ROOT / str(pid) / "fd" / fd))
+    except Exception:
+        return ""
+    if target.endswith(" (deleted)"):
+        target = target[: -len(" (deleted)")]
+    return target
+
+
+def _proc_uptime_s() -> Optional[float]:
+    try:
+        return float((_PROC_ROOT / "uptime").read_bytes().split()[0])
+    except Exception:
+        return None
+
+
+@dataclass
+class _Proc:
+    ppid: int
+    start: int
+    matched: bool = False
+    # Re-examine on the next refresh (young process that may still exec).
+    recheck: bool = False
+
+
+class ProcTable:
+    """
+    增量 /proc 进程表：按 (pid, starttime) 缓存 ppid 与目标进程匹配结果。
+
+    - 每次 refresh 仍需 listdir(/proc)，但只有新出现的 pid 会读取 stat/exe/cmdline
+    - 已退出的 pid 被剔除；PPID→children 映射随增删增量维护
+    - 已匹配的 pid 每次复核 starttime（防 pid 复用）；刚 fork 的进程下一轮再看一次（可能随后 exec）
+    - 扫描开销随进程变动（churn）增长，而非随进程总数增长
+    """
+
+    def __init__(
+        self,
+        *,
+        list_pids: Callable[[], List[int]] = _proc_list_pids,
+        read_stat: Callable[[int], Optional[Tuple[int, int]]] = _proc_read_stat,
+        read_exe_basename: Callable[[int], str] = _proc_read_exe_basename,
+        read_argv0_basename: Callable[[int], str] = _proc_read_argv0_basename,
+        read_uptime_s: Callable[[], Optional[float]] = _proc_uptime_s,
+    ) -> None:
+        self._list_pids = list_pids
+        self._read_stat = read_stat
+        self._read_exe_basename = read_exe_basename
+        self._read_argv0_basename = read_argv0_basename
+        self._read_uptime_s = read_uptime_s
+        self._tck = _clk_tck()
+        self._procs: Dict[int, _Proc] = {}
+        self._children: Dict[int, Set[int]] = {}
+        self._matched: Set[int] = set()
+        self._re_pat: Optional[Pattern[str]] = None
+        self._stats: Dict[str, float] = {"pids": 0, "new": 0, "gone": 0, "rechecked": 0, "scan_ms": 0.0}
+
+    def refresh(self, re_pat: Optional[Pattern[str]]) -> None:
+        t0 = time.perf_counter()
+        if re_pat is not self._re_pat:
+            # Pattern changed: matches of every cached entry are stale.
+            self._re_pat = re_pat
+            self._matched.clear()
+            for pid, p in self._procs.items():
+                p.matched = self._match(pid)
+                if p.matched:
+                    self._matched.add(pid)
+        try:
+            live = set(self._list_pids())
+        except Exception:
+            live = set()
+        gone = [pid for pid in self._procs if pid not in live]
+        for pid in gone:
+            self._drop(pid)
+        uptime = self._read_uptime_s()
+        n_new = 0
+        n_re = 0
+        for pid in live:
+            cur = self._procs.get(pid)
+            if cur is None:
+                n_new += 1
+                self._add(pid, uptime)
+                continue
+            if cur.matched or cur.recheck:
+                # Cheap revalidation for the few pids that matter (pid reuse / late exec).
+                n_re += 1
+                st = self._read_stat(pid)
+                if st is None or st[1] != cur.start:
+                    self._drop(pid)
+                    if st is not None:
+                        self._add(pid, uptime, st)
+                    continue
+                if cur.recheck:
+                    cur.recheck = self._is_young(cur.start, uptime)
+                    m = self._match(pid)
+                    if m != cur.matched:
+                        cur.matched = m
+                        (self._matched.add if m else self._matched.discard)(pid)
+        self._stats = {
+            "pids": len(self._procs),
+            "new": n_new,
+            "gone": len(gone),
+            "rechecked": n_re,
+            "scan_ms": round((time.perf_counter() - t0) * 1000.0, 3),
+        }
+
+    def matching(self, *, exclude_pid: Optional[int] = None, limit: int = 64) -> List[int]:
+        out = sorted(pid for pid in self._matched if pid != exclude_pid)
+        return out[: max(1, int(limit or 1))]
+
+    def ppid(self, pid: int) -> Optional[int]:
+        p = self._procs.get(int(pid))
+        return p.ppid if p is not None else None
+
+    def pids(self) -> List[int]:
+        return list(self._procs)
+
+    def tree(self, roots: Sequence[int]) -> List[int]:
+        """
+        roots plus all descendants (from the incrementally maintained PPID→children map).
+        """
+        want: Set[int] = set()
+        stack: List[int] = []
+        for r in roots:
+            try:
+                pid = int(r)
+            except Exception:
+                continue
+            if pid not in want:
+                want.add(pid)
+                stack.append(pid)
+        while stack:
+            for child in self._children.get(stack.pop(), ()):
+                if child not in want:
+                    want.add(child)
+                    stack.append(child)
+        return sorted(want)
+
+    def stats(self) -> Dict[str, float]:
+        return dict(self._stats)
+
+    def _is_young(self, start: int, uptime: Optional[float]) -> bool:
+        if uptime is None:
+            return False
+        return (float(uptime) - float(start) / float(self._tck)) < _YOUNG_PROC_S
+
+    def _match(self, pid: int) -> bool:
+        re_pat = self._re_pat
+        if re_pat is None:
+            return False
+        return pid_matches_regex(
+            pid,
+            re_pat,
+            read_exe_basename=self._read_exe_basename,
+            read_argv0_basename=self._read_argv0_basename,
+        )
+
+    def _add(self, pid: int, uptime: Optional[float], st: Optional[Tuple[int, int]] = None) -> None:
+        if st is None:
+            st = self._read_stat(pid)
+        if st is None:
+            # Exited between listdir and stat (or unreadable): look again next refresh.
+            return
+        ppid, start = st
+        p = _Proc(ppid=int(ppid), start=int(start), recheck=self._is_young(start, uptime))
+        p.matched = self._match(pid)
+        self._procs[pid] = p
+        if p.ppid:
+            self._children.setdefault(p.ppid, set()).add(pid)
+        if p.matched:
+            self._matched.add(pid)
+
+    def _drop(self, pid: int) -> None:
+        p = self._procs.pop(pid, None)
+        self._matched.discard(pid)
+        # Orphans are reparented by the kernel; never hand them to a process reusing this pid.
+        self._children.pop(pid, None)
+        if p is None:
+            return
+        kids = self._children.get(p.ppid)
+        if kids is not None:
+            kids.discard(pid)
+            if not kids:
+                self._children.pop(p.ppid, None)
+
+
+class FdTable:
+    """
+    按 pid 缓存 /proc/<pid>/fd 的 fd→target 映射（增量）。
+
+    - 只对新出现的 fd 号 readlink；已缓存的 rollout fd 每次复核（关闭/替换即可发现）
+    - 其余已缓存 fd 每 _FD_FULL_SCAN_EVERY 次扫描全量复核一次（兜底 fd 号被复用的情况）；
+      预期会有新 rollout 打开时（新建 rollout 文件 / 等待 rollout），调用方用 request_full_scan()
+      让下一次扫描立即全量复核（Codex 常把新 rollout 开在刚释放的最小 fd 号上）
+    - fdinfo（打开 flags）只对 want(target) 为真的 fd 读取，不再对每个 fd 读取
+    """
+
+    def __init__(
+        self,
+        *,
+        list_fds: Callable[[int], Optional[List[str]]] = _proc_list_fds,
+        read_link: Callable[[int, str], str] = _proc_read_fd_link,
+        read_flags: Callable[[int, str], int] = _proc_read_fd_flags,
+    ) -> None:
+        self._list_fds = list_fds
+        self._read_link = read_link
+        self._read_flags = read_flags
+        self._by_pid: Dict[int, Dict[str, str]] = {}
+        self._scans = 0
+        self._force_full = False
+        self._stats: Dict[str, float] = {"pids": 0, "fds": 0, "readlinks": 0, "fdinfo_reads": 0, "full": 0, "scan_ms": 0.0}
+
+    def scan(self, pids: Sequence[int], want: Callable[[str], bool]) -> Dict[int, List[Tuple[str, int]]]:
+        """
+        {pid: [(target, flags), ...]} for descriptors whose target satisfies `want`.
+        """
+        t0 = time.perf_counter()
+        self._scans += 1
+        full = self._force_full or self._scans % _FD_FULL_SCAN_EVERY == 0
+        self._force_full = False
+        keep: Set[int] = set()
+        out: Dict[int, List[Tuple[str, int]]] = {}
+        n_fds = 0
+        n_links = 0
+        n_info = 0
+        for pid0 in pids:
+            try:
+                pid = int(pid0)
+            except Exception:
+                continue
+            keep.add(pid)
+            fds = self._list_fds(pid)
+            if fds is None:
+                self._by_pid.pop(pid, None)
+                continue
+            n_fds += len(fds)
+            old = self._by_pid.get(pid) or {}
+            cur: Dict[str, str] = {}
+            hits: List[Tuple[str, int]] = []
+            for fd in fds:
+                target = old.get(fd)
+                if target is None or full or want(target):
+                    n_links += 1
+                    target = self._read_link(pid, fd)
+                    if not target:
+                        continue
+                cur[fd] = target
+                if want(target):
+                    n_info += 1
+                    hits.append((target, self._read_flags(pid, fd)))
+            self._by_pid[pid] = cur
+            if hits:
+                out[pid] = hits
+        for pid in [p for p in self._by_pid if p not in keep]:
+            self._by_pid.pop(pid, None)
+        self._stats = {
+            "pids": len(keep),
+            "fds": n_fds,
+            "readlinks": n_links,
+            "fdinfo_reads": n_info,
+            "full": 1 if full else 0,
+            "scan_ms": round((time.perf_counter() - t0) * 1000.0, 3),
+        }
+        return out
+
+    def request_full_scan(self) -> None:
+        """
+        Re-readlink every fd on the next scan (a cached fd number may now point at a new rollout).
+        """
+        self._force_full = True
+
+    def stats(self) -> Dict[str, float]:
+        return dict(self._stats)
@@ -1,7 +1,6 @@
 import os
-from collections import deque
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Optional, Pattern, Sequence, Set, Tuple
+from typing import Callable, Dict, Iterable, List, Pattern, Sequence, Set, Tuple
 
 from .rollout_paths import _ROLLOUT_RE
 
@@ -35,102 +34,6 @@ def pid_matches_regex(
     return False
 
 
-def detect_processes(
-    *,
-    re_pat: Optional[Pattern[str]],
-    list_pids: Callable[[], List[int]],
-    read_exe_basename: Callable[[int], str],
-    read_argv0_basename: Callable[[int], str],
-    exclude_pid: Optional[int] = None,
-    limit: int = 64,
-) -> List[int]:
-    """
-    全量扫描 /proc 找到候选 PID（强匹配）。
-
-    注意：
-    - 调用方负责控制扫描频率（scan cadence），该函数只负责“当次扫描”的计算。
-    """
-    if re_pat is None:
-        return []
-    try:
-        pids = list_pids()
-    except Exception:
-        return []
-    out: List[int] = []
-    lim = max(1, int(limit or 1))
-    for pid0 in pids:
-        try:
-            pid = int(pid0)
-        except Exception:
-            continue
-        if exclude_pid is not None:
-            try:
-                if int(exclude_pid) == pid:
-                    continue
-            except Exception:
-                pass
-        try:
-            if pid_matches_regex(
-                pid,
-                re_pat,
-                read_exe_basename=read_exe_basename,
-                read_argv0_basename=read_argv0_basename,
-            ):
-                out.append(pid)
-                if len(out) >= lim:
-                    break
-        except Exception:
-            continue
-    return out
-
-
-def collect_process_tree(
-    roots: Sequence[int],
-    *,
-    list_pids: Callable[[], List[int]],
-    read_ppid: Callable[[int], Optional[int]],
-) -> List[int]:
-    """
-    从 roots 出发收集完整进程树（包含子进程）。
-
-    说明：
-    - 通过一次性构建 PPID→children 映射来避免 N^2
-    - /proc 读取失败时，至少返回 roots 本身
-    """
-    want: Set[int] = set()
-    q = deque()
-    for r in roots:
-        try:
-            pid = int(r)
-        except Exception:
-            continue
-        want.add(pid)
-        q.append(pid)
-
-    try:
-        pids = list_pids()
-    except Exception:
-        return sorted(want)
-    children: Dict[int, List[int]] = {}
-    for pid0 in pids:
-        try:
-            pid = int(pid0)
-            ppid = read_ppid(pid)
-            if ppid:
-                children.setdefault(int(ppid), []).append(pid)
-        except Exception:
-            continue
-
-    while q:
-        pid = q.popleft()
-        for child in children.get(pid, []):
-            if child in want:
-                continue
-            want.add(child)
-            q.append(child)
-    return sorted(want)
-
-
 def find_rollout_opened_by_pids(
     pids: Sequence[int],
     *,
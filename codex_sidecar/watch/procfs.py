@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Iterable, List, Optional, Set, Tuple
+from typing import Iterable, List, Set
 
 _PROC_ROOT = Path("/proc")
 
@@ -80,20 +80,6 @@ def _proc_read_argv0_basename(pid: int) -> str:
     except Exception:
         return ""
 
-def _proc_read_ppid(pid: int) -> Optional[int]:
-    try:
-        txt = (_PROC_ROOT / str(pid) / "status").read_text(encoding="utf-8", errors="replace")
-    except Exception:
-        return None
-    for line in txt.splitlines():
-        if line.startswith("PPid:"):
-            v = (line.split(":", 1)[1] or "").strip()
-            try:
-                return int(v)
-            except Exception:
-                return None
-    return None
-
 def _proc_iter_fd_targets(pid: int) -> Iterable[str]:
     fd_dir = _PROC_ROOT / str(pid) / "fd"
     try:
@@ -133,27 +119,3 @@ def _proc_read_fd_flags(pid: int, fd: str) -> int:
             except Exception:
                 return -1
     return -1
-
-def _proc_iter_fd_targets_with_flags(pid: int) -> Iterable[Tuple[str, int]]:
-    """
-    Iterate (target_path, flags) for /proc/<pid>/fd entries.
-
-    flags = -1 when fdinfo is unavailable.
-    """
-    fd_dir = _PROC_ROOT / str(pid) / "fd"
-    try:
-        entries = os.listdir(str(fd_dir))
-    except Exception:
-        return []
-    out: List[Tuple[str, int]] = []
-    for ent in entries:
-        p = fd_dir / ent
-        try:
-            target = os.readlink(str(p))
-        except Exception:
-            continue
-        if target.endswith(" (deleted)"):
-            target = target[: -len(" (deleted)")]
-        flags = _proc_read_fd_flags(pid, ent)
-        out.append((target, flags))
-    return out
@@ -1,6 +1,57 @@
 import json
+import re
 from typing import Any, Dict, List, Tuple
 
+# 行首布局（Codex 以固定字段顺序写出 rollout）：
+#   {"timestamp":"...","type":"<top>","payload":{"type":"<ptype>"[,"role":"<role>"]...
+# 仅在能确定 top/ptype/role 时才跳过；其它布局（字段顺序不同、转义字符等）一律回退完整解析。
+# 前提：行内没有重复的顶层 "type" 键（json.loads 会取最后一个）。
+_LINE_HEAD_RE = re.compile(
+    rb'\s*\{\s*(?:"timestamp"\s*:\s*"[^"\\]*"\s*,\s*)?'
+    rb'"type"\s*:\s*"([a-z_]+)"'
+    rb'(?:\s*,\s*"payload"\s*:\s*\{\s*"type"\s*:\s*"([a-z_]+)"'
+    rb'(?:\s*,\s*"role"\s*:\s*"([a-z_]+)")?)?'
+)
+_LINE_HEAD_PEEK_BYTES = 512
+# 与 extract_rollout_items 的分支保持一致。
+_RESPONSE_ITEM_TYPES = frozenset(
+    (
+        b"message",
+        b"reasoning",
+        b"function_call",
+        b"custom_tool_call",
+        b"web_search_call",
+        b"function_call_output",
+        b"custom_tool_call_output",
+    )
+)
+_EVENT_MSG_TYPES = frozenset((b"user_message",))
+
+
+def rollout_line_may_have_items(bline: bytes) -> bool:
+    """
+    字节级预筛：根据行首的 "type" / payload.type（以及 message 的 role）判断该行是否可能产出 UI 消息。
+
+    返回 False 时 extract_rollout_items(json.loads(bline)) 必然为空，可直接跳过
+    （turn_context/session_meta/token_count/用户指令注入等大行无需 decode + json.loads）。
+    无法确定时返回 True（保守）。
+    """
+    m = _LINE_HEAD_RE.match(bline, 0, _LINE_HEAD_PEEK_BYTES)
+    if m is None:
+        return True
+    top, ptype, role = m.group(1), m.group(2), m.group(3)
+    if top not in (b"response_item", b"event_msg"):
+        return False
+    if ptype is None:
+        return True
+    if top == b"response_item":
+        if ptype not in _RESPONSE_ITEM_TYPES:
+            return False
+        if ptype == b"message" and role is not None and role != b"assistant":
+            return False
+        return True
+    return ptype in _EVENT_MSG_TYPES
+
 
 def extract_rollout_items(obj: Dict[str, Any]) -> Tuple[str, List[Dict[str, str]]]:
     """
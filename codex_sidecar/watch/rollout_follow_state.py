@@ -18,6 +18,7 @@ def apply_follow_targets(
     parse_thread_id: Callable[[Path], str],
     prev_primary_offset: int,
     prev_primary_line_no: int,
+    read_tail_lines_at: Optional[Callable[..., List[Tuple[int, bytes]]]] = None,
 ) -> Tuple[Optional[Path], Optional[str], int, int]:
     """
     Apply selected follow targets to the cursor map in-place and derive primary status fields.
@@ -87,6 +88,7 @@ def apply_follow_targets(
                     cur,
                     last_lines=int(replay_last_lines),
                     read_tail_lines=read_tail_lines,
+                    read_tail_lines_at=read_tail_lines_at,
                     stop_requested=stop_requested,
                     on_line=on_line,
                 )
@@ -141,6 +143,7 @@ def apply_follow_sync_targets(
     parse_thread_id: Callable[[Path], str],
     prev_primary_offset: int,
     prev_primary_line_no: int,
+    read_tail_lines_at: Optional[Callable[..., List[Tuple[int, bytes]]]] = None,
 ) -> Optional[FollowApplyResult]:
     """
     Apply follow sync plan targets to runtime state.
@@ -187,6 +190,7 @@ def apply_follow_sync_targets(
         parse_thread_id=parse_thread_id,
         prev_primary_offset=prev_primary_offset,
         prev_primary_line_no=prev_primary_line_no,
+        read_tail_lines_at=read_tail_lines_at,
     )
     return FollowApplyResult(
         follow_files=next_files,
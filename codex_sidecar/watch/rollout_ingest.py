@@ -3,9 +3,10 @@ import json
 import re
 import time
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 
-from .rollout_extract import extract_rollout_items
+from .. import json_codec
+from .rollout_extract import extract_rollout_items, rollout_line_may_have_items
 from .session_meta import read_session_source_meta
 from .tui_gate_helpers import redact_secrets, ts_age_s
 
@@ -277,6 +278,34 @@ class _ApprovalGateTracker:
         except Exception:
             pass
 
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def next_deadline(self) -> Optional[float]:
+        """
+        Earliest time.monotonic() at which poll() would emit a "waiting" gate (None when nothing is due).
+        """
+        if not self._pending:
+            return None
+        now_mono = float(time.monotonic())
+        best: Optional[float] = None
+        for p in list(self._pending.values()):
+            if not isinstance(p, dict) or bool(p.get("wait_emitted")):
+                continue
+            delay_s = float(p.get("delay_s") or _APPROVAL_WAIT_NOTIFY_DELAY_S)
+            seen = float(p.get("seen_mono") or 0.0)
+            at = seen + delay_s if seen > 0.0 else now_mono
+            # Same rule as poll(): the rollout timestamp age may make the gate due earlier.
+            try:
+                age = ts_age_s(str(p.get("ts") or ""))
+            except Exception:
+                age = None
+            if isinstance(age, (int, float)) and age >= 0:
+                at = min(at, now_mono + delay_s - float(age))
+            if best is None or at < best:
+                best = at
+        return best
+
     def poll(self) -> None:
         if not self._pending:
             return
@@ -369,7 +398,7 @@ class RolloutLineIngestor:
         self,
         *,
         stop_requested: Callable[[], bool],
-        dedupe: Callable[[str, str], bool],
+        dedupe: Callable[[Hashable, str], bool],
         emit_ingest: Callable[[Dict[str, Any]], bool],
         translate_enqueue: Callable[..., bool],
     ) -> None:
@@ -394,6 +423,24 @@ class RolloutLineIngestor:
         self._session_meta_by_file[fp] = meta
         return meta
 
+    def has_pending_gates(self) -> bool:
+        """
+        True while a tool call is still waiting for its output (poll_tool_gates is time-based).
+        """
+        try:
+            return self._approval.has_pending()
+        except Exception:
+            return False
+
+    def next_gate_deadline(self) -> Optional[float]:
+        """
+        Monotonic deadline of the next approval-gate notification (watcher timer heap).
+        """
+        try:
+            return self._approval.next_deadline()
+        except Exception:
+            return None
+
     def poll_tool_gates(self) -> None:
         """
         Called from watcher loop even when rollout JSONL doesn't grow.
@@ -414,15 +461,27 @@ class RolloutLineIngestor:
         is_replay: bool,
         thread_id: str,
         translate_mode: str,
+        offset: int = -1,
+        file_ident: Optional[Tuple[int, int]] = None,
     ) -> int:
+        """
+        Dedupe key per extracted item:
+        - (dev, ino, byte offset, item index) when the tailer knows where the line starts
+          (no hashing of the item text; the sha1 below is only computed for new items)
+        - sha1(file:kind:ts:text) otherwise (legacy content key)
+        The message id stays sha1-derived, so ids are unchanged for the UI / state.
+        """
         if self._stop_requested():
             return 0
         if not bline:
             return 0
+        # 不可能产出 UI 消息的行（turn_context/token_count/指令注入等）不做 decode + json.loads。
+        if not rollout_line_may_have_items(bline):
+            return 0
 
         obj = None
         try:
-            obj = json.loads(bline.decode("utf-8", errors="replace"))
+            obj = json_codec.loads(bline)
         except Exception:
             obj = None
         if not isinstance(obj, dict):
@@ -432,13 +491,16 @@ class RolloutLineIngestor:
         meta = self._get_session_meta(file_path)
         ingested = 0
 
-        for item in extracted:
+        structural = int(offset) >= 0 and isinstance(file_ident, tuple) and len(file_ident) == 2
+        for idx, item in enumerate(extracted):
             if self._stop_requested():
                 return ingested
             kind = str(item.get("kind", "") or "")
             text = str(item.get("text", "") or "")
+            if structural and self._dedupe((file_ident[0], file_ident[1], int(offset), idx), kind=kind):
+                continue
             hid = sha1_hex(f"{file_path}:{kind}:{ts}:{text}")
-            if self._dedupe(hid, kind=kind):
+            if not structural and self._dedupe(hid, kind=kind):
                 continue
 
             # Track terminal-approval gates: rollout may stop growing while waiting,
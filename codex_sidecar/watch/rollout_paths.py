@@ -6,6 +6,23 @@ _ROLLOUT_RE = re.compile(
     r"^rollout-\d{4}-\d{2}-\d{2}T\d{2}-\d{2}-\d{2}-([0-9a-fA-F-]{36})\.jsonl$"
 )
 
+def _catalog(codex_home: Path):
+    """
+    Session catalog registered for this CODEX_HOME (see watch/session_catalog.py), refreshed
+    incrementally; None => glob fallback.
+    """
+    from .session_catalog import session_catalog_for
+
+    cat = session_catalog_for(codex_home)
+    if cat is None:
+        return None
+    try:
+        cat.refresh_if_stale()
+    except Exception:
+        return None
+    return cat
+
+
 def _latest_rollout_files(codex_home: Path, limit: int = 1) -> List[Path]:
     """
     List newest rollout files under CODEX_HOME/sessions by mtime (desc).
@@ -14,6 +31,12 @@ def _latest_rollout_files(codex_home: Path, limit: int = 1) -> List[Path]:
     - Windows/WSL may produce many files with identical mtimes; include name as a tiebreaker
       to keep ordering stable.
     """
+    cat = _catalog(codex_home)
+    if cat is not None:
+        try:
+            return [Path(r["path"]) for r in cat.latest(limit=int(limit or 0))]
+        except Exception:
+            pass
     sessions = codex_home / "sessions"
     if not sessions.exists():
         return []
@@ -46,6 +69,20 @@ def _find_rollout_file_for_thread(codex_home: Path, thread_id: str) -> Optional[
     tid = str(thread_id or "").strip()
     if not tid:
         return None
+    cat = _catalog(codex_home)
+    if cat is not None:
+        try:
+            row = cat.find_thread(tid)
+            if row is None:
+                # Created since the last refresh? One forced refresh before giving up.
+                cat.refresh()
+                row = cat.find_thread(tid)
+            if row is not None:
+                return Path(row["path"])
+        except Exception:
+            pass
+    # Still unknown to the catalog (or no catalog): glob, so a session the incremental
+    # refresh has not picked up yet is still found.
     sessions = codex_home / "sessions"
     if not sessions.exists():
         return None
@@ -60,4 +97,9 @@ def _find_rollout_file_for_thread(codex_home: Path, thread_id: str) -> Optional[
         hits.sort(key=lambda p: p.stat().st_mtime, reverse=True)
     except Exception:
         pass
+    if cat is not None:
+        try:
+            cat.note_paths(hits[:1])
+        except Exception:
+            pass
     return hits[0]
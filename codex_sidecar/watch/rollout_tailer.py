@@ -1,5 +1,11 @@
+import os
 from pathlib import Path
-from typing import Callable, List, Optional
+from typing import Callable, List, Optional, Tuple
+
+# Incremental reads are block-oriented: one pread per chunk, lines split in memory.
+_READ_CHUNK_BYTES = 1 << 20
+# Smallest read while a byte budget is in effect (a line longer than this is still read whole).
+_MIN_BUDGET_CHUNK_BYTES = 64 << 10
 
 
 def replay_tail(
@@ -9,6 +15,7 @@ def replay_tail(
     read_tail_lines: Callable[..., List[bytes]],
     stop_requested: Callable[[], bool],
     on_line: Callable[..., int],
+    read_tail_lines_at: Optional[Callable[..., List[Tuple[int, bytes]]]] = None,
 ) -> None:
     """
     从文件末尾回放最后 N 行。
@@ -16,15 +23,25 @@ def replay_tail(
     注意：
     - 这里的 cur.line_no 是“已处理行计数”，并非真实文件行号（沿用旧语义）。
     - cur.offset 的设置由调用方处理（通常已 seek 到文件末尾）。
+    - 传入 read_tail_lines_at（返回 (offset, line)）时，on_line 额外收到行首字节偏移 offset 与
+      file_ident=(dev, ino)；仅有 read_tail_lines 时 offset=-1（下游回退到内容摘要去重）。
     """
     replay_lines = max(0, int(last_lines))
     if replay_lines == 0:
         return
+    path = Path(cur.path)
+    ident: Optional[Tuple[int, int]] = None
     try:
-        tail = read_tail_lines(Path(cur.path), last_lines=replay_lines)
+        if read_tail_lines_at is not None:
+            # Byte offsets let replayed lines share structural dedupe keys with tailed ones.
+            st = os.stat(path)
+            ident = (int(st.st_dev), int(st.st_ino))
+            tail = list(read_tail_lines_at(path, last_lines=replay_lines))
+        else:
+            tail = [(-1, b) for b in read_tail_lines(path, last_lines=replay_lines)]
     except Exception:
         return
-    for bline in tail:
+    for off, bline in tail:
         if stop_requested():
             break
         try:
@@ -33,13 +50,62 @@ def replay_tail(
             pass
         on_line(
             bline,
-            file_path=Path(cur.path),
+            file_path=path,
             line_no=int(getattr(cur, "line_no", 0) or 0),
             is_replay=True,
             thread_id=str(getattr(cur, "thread_id", "") or ""),
+            offset=int(off),
+            file_ident=ident if off >= 0 else None,
         )
 
 
+def _pread(fd: int, n: int, offset: int) -> bytes:
+    try:
+        return os.pread(fd, n, offset)
+    except AttributeError:
+        # Platforms without pread (Windows): seek + read on the same descriptor.
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, n)
+
+
+def close_cursor_fd(cur) -> None:
+    """
+    Release the cached read descriptor of a cursor (inactive cursors / watcher shutdown).
+    """
+    fd = getattr(cur, "fd", -1)
+    try:
+        cur.fd = -1
+        cur.fd_ident = None
+    except Exception:
+        pass
+    if isinstance(fd, int) and fd >= 0:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+def _cursor_fd(cur, path: Path) -> Tuple[int, int]:
+    """
+    Return (fd, size) for the cursor's file, reusing the cached descriptor while the
+    path still points at the same inode (reopen after rotate/replace).
+    """
+    st = os.stat(path)
+    ident = (int(st.st_dev), int(st.st_ino))
+    fd = getattr(cur, "fd", -1)
+    if isinstance(fd, int) and fd >= 0 and getattr(cur, "fd_ident", None) == ident:
+        return fd, int(st.st_size)
+    close_cursor_fd(cur)
+    fd = os.open(str(path), os.O_RDONLY | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0))
+    try:
+        cur.fd = fd
+        cur.fd_ident = ident
+    except Exception:
+        # Cursor cannot cache: caller still gets a usable fd, closed on the next call.
+        pass
+    return fd, int(st.st_size)
+
+
 def poll_one(
     cur,
     *,
@@ -47,20 +113,29 @@ def poll_one(
     on_line: Callable[..., int],
     on_primary_progress: Optional[Callable[[int, int], None]] = None,
     on_error: Optional[Callable[[], None]] = None,
-) -> None:
+    max_bytes: int = 0,
+) -> bool:
     """
-    从 cur.offset 开始读取增量内容，逐行回调 on_line。
+    从 cur.offset 开始按块（pread，默认 1MiB）读取增量内容，整块切行后逐行回调 on_line。
 
-    - cur.offset / cur.line_no 会被就地更新
-    - 如提供 on_primary_progress，将在每行更新后回调（用于同步 watcher 的 primary 状态）
+    - 只处理完整行：末尾未写完的半行留在 cur.offset 之后，下次 poll 再读（不会交给 json.loads）
+    - cur.offset / cur.line_no 每个块更新一次（on_line 异常时也会提交已处理的进度）
+    - 如提供 on_primary_progress，每个块回调一次（用于同步 watcher 的 primary 状态）
+    - on_line 额外收到行首字节偏移 offset 与 file_ident=(dev, ino)（结构化去重 key）
+    - 文件描述符缓存在 cur.fd 上，跨 poll 复用；由 close_cursor_fd 释放
+    - max_bytes>0 时为本次调用的读取预算：读满预算即返回（至少处理一个完整行），
+      已读入的半行丢弃、下一轮从 cur.offset 重读，剩余内容留给下一轮（多会话轮转，避免单个大 backlog 独占 watcher 线程）
+
+    返回 True 表示因预算提前返回、文件仍有未读内容；否则 False。
     """
     path = Path(cur.path)
     try:
-        size = int(path.stat().st_size)
+        fd, size = _cursor_fd(cur, path)
     except Exception:
-        return
+        close_cursor_fd(cur)
+        return False
     if size <= 0:
-        return
+        return False
     try:
         if int(getattr(cur, "offset", 0) or 0) > size:
             cur.offset = 0
@@ -70,44 +145,88 @@ def poll_one(
         except Exception:
             pass
     try:
-        if int(getattr(cur, "offset", 0) or 0) == size:
-            return
+        offset = int(getattr(cur, "offset", 0) or 0)
+        line_no = int(getattr(cur, "line_no", 0) or 0)
     except Exception:
-        pass
+        offset = 0
+        line_no = 0
+    if offset == size:
+        return False
+    budget = max(0, int(max_bytes or 0))
+
+    file_path = path
+    thread_id = str(getattr(cur, "thread_id", "") or "")
+    ident = getattr(cur, "fd_ident", None)
+    # Chunks read past the last \n (a line spanning chunks); joined once its \n arrives.
+    pending: List[bytes] = []
+    consumed = offset
+    done_line_no = line_no
 
     try:
-        with path.open("rb") as f:
-            f.seek(int(getattr(cur, "offset", 0) or 0))
-            while True:
-                if stop_requested():
-                    break
-                bline = f.readline()
-                if not bline:
-                    break
-                try:
-                    cur.offset = int(f.tell())
-                except Exception:
-                    pass
+        pos = offset
+        while pos < size:
+            if stop_requested():
+                break
+            want = min(_READ_CHUNK_BYTES, size - pos)
+            if budget:
+                # Stop once over budget, unless no complete line has been consumed yet.
+                if pos - offset >= budget and (consumed > offset or not pending):
+                    return True
+                want = min(want, max(_MIN_BUDGET_CHUNK_BYTES, budget - (pos - offset)))
+            chunk = _pread(fd, want, pos)
+            if not chunk:
+                break
+            pos += len(chunk)
+            if chunk.find(b"\n") < 0:
+                pending.append(chunk)
+                continue
+            if pending:
+                pending.append(chunk)
+                buf = b"".join(pending)
+                pending = []
+            else:
+                buf = chunk
+            lines = buf.split(b"\n")
+            tail = lines.pop()
+            n = 0
+            line_off = consumed
+            try:
+                for bline in lines:
+                    n += 1
+                    on_line(
+                        bline,
+                        file_path=file_path,
+                        line_no=done_line_no + n,
+                        is_replay=False,
+                        thread_id=thread_id,
+                        offset=line_off,
+                        file_ident=ident,
+                    )
+                    line_off += len(bline) + 1
+            finally:
+                # Commit once per chunk (or up to the failing line when on_line raises).
+                if n == len(lines):
+                    consumed += len(buf) - len(tail)
+                else:
+                    consumed += sum(len(x) + 1 for x in lines[:n])
+                done_line_no += n
                 try:
-                    cur.line_no += 1
+                    cur.offset = int(consumed)
+                    cur.line_no = int(done_line_no)
                 except Exception:
                     pass
                 if on_primary_progress is not None:
                     try:
-                        on_primary_progress(int(getattr(cur, "offset", 0) or 0), int(getattr(cur, "line_no", 0) or 0))
+                        on_primary_progress(int(consumed), int(done_line_no))
                     except Exception:
                         pass
-                on_line(
-                    bline.rstrip(b"\n"),
-                    file_path=path,
-                    line_no=int(getattr(cur, "line_no", 0) or 0),
-                    is_replay=False,
-                    thread_id=str(getattr(cur, "thread_id", "") or ""),
-                )
+            if tail:
+                pending.append(tail)
     except Exception:
         if on_error is not None:
             try:
                 on_error()
             except Exception:
                 pass
-        return
+        return False
+    return False
@@ -3,11 +3,11 @@ import sys
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from ..translator import Translator
 
-from .ingest_client import HttpIngestClient
+from .ingest_client import HttpIngestClient, IngestSink
 from .rollout_paths import (
     _ROLLOUT_RE,
     _find_rollout_file_for_thread,
@@ -16,16 +16,39 @@ from .rollout_paths import (
 )
 from .translation_pump import TranslationPump
 from .follow_picker import FollowPicker
-from .tail_lines import read_tail_lines
+from .tail_lines import read_tail_lines, read_tail_lines_at
 from .tui_gate import TuiGateTailer
 from .dedupe_cache import DedupeCache
 from .rollout_ingest import RolloutLineIngestor, sha1_hex
-from .rollout_tailer import poll_one, replay_tail
+from .rollout_tailer import close_cursor_fd, poll_one, replay_tail
 from .rollout_follow_state import apply_follow_sync_targets, now_ts
 from .follow_control_helpers import clean_exclude_files, clean_exclude_keys, resolve_pinned_rollout_file
 from .rollout_follow_sync import FollowControls, build_follow_sync_plan
 from .rollout_watcher_loop import decide_follow_sync_force, should_poll_tui
 from .rollout_watcher_status import build_watcher_status
+from .fs_events import IN_CREATE, IN_MOVED_TO, IN_Q_OVERFLOW, InotifyEventSource, open_fs_event_source
+from .watch_scheduler import HOT_POLL_S, TimerHeap, next_poll_interval
+from .pid_watch import PidWatch
+from .session_catalog import session_catalog_for
+
+# Read budget per cursor per round-robin turn (see RolloutWatcher._poll_follow_files).
+_POLL_BUDGET_BYTES = 256 << 10
+# Idle followed files back off up to this interval when there are no fs events to wake the loop
+# (with inotify the cap is file_scan_interval: writes wake the loop immediately).
+_COLD_POLL_MAX_S = 2.0
+
+# After a new Codex candidate appears, re-run the (cached, cheap) process check this often
+# until its rollout shows up, for at most _NEW_PROC_WATCH_S.
+_NEW_PROC_RECHECK_S = 0.25
+_NEW_PROC_WATCH_S = 15.0
+
+# Recent session day dirs watched for appends (e.g. `codex resume` on an older session).
+_FS_WATCH_DAY_DIRS = 64
+
+_TASK_SCAN = "scan"
+_TASK_PROC = "proc"
+_TASK_GATES = "gates"
+_TASK_TUI = "tui"
 
 @dataclass
 class _FileCursor:
@@ -36,12 +59,15 @@ class _FileCursor:
     active: bool = False
     last_active_ts: float = 0.0
     inited: bool = False
+    # Cached read descriptor (see rollout_tailer.poll_one / close_cursor_fd).
+    fd: int = -1
+    fd_ident: Optional[Tuple[int, int]] = None
 
 class RolloutWatcher:
     def __init__(
         self,
         codex_home: Path,
-        ingest: HttpIngestClient,
+        ingest: IngestSink,
         translator: Translator,
         replay_last_lines: int,
         watch_max_sessions: int,
@@ -51,6 +77,7 @@ class RolloutWatcher:
         follow_codex_process: bool = False,
         codex_process_regex: str = "codex",
         only_follow_when_process: bool = True,
+        fs_events: bool = True,
     ) -> None:
         self._codex_home = codex_home
         self._ingest = ingest
@@ -71,6 +98,8 @@ class RolloutWatcher:
         # Follow targets (multi-session).
         self._cursors: Dict[Path, _FileCursor] = {}
         self._follow_files: List[Path] = []
+        # Rotates the first cursor polled each tick (round-robin fairness).
+        self._poll_rr: int = 0
         # User-controlled exclusions (UI “关闭监听”): exclude by thread_id and/or file path.
         # Stored as sets and applied when computing follow targets.
         self._exclude_keys: Set[str] = set()
@@ -80,7 +109,7 @@ class RolloutWatcher:
         self._offset: int = 0
         self._line_no: int = 0
         self._thread_id: Optional[str] = None
-        self._dedupe = DedupeCache(max_size=5000)
+        self._dedupe = DedupeCache()
         self._last_file_scan_ts = 0.0
         self._warned_missing = False
         self._last_error: str = ""
@@ -100,6 +129,18 @@ class RolloutWatcher:
         self._pinned_file: Optional[Path] = None
         self._follow_dirty: bool = False
 
+        # Event-driven tailing (Linux inotify). None => fixed-interval polling (fallback).
+        self._fs_events_enabled = bool(fs_events)
+        self._fs_events: Optional[InotifyEventSource] = None
+        # Timer-heap scheduling (see _run_loop): per-task deadlines, per-file adaptive cadence.
+        self._sched = TimerHeap()
+        self._poll_iv: Dict[Path, float] = {}
+        self._wake_event = threading.Event()
+        # pidfds of detected Codex processes: exit wakes the loop and re-evaluates the follow plan.
+        self._pid_watch = PidWatch()
+        self._new_proc_until: float = 0.0
+        self._new_proc_files: List[Path] = []
+
         # Codex TUI log tail: surface "waiting for tool gate" so UI can show
         # "needs confirmation" states even when no new rollout lines appear.
         self._tui = TuiGateTailer(self._codex_home / "log" / "codex-tui.log")
@@ -120,7 +161,17 @@ class RolloutWatcher:
             translate_enqueue=self._translate.enqueue,
         )
 
-    def _on_rollout_line(self, bline: bytes, *, file_path: Path, line_no: int, is_replay: bool, thread_id: str) -> int:
+    def _on_rollout_line(
+        self,
+        bline: bytes,
+        *,
+        file_path: Path,
+        line_no: int,
+        is_replay: bool,
+        thread_id: str,
+        offset: int = -1,
+        file_ident: Optional[Tuple[int, int]] = None,
+    ) -> int:
         try:
             return self._line_ingestor.handle_line(
                 bline,
@@ -129,6 +180,8 @@ class RolloutWatcher:
                 is_replay=bool(is_replay),
                 thread_id=str(thread_id or ""),
                 translate_mode=str(self._translate_mode or "auto"),
+                offset=int(offset),
+                file_ident=file_ident,
             )
         except Exception:
             return 0
@@ -192,6 +245,23 @@ class RolloutWatcher:
                 translate_stats = self._translate.stats()
         except Exception:
             pass
+        ingest_stats = None
+        try:
+            fn = getattr(self._ingest, "stats", None)
+            if callable(fn):
+                ingest_stats = fn()
+        except Exception:
+            pass
+        dedupe_stats = None
+        try:
+            dedupe_stats = self._dedupe.stats()
+        except Exception:
+            pass
+        proc_scan_stats = None
+        try:
+            proc_scan_stats = self._follow_picker.proc_stats()
+        except Exception:
+            pass
         return build_watcher_status(
             current_file=self._current_file,
             thread_id=str(self._thread_id or ""),
@@ -213,7 +283,11 @@ class RolloutWatcher:
             codex_process_regex=str(self._follow_picker.codex_process_regex or ""),
             process_file=self._process_file,
             process_files=list(self._process_files or []),
+            fs_events="inotify" if self._fs_events is not None else "poll",
             translate_stats=translate_stats if isinstance(translate_stats, dict) else None,
+            ingest_stats=ingest_stats if isinstance(ingest_stats, dict) else None,
+            dedupe_stats=dedupe_stats if isinstance(dedupe_stats, dict) else None,
+            proc_scan_stats=proc_scan_stats,
         )
 
     def set_translate_mode(self, mode: str) -> None:
@@ -248,6 +322,7 @@ class RolloutWatcher:
         try:
             with self._follow_lock:
                 self._follow_dirty = True
+            self._wake_loop()
         except Exception:
             pass
 
@@ -299,6 +374,7 @@ class RolloutWatcher:
         try:
             with self._follow_lock:
                 self._follow_dirty = True
+            self._wake_loop()
         except Exception:
             pass
 
@@ -332,6 +408,7 @@ class RolloutWatcher:
                 self._pinned_thread_id = ""
                 self._pinned_file = None
             self._follow_dirty = True
+        self._wake_loop()
 
     def set_follow_excludes(self, keys: Optional[List[str]] = None, files: Optional[List[str]] = None) -> None:
         """
@@ -353,6 +430,7 @@ class RolloutWatcher:
                 self._exclude_keys = cleaned_keys
                 self._exclude_files = cleaned_files
                 self._follow_dirty = True
+            self._wake_loop()
         except Exception:
             return
 
@@ -360,8 +438,26 @@ class RolloutWatcher:
         # Keep a reference so inner loops can react quickly (e.g. stop in the middle of large file reads).
         self._stop_event = stop_event
         self._translate.start(stop_event)
+        self._start_fs_events()
+
+        def _wake_on_stop() -> None:
+            stop_event.wait()
+            self._wake_loop()
+
+        threading.Thread(target=_wake_on_stop, name="sidecar-watch-stop", daemon=True).start()
+        try:
+            self._run_loop(stop_event)
+        finally:
+            self._stop_fs_events()
+            self._pid_watch.close()
+            for cur in list(self._cursors.values()):
+                close_cursor_fd(cur)
+
+    def _run_loop(self, stop_event) -> None:
         # Initial pick
         self._sync_follow_targets(force=True)
+        self._refresh_fs_watches()
+        self._track_codex_pids()
         if not self._follow_files and not self._warned_missing:
             if self._follow_mode in ("idle", "wait_codex", "wait_rollout"):
                 print("[sidecar] 等待 Codex 进程（尚未开始跟随会话文件）", file=sys.stderr)
@@ -371,7 +467,16 @@ class RolloutWatcher:
                     file=sys.stderr,
                 )
             self._warned_missing = True
+        sched = self._sched
+        mono = time.monotonic()
+        sched.schedule(_TASK_TUI, mono)
         while not stop_event.is_set():
+            at = sched.deadline(_TASK_PROC)
+            if at is not None and at <= time.monotonic():
+                # New Codex candidate without a rollout yet: rescan now (process table is cached).
+                sched.cancel(_TASK_PROC)
+                self._last_file_scan_ts = 0.0
+                self._follow_picker.request_fd_rescan()
             now = time.time()
             # Follow mode changed (e.g. UI pinned a thread): force a rescan/switch immediately.
             force_switch = False
@@ -391,33 +496,234 @@ class RolloutWatcher:
             if force is not None:
                 self._sync_follow_targets(force=bool(force))
                 self._last_file_scan_ts = now
-            self._poll_follow_files()
+                self._refresh_fs_watches()
+                self._track_codex_pids()
+            mono = time.monotonic()
+            # Scan cadence stays wall-clock based (decide_follow_sync_force); the heap only wakes us for it.
+            scan_left = float(self._last_file_scan_ts or 0.0) + self._file_scan_interval_s - time.time()
+            sched.schedule(_TASK_SCAN, mono + min(self._file_scan_interval_s, max(0.0, scan_left)))
+            for path in self._follow_files:
+                if ("cursor", path) not in sched:
+                    # New follow target: poll right away at the hot cadence.
+                    sched.schedule(("cursor", path), mono)
+            due = set(sched.pop_due(mono))
+            paths = [p for p in self._follow_files if ("cursor", p) in due]
+            if paths:
+                self._poll_due_files(paths)
             try:
-                # Approval gates may stall the rollout JSONL (no new lines) while waiting for terminal confirmation.
-                # Poll a lightweight timeout-based tracker so UI can still alert the user.
-                self._line_ingestor.poll_tool_gates()
+                if _TASK_GATES in due:
+                    # Approval gates may stall the rollout JSONL (no new lines) while waiting for terminal confirmation.
+                    # The tracker's exact deadline is on the heap so UI can still alert the user on time.
+                    self._line_ingestor.poll_tool_gates()
+                at = self._line_ingestor.next_gate_deadline()
+                if at is not None:
+                    sched.schedule(_TASK_GATES, at)
+                else:
+                    sched.cancel(_TASK_GATES)
             except Exception:
                 pass
+            if _TASK_TUI in due:
+                self._poll_tui(now)
+            self._wait_next_tick(stop_event)
+
+    def _poll_due_files(self, paths: List[Path]) -> None:
+        """
+        Poll due followed files and reschedule each one: hot cadence after new data,
+        exponential back-off while idle.
+        """
+        before: Dict[Path, Tuple[int, int]] = {}
+        for p in paths:
+            cur = self._cursors.get(p)
+            if cur is not None:
+                before[p] = (int(cur.offset), int(cur.line_no))
+        self._poll_follow_files(paths)
+        cold = self._file_scan_interval_s if self._fs_events is not None else max(_COLD_POLL_MAX_S, self._poll_interval_s)
+        mono = time.monotonic()
+        live = set(self._follow_files)
+        for p in list(self._poll_iv):
+            if p not in live:
+                self._poll_iv.pop(p, None)
+        for p in paths:
+            cur = self._cursors.get(p)
+            had_data = cur is not None and before.get(p) != (int(cur.offset), int(cur.line_no))
+            iv = next_poll_interval(self._poll_iv.get(p, 0.0), had_data=had_data, hot_s=HOT_POLL_S, cold_s=cold)
+            self._poll_iv[p] = iv
+            self._sched.schedule(("cursor", p), mono + iv)
+
+    def _poll_tui(self, now: float) -> None:
+        try:
+            if should_poll_tui(
+                follow_mode=self._follow_mode,
+                codex_detected=bool(self._codex_detected),
+                now_ts=float(now),
+                last_poll_ts=float(self._last_tui_poll_ts or 0.0),
+                file_scan_interval_s=float(self._file_scan_interval_s or 0.0),
+            ):
+                self._last_tui_poll_ts = now
+                self._tui.poll(
+                    thread_id=self._thread_id or "",
+                    read_tail_lines=read_tail_lines,
+                    sha1_hex=sha1_hex,
+                    dedupe=self._dedupe,
+                    ingest=self._ingest.ingest,
+                )
+        except Exception:
+            pass
+        # Fast cadence only when it can matter: polling mode with Codex around, or a pending (time-based) wait.
+        # codex-tui.log lives in a watched dir, so with fs events writes wake the loop anyway.
+        iv = self._poll_interval_s
+        try:
+            idle = str(self._follow_mode or "") in ("idle", "wait_codex") and not bool(self._codex_detected)
+            if (idle or self._fs_events is not None) and not self._tui.has_pending_wait():
+                iv = self._file_scan_interval_s
+        except Exception:
+            pass
+        self._sched.schedule(_TASK_TUI, time.monotonic() + iv)
+
+    def _start_fs_events(self) -> None:
+        if not self._fs_events_enabled:
+            return
+        src = open_fs_event_source(self._codex_home)
+        if src is None:
+            print("[sidecar] inotify 不可用（或文件系统不支持），回退到轮询", file=sys.stderr)
+            return
+        self._fs_events = src
+
+    def _stop_fs_events(self) -> None:
+        src = self._fs_events
+        self._fs_events = None
+        if src is not None:
+            src.close()
+
+    def _wake_loop(self) -> None:
+        self._wake_event.set()
+        self._pid_watch.wake()
+        src = self._fs_events
+        if src is not None:
+            src.wake()
+
+    def _fs_watch_dirs(self) -> List[Path]:
+        """
+        Directories whose changes should wake the loop:
+        sessions/ + today's YYYY/MM/DD chain (new rollout files), parents of followed files, log/ (codex-tui.log).
+        """
+        sessions = self._codex_home / "sessions"
+        lt = time.localtime()
+        year = sessions / f"{lt.tm_year:04d}"
+        month = year / f"{lt.tm_mon:02d}"
+        dirs: List[Path] = [sessions, year, month, month / f"{lt.tm_mday:02d}", self._codex_home / "log"]
+        for p in list(self._follow_files or []):
+            if p.parent not in dirs:
+                dirs.append(p.parent)
+        cat = session_catalog_for(self._codex_home)
+        if cat is not None:
             try:
-                if should_poll_tui(
-                    follow_mode=self._follow_mode,
-                    codex_detected=bool(self._codex_detected),
-                    now_ts=float(now),
-                    last_poll_ts=float(self._last_tui_poll_ts or 0.0),
-                    file_scan_interval_s=float(self._file_scan_interval_s or 0.0),
-                ):
-                    self._last_tui_poll_ts = now
-                    self._tui.poll(
-                        thread_id=self._thread_id or "",
-                        read_tail_lines=read_tail_lines,
-                        sha1_hex=sha1_hex,
-                        dedupe=self._dedupe,
-                        ingest=self._ingest.ingest,
-                    )
+                for d in cat.day_dirs(limit=_FS_WATCH_DAY_DIRS):
+                    if d not in dirs:
+                        dirs.append(d)
             except Exception:
                 pass
-            stop_event.wait(self._poll_interval_s)
+        return dirs
+
+    def _refresh_fs_watches(self) -> None:
+        src = self._fs_events
+        if src is None:
+            return
+        try:
+            src.set_dirs(self._fs_watch_dirs())
+        except Exception:
+            pass
+
+    def _wait_next_tick(self, stop_event) -> None:
+        """
+        Sleep until the earliest scheduled task, a watched dir change, or an explicit wake
+        (control-plane changes / stop).
+        """
+        nxt = self._sched.next_deadline()
+        cap = self._file_scan_interval_s
+        timeout = cap if nxt is None else min(cap, max(0.0, nxt - time.monotonic()))
+        src = self._fs_events
+        pw = self._pid_watch
+        if src is None:
+            if not pw.active():
+                if self._wake_event.wait(timeout):
+                    self._wake_event.clear()
+                return
+            self._wake_event.clear()
+            self._on_codex_exit(pw.wait(timeout))
+            return
+        self._wake_event.clear()
+        mask, ready = src.wait_fds(timeout, pw.fds())
+        self._on_codex_exit(pw.exited(ready))
+        if mask:
+            self._note_catalog_writes(src.take_changed_paths())
+        if mask & (IN_CREATE | IN_MOVED_TO | IN_Q_OVERFLOW):
+            # New rollout file (or lost events): rescan follow targets on the next tick, re-reading
+            # every fd link (Codex may have opened it on a reused fd number).
+            self._last_file_scan_ts = 0.0
+            self._follow_picker.request_fd_rescan()
+        if mask:
+            # Something was written: poll every followed file (and the TUI log) now.
+            mono = time.monotonic()
+            for p in self._follow_files:
+                self._sched.schedule_min(("cursor", p), mono)
+            self._sched.schedule_min(_TASK_TUI, mono)
+
+    def _note_catalog_writes(self, paths: List[Path]) -> None:
+        """
+        Keep session recency exact for the files inotify saw written (the catalog would
+        otherwise only notice appends to non-hot rows on its periodic full re-stat).
+        """
+        if not paths:
+            return
+        cat = session_catalog_for(self._codex_home)
+        if cat is None:
+            return
+        try:
+            cat.note_paths(paths)
+        except Exception:
+            pass
+
+    def _sync_catalog_hot_paths(self) -> None:
+        cat = session_catalog_for(self._codex_home)
+        if cat is None:
+            return
+        hot = list(self._follow_files or [])
+        hot.extend(p for p, cur in list(self._cursors.items()) if cur.active and p not in hot)
+        try:
+            cat.set_hot_paths(hot)
+        except Exception:
+            pass
 
+    def _on_codex_exit(self, pids: List[int]) -> None:
+        if not pids:
+            return
+        # A tracked Codex process exited: re-evaluate the follow plan on this tick, not the next scan.
+        self._last_file_scan_ts = 0.0
+
+    def _track_codex_pids(self) -> None:
+        """
+        Hold pidfds for detected Codex pids; arm fast rechecks while a new candidate has no rollout yet.
+        """
+        try:
+            pids = set(int(p) for p in (self._codex_candidate_pids or [])) | set(int(p) for p in (self._codex_pids or []))
+            tracked = set(self._pid_watch.pids())
+            new = pids - tracked
+            self._pid_watch.sync(pids)
+        except Exception:
+            return
+        mono = time.monotonic()
+        waiting_mode = str(self._follow_mode or "").endswith("wait_rollout")
+        # A first detection that already has its rollout open needs no rechecks.
+        if new and self._codex_detected and (tracked or waiting_mode):
+            self._new_proc_until = mono + _NEW_PROC_WATCH_S
+            self._new_proc_files = list(self._process_files or [])
+        waiting = waiting_mode or list(self._process_files or []) == self._new_proc_files
+        if self._codex_detected and waiting and mono < self._new_proc_until:
+            self._sched.schedule(_TASK_PROC, mono + _NEW_PROC_RECHECK_S)
+        else:
+            self._new_proc_until = 0.0
+            self._sched.cancel(_TASK_PROC)
 
     def _sync_follow_targets(self, force: bool) -> None:
         """
@@ -441,6 +747,9 @@ class RolloutWatcher:
             excl_keys = set()
             excl_files = set()
 
+        if str(self._follow_mode or "").endswith("wait_rollout"):
+            # Codex is up but its rollout is not open yet: do not trust cached fd links.
+            self._follow_picker.request_fd_rescan()
         plan = build_follow_sync_plan(
             follow_picker=self._follow_picker,
             controls=FollowControls(
@@ -485,6 +794,7 @@ class RolloutWatcher:
             now=now_ts(),
             replay_last_lines=self._replay_last_lines,
             read_tail_lines=read_tail_lines,
+            read_tail_lines_at=read_tail_lines_at,
             replay_tail=replay_tail,
             stop_requested=self._stop_requested,
             on_line=self._on_rollout_line,
@@ -495,6 +805,11 @@ class RolloutWatcher:
         if res is None:
             return
         self._follow_files = list(res.follow_files or [])
+        self._sync_catalog_hot_paths()
+        # Unfollowed cursors keep their offsets but should not pin file descriptors.
+        for cur in list(self._cursors.values()):
+            if not cur.active:
+                close_cursor_fd(cur)
 
         # When we are explicitly in "idle / wait_codex / wait_rollout" mode, do not follow any file.
         if res.idle:
@@ -518,25 +833,52 @@ class RolloutWatcher:
         except Exception:
             pass
 
-    def _poll_follow_files(self) -> None:
-        for path in list(self._follow_files):
-            if self._stop_requested():
-                break
-            cur = self._cursors.get(path)
-            if cur is None or not cur.active:
-                continue
-            is_primary = bool(self._current_file == path)
-
-            def _on_primary_progress(offset: int, line_no: int) -> None:
-                if not is_primary:
+    def _poll_follow_files(self, only: Optional[List[Path]] = None) -> None:
+        """
+        多会话轮转读取：每轮每个活跃 cursor 最多读 _POLL_BUDGET_BYTES，轮询直到全部读到 EOF。
+
+        - 某个会话积压大量输出时，其它会话的新行（审批 gate / 最终回答）不会被饿死
+        - 同一文件内的行仍按顺序 ingest；每个 tick 的起始 cursor 轮换
+        - 只剩一个未读完的 cursor 时不再限额，直接读到 EOF
+        """
+        paths = list(self._follow_files) if only is None else list(only)
+        if not paths:
+            return
+        k = self._poll_rr % len(paths)
+        self._poll_rr = k + 1
+        pending = paths[k:] + paths[:k]
+        while pending:
+            more: List[Path] = []
+            budget = _POLL_BUDGET_BYTES if len(pending) > 1 else 0
+            for path in pending:
+                if self._stop_requested():
                     return
-                self._offset = int(offset)
-                self._line_no = int(line_no)
-
-            poll_one(
-                cur,
-                stop_requested=self._stop_requested,
-                on_line=self._on_rollout_line,
-                on_primary_progress=_on_primary_progress if is_primary else None,
-                on_error=lambda: setattr(self, "_last_error", "poll_failed"),
-            )
+                cur = self._cursors.get(path)
+                if cur is None or not cur.active:
+                    continue
+                if self._poll_cursor(path, cur, max_bytes=budget):
+                    more.append(path)
+            if more:
+                try:
+                    self._line_ingestor.poll_tool_gates()
+                except Exception:
+                    pass
+            pending = more
+
+    def _poll_cursor(self, path: Path, cur: _FileCursor, *, max_bytes: int) -> bool:
+        is_primary = bool(self._current_file == path)
+
+        def _on_primary_progress(offset: int, line_no: int) -> None:
+            if not is_primary:
+                return
+            self._offset = int(offset)
+            self._line_no = int(line_no)
+
+        return poll_one(
+            cur,
+            stop_requested=self._stop_requested,
+            on_line=self._on_rollout_line,
+            on_primary_progress=_on_primary_progress if is_primary else None,
+            on_error=lambda: setattr(self, "_last_error", "poll_failed"),
+            max_bytes=max_bytes,
+        )
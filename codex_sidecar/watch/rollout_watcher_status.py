@@ -26,7 +26,11 @@ def build_watcher_status(
     codex_process_regex: str,
     process_file: Optional[Path],
     process_files: Sequence[Path],
+    fs_events: str = "poll",
     translate_stats: Optional[Dict[str, Any]] = None,
+    ingest_stats: Optional[Dict[str, Any]] = None,
+    dedupe_stats: Optional[Dict[str, Any]] = None,
+    proc_scan_stats: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, object]:
     """
     Build the RolloutWatcher status payload returned to the UI.
@@ -58,8 +62,15 @@ def build_watcher_status(
         "codex_process_regex": str(codex_process_regex or ""),
         "process_file": str(process_file) if process_file is not None else "",
         "process_files": [str(p) for p in (process_files or [])][:12],
+        "fs_events": str(fs_events or "poll"),
     }
     if isinstance(translate_stats, dict):
         out["translate"] = translate_stats
+    if isinstance(ingest_stats, dict):
+        out["ingest"] = ingest_stats
+    if isinstance(dedupe_stats, dict):
+        out["dedupe"] = dedupe_stats
+    if isinstance(proc_scan_stats, dict):
+        out["proc_scan"] = proc_scan_stats
     return out
 
@@ -0,0 +1,547 @@
+"""
+Persistent rollout session catalog (SQLite under the sidecar config home).
+
+Replaces repeated `sessions/*/*/*/rollout-*.jsonl` globbing + per-file stat:
+- one row per rollout file: path, thread_id, mtime, size, session_meta source,
+  parent_thread_id, first user message;
+- refresh is incremental: only day dirs (sessions/YYYY/MM/DD) whose mtime changed are
+  re-listed; recently active rows and the watcher's followed files (`set_hot_paths`) are
+  re-stat'ed so recency stays exact for the follow picker (appends do not touch the day dir
+  mtime); files the watcher sees written (inotify) are re-stat'ed right away (`note_paths`);
+  a full re-stat runs every few minutes;
+- lookups (by thread_id / by recency / by day range) are indexed queries.
+
+`rollout_paths` consults the catalog registered for a CODEX_HOME (see
+`open_session_catalog`) and falls back to globbing when none is registered or SQLite fails.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .line_index import LineIndex, update_line_index
+from .rollout_paths import _ROLLOUT_RE
+from .session_meta import normalize_session_source_meta
+
+_SCHEMA_VERSION = "1"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    dir TEXT NOT NULL,
+    day TEXT NOT NULL,
+    thread_id TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    source_kind TEXT NOT NULL DEFAULT '',
+    parent_thread_id TEXT NOT NULL DEFAULT '',
+    first_user_message TEXT NOT NULL DEFAULT '',
+    head_done INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS sessions_by_thread ON sessions(thread_id, mtime DESC);
+CREATE INDEX IF NOT EXISTS sessions_by_recency ON sessions(mtime DESC, name DESC);
+CREATE INDEX IF NOT EXISTS sessions_by_day ON sessions(day, mtime DESC);
+CREATE INDEX IF NOT EXISTS sessions_by_dir ON sessions(dir);
+CREATE TABLE IF NOT EXISTS day_dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS line_index (
+    path TEXT PRIMARY KEY,
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    stride INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    lines INTEGER NOT NULL,
+    offsets BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_COLUMNS = (
+    "path",
+    "name",
+    "day",
+    "thread_id",
+    "mtime",
+    "size",
+    "source_kind",
+    "parent_thread_id",
+    "first_user_message",
+)
+
+# Session header parsing (session_meta + first user message) is bounded.
+_HEAD_MAX_LINES = 64
+_HEAD_MAX_BYTES = 512 * 1024
+_FIRST_MSG_MAX_CHARS = 240
+# Rows re-stat'ed on every refresh (most recent by mtime).
+_HOT_ROWS = 64
+
+
+def _is_digits(s: str, n: int) -> bool:
+    return len(s) == n and s.isdigit()
+
+
+def _scan_dirs(path: str, width: int) -> List[Tuple[str, str, int]]:
+    """
+    List numeric child dirs (name width `width`) as (name, path, mtime_ns).
+    """
+    out: List[Tuple[str, str, int]] = []
+    try:
+        with os.scandir(path) as it:
+            for e in it:
+                if not _is_digits(e.name, width):
+                    continue
+                try:
+                    if not e.is_dir():
+                        continue
+                    out.append((e.name, e.path, int(e.stat().st_mtime_ns)))
+                except OSError:
+                    continue
+    except OSError:
+        return []
+    return out
+
+
+def read_session_head(file_path: Path) -> Dict[str, Any]:
+    """
+    Read the rollout header (bounded) and return source_kind / parent_thread_id /
+    first_user_message (best-effort; missing keys are omitted).
+    """
+    out: Dict[str, Any] = {}
+    try:
+        with open(file_path, "rb") as f:
+            read = 0
+            for _ in range(_HEAD_MAX_LINES):
+                bline = f.readline(_HEAD_MAX_BYTES)
+                if not bline:
+                    break
+                read += len(bline)
+                try:
+                    obj = json.loads(bline)
+                except Exception:
+                    obj = None
+                if isinstance(obj, dict):
+                    payload = obj.get("payload")
+                    if not isinstance(payload, dict):
+                        payload = {}
+                    typ = obj.get("type")
+                    if typ == "session_meta" and "source_kind" not in out:
+                        meta = normalize_session_source_meta(payload.get("source"))
+                        out["source_kind"] = str(meta.get("source_kind") or "")
+                        out["parent_thread_id"] = str(meta.get("parent_thread_id") or "")
+                    elif typ == "event_msg" and payload.get("type") == "user_message":
+                        msg = payload.get("message")
+                        if isinstance(msg, str) and msg.strip():
+                            out["first_user_message"] = msg.strip()[:_FIRST_MSG_MAX_CHARS]
+                            break
+                if read >= _HEAD_MAX_BYTES:
+                    break
+    except Exception:
+        return out
+    return out
+
+
+class SessionCatalog:
+    def __init__(self, db_path: Path, codex_home: Path, *, full_restat_s: float = 300.0) -> None:
+        self._db_path = Path(db_path)
+        self._codex_home = Path(codex_home)
+        self._sessions_dir = str(self._codex_home / "sessions")
+        self._full_restat_s = max(0.0, float(full_restat_s or 0.0))
+        self._lock = threading.Lock()
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self._db_path), timeout=2.0, check_same_thread=False)
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.Error:
+            pass
+        self._conn.executescript(_SCHEMA)
+        self._check_schema()
+        self._hot_paths: Tuple[str, ...] = ()
+        self._last_refresh_mono = 0.0
+        self._last_full_restat_mono = 0.0
+        self._last_refresh_ms = 0.0
+
+    def _check_schema(self) -> None:
+        row = self._conn.execute("SELECT value FROM catalog_meta WHERE key='schema'").fetchone()
+        if row is not None and str(row[0]) == _SCHEMA_VERSION:
+            return
+        with self._conn:
+            self._conn.execute("DELETE FROM sessions")
+            self._conn.execute("DELETE FROM day_dirs")
+            self._conn.execute("DELETE FROM line_index")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO catalog_meta(key, value) VALUES('schema', ?)", (_SCHEMA_VERSION,)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO catalog_meta(key, value) VALUES('codex_home', ?)", (str(self._codex_home),)
+            )
+
+    @property
+    def db_path(self) -> Path:
+        return self._db_path
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+
+    # ----- refresh -----
+
+    def set_hot_paths(self, paths: Iterable[Path]) -> None:
+        """
+        Files re-stat'ed on every refresh (the watcher's followed / tailed rollouts).
+        """
+        hot = tuple(dict.fromkeys(str(p) for p in (paths or []) if p))
+        with self._lock:
+            self._hot_paths = hot
+
+    def note_paths(self, paths: Iterable[Path]) -> int:
+        """
+        Re-stat (or add) exactly these files now, e.g. rollouts the watcher saw written.
+
+        An append to an older session (`codex resume`) changes neither its day dir mtime nor
+        the hot rows, so without this it would keep its stale recency until the full re-stat.
+        """
+        want = [str(p) for p in (paths or []) if p and _ROLLOUT_RE.match(os.path.basename(str(p)))]
+        if not want:
+            return 0
+        with self._lock:
+            with self._conn:
+                up, _ = self._restat_paths(want)
+        return up
+
+    def refresh_if_stale(self, max_age_s: float = 1.0) -> None:
+        if (time.monotonic() - self._last_refresh_mono) < max(0.0, float(max_age_s or 0.0)):
+            return
+        self.refresh()
+
+    def refresh(self, *, full: bool = False) -> Dict[str, int]:
+        """
+        Incrementally sync the catalog with CODEX_HOME/sessions.
+        """
+        t0 = time.monotonic()
+        stats = {"day_dirs": 0, "rescanned_dirs": 0, "upserted": 0, "removed": 0}
+        with self._lock:
+            day_dirs: Dict[str, Tuple[str, int]] = {}
+            for y_name, y_path, _ in _scan_dirs(self._sessions_dir, 4):
+                for m_name, m_path, _ in _scan_dirs(y_path, 2):
+                    for d_name, d_path, d_mtime in _scan_dirs(m_path, 2):
+                        day_dirs[d_path] = (f"{y_name}-{m_name}-{d_name}", d_mtime)
+            stats["day_dirs"] = len(day_dirs)
+            known = dict(self._conn.execute("SELECT path, mtime_ns FROM day_dirs").fetchall())
+            now = time.monotonic()
+            full = bool(full) or (
+                self._full_restat_s > 0.0 and (now - self._last_full_restat_mono) >= self._full_restat_s
+            )
+            with self._conn:
+                for gone in set(known) - set(day_dirs):
+                    self._conn.execute(
+                        "DELETE FROM line_index WHERE path IN (SELECT path FROM sessions WHERE dir=?)", (gone,)
+                    )
+                    cur = self._conn.execute("DELETE FROM sessions WHERE dir=?", (gone,))
+                    stats["removed"] += int(cur.rowcount or 0)
+                    self._conn.execute("DELETE FROM day_dirs WHERE path=?", (gone,))
+                for d_path, (day, d_mtime) in day_dirs.items():
+                    if known.get(d_path) == d_mtime:
+                        continue
+                    up, rm = self._rescan_day_dir(d_path, day)
+                    stats["rescanned_dirs"] += 1
+                    stats["upserted"] += up
+                    stats["removed"] += rm
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO day_dirs(path, mtime_ns) VALUES(?, ?)", (d_path, int(d_mtime))
+                    )
+                if full:
+                    rows = self._conn.execute("SELECT path, mtime, size, head_done FROM sessions").fetchall()
+                    self._last_full_restat_mono = now
+                else:
+                    rows = self._conn.execute(
+                        "SELECT path, mtime, size, head_done FROM sessions ORDER BY mtime DESC, name DESC LIMIT ?",
+                        (_HOT_ROWS,),
+                    ).fetchall()
+                up, rm = self._restat_rows(rows)
+                stats["upserted"] += up
+                stats["removed"] += rm
+                if not full:
+                    seen = {r[0] for r in rows}
+                    up, rm = self._restat_paths([p for p in self._hot_paths if p not in seen])
+                    stats["upserted"] += up
+                    stats["removed"] += rm
+            self._last_refresh_mono = time.monotonic()
+            self._last_refresh_ms = (self._last_refresh_mono - t0) * 1000.0
+        return stats
+
+    def _rescan_day_dir(self, d_path: str, day: str) -> Tuple[int, int]:
+        present: Dict[str, os.stat_result] = {}
+        try:
+            with os.scandir(d_path) as it:
+                for e in it:
+                    if not _ROLLOUT_RE.match(e.name):
+                        continue
+                    try:
+                        if e.is_file():
+                            present[e.path] = e.stat()
+                    except OSError:
+                        continue
+        except OSError:
+            present = {}
+        rows = self._conn.execute("SELECT path, mtime, size, head_done FROM sessions WHERE dir=?", (d_path,)).fetchall()
+        have = {r[0]: r for r in rows}
+        removed = 0
+        for p in set(have) - set(present):
+            self._forget(p)
+            removed += 1
+        upserted = 0
+        for p, st in present.items():
+            row = have.get(p)
+            if row is not None and float(row[1]) == float(st.st_mtime) and int(row[2]) == int(st.st_size):
+                continue
+            self._upsert(p, d_path, day, st, head_done=bool(row[3]) if row is not None else False)
+            upserted += 1
+        return upserted, removed
+
+    def _restat_rows(self, rows: Iterable[Tuple[str, float, int, int]]) -> Tuple[int, int]:
+        upserted = 0
+        removed = 0
+        for p, mtime, size, head_done in rows:
+            try:
+                st = os.stat(p)
+            except OSError:
+                self._forget(p)
+                removed += 1
+                continue
+            if float(st.st_mtime) == float(mtime) and int(st.st_size) == int(size):
+                continue
+            self._conn.execute("UPDATE sessions SET mtime=?, size=? WHERE path=?", (float(st.st_mtime), int(st.st_size), p))
+            if not head_done:
+                self._update_head(p, int(st.st_size))
+            upserted += 1
+        return upserted, removed
+
+    def _day_dir_of(self, path: str) -> Optional[Tuple[str, str]]:
+        """
+        (day dir, YYYY-MM-DD) when `path` is sessions/YYYY/MM/DD/<file>, else None.
+        """
+        d_path = os.path.dirname(path)
+        m_path = os.path.dirname(d_path)
+        y_path = os.path.dirname(m_path)
+        if os.path.dirname(y_path) != self._sessions_dir:
+            return None
+        y, m, d = os.path.basename(y_path), os.path.basename(m_path), os.path.basename(d_path)
+        if not (_is_digits(y, 4) and _is_digits(m, 2) and _is_digits(d, 2)):
+            return None
+        return d_path, f"{y}-{m}-{d}"
+
+    def _restat_paths(self, paths: Iterable[str]) -> Tuple[int, int]:
+        upserted = 0
+        removed = 0
+        for p in paths:
+            row = self._conn.execute("SELECT path, mtime, size, head_done FROM sessions WHERE path=?", (p,)).fetchone()
+            if row is not None:
+                up, rm = self._restat_rows([row])
+                upserted += up
+                removed += rm
+                continue
+            loc = self._day_dir_of(p)
+            if loc is None:
+                continue
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            # Its day dir is re-listed later anyway (its mtime changed when the file was created).
+            self._upsert(p, loc[0], loc[1], st, head_done=False)
+            upserted += 1
+        return upserted, removed
+
+    def _forget(self, path: str) -> None:
+        self._conn.execute("DELETE FROM sessions WHERE path=?", (path,))
+        self._conn.execute("DELETE FROM line_index WHERE path=?", (path,))
+
+    def _upsert(self, path: str, d_path: str, day: str, st: os.stat_result, *, head_done: bool) -> None:
+        name = os.path.basename(path)
+        m = _ROLLOUT_RE.match(name)
+        tid = m.group(1) if m else ""
+        self._conn.execute(
+            "INSERT INTO sessions(path, name, dir, day, thread_id, mtime, size) VALUES(?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET mtime=excluded.mtime, size=excluded.size",
+            (path, name, d_path, day, tid, float(st.st_mtime), int(st.st_size)),
+        )
+        if not head_done:
+            self._update_head(path, int(st.st_size))
+
+    def _update_head(self, path: str, size: int) -> None:
+        head = read_session_head(Path(path))
+        # The first user message usually lands a few lines after session_meta; keep
+        # re-reading the header while the file is still small and it is missing.
+        done = 1 if (head.get("first_user_message") or size >= _HEAD_MAX_BYTES) else 0
+        self._conn.execute(
+            "UPDATE sessions SET source_kind=?, parent_thread_id=?, first_user_message=?, head_done=? WHERE path=?",
+            (
+                str(head.get("source_kind") or ""),
+                str(head.get("parent_thread_id") or ""),
+                str(head.get("first_user_message") or ""),
+                done,
+                path,
+            ),
+        )
+
+    # ----- lookups -----
+
+    def _query(self, sql: str, args: Tuple[Any, ...]) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [dict(zip(_COLUMNS, r)) for r in rows]
+
+    def latest(self, limit: int = 1) -> List[Dict[str, Any]]:
+        n = int(limit or 0)
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM sessions ORDER BY mtime DESC, name DESC"
+        if n <= 0:
+            return self._query(sql, ())
+        return self._query(sql + " LIMIT ?", (n,))
+
+    def find_thread(self, thread_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query(
+            f"SELECT {', '.join(_COLUMNS)} FROM sessions WHERE thread_id=? ORDER BY mtime DESC LIMIT 1",
+            (str(thread_id or ""),),
+        )
+        return rows[0] if rows else None
+
+    def between_days(self, start_day: str, end_day: str, limit: int = 0) -> List[Dict[str, Any]]:
+        """
+        Sessions whose day dir is within [start_day, end_day] (YYYY-MM-DD, inclusive), newest first.
+        """
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM sessions WHERE day BETWEEN ? AND ? ORDER BY mtime DESC, name DESC"
+        n = int(limit or 0)
+        if n > 0:
+            return self._query(sql + " LIMIT ?", (str(start_day), str(end_day), n))
+        return self._query(sql, (str(start_day), str(end_day)))
+
+    def day_dirs(self, limit: int = 0) -> List[Path]:
+        """
+        Known day dirs, newest day first.
+        """
+        sql = "SELECT path FROM day_dirs ORDER BY path DESC"
+        n = int(limit or 0)
+        with self._lock:
+            rows = self._conn.execute(sql + " LIMIT ?", (n,)).fetchall() if n > 0 else self._conn.execute(sql).fetchall()
+        return [Path(r[0]) for r in rows]
+
+    # ----- line index -----
+
+    def load_line_index(self, path: str) -> Optional[LineIndex]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT dev, ino, stride, size, lines, offsets FROM line_index WHERE path=?", (str(path),)
+            ).fetchone()
+        if row is None:
+            return None
+        return LineIndex(
+            path=str(path),
+            dev=int(row[0]),
+            ino=int(row[1]),
+            stride=int(row[2]),
+            size=int(row[3]),
+            lines=int(row[4]),
+            offsets=LineIndex.offsets_from_blob(row[5]),
+        )
+
+    def save_line_index(self, idx: LineIndex) -> None:
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO line_index(path, dev, ino, stride, size, lines, offsets) "
+                    "VALUES(?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        str(idx.path),
+                        int(idx.dev),
+                        int(idx.ino),
+                        int(idx.stride),
+                        int(idx.size),
+                        int(idx.lines),
+                        sqlite3.Binary(idx.offsets_blob()),
+                    ),
+                )
+
+    def line_index(self, path: Path) -> LineIndex:
+        """
+        Load the persisted index for `path`, extend it to the current file size and persist it.
+        """
+        key = str(path)
+        idx, changed = update_line_index(Path(key), self.load_line_index(key))
+        if changed:
+            self.save_line_index(idx)
+        return idx
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()
+        return {
+            "sessions": int(row[0] if row else 0),
+            "last_refresh_ms": round(float(self._last_refresh_ms), 3),
+            "db": str(self._db_path),
+        }
+
+
+_CATALOGS: Dict[str, SessionCatalog] = {}
+_CATALOGS_LOCK = threading.Lock()
+
+
+def _home_key(codex_home: Path) -> str:
+    try:
+        return str(Path(codex_home).expanduser())
+    except Exception:
+        return str(codex_home)
+
+
+def catalog_db_path(config_home: Path, codex_home: Path) -> Path:
+    h = hashlib.sha1(_home_key(codex_home).encode("utf-8", errors="replace")).hexdigest()[:12]
+    return Path(config_home).expanduser() / "cache" / f"sessions-{h}.sqlite3"
+
+
+def open_session_catalog(*, config_home: Optional[Path], codex_home: Path) -> Optional[SessionCatalog]:
+    """
+    Open (or reuse) the catalog for CODEX_HOME and register it for `session_catalog_for`.
+
+    Returns None when the catalog cannot be created (read-only config home, no sqlite3, ...).
+    """
+    if not str(config_home or "").strip():
+        return None
+    key = _home_key(codex_home)
+    with _CATALOGS_LOCK:
+        cat = _CATALOGS.get(key)
+        if cat is not None:
+            return cat
+        try:
+            cat = SessionCatalog(catalog_db_path(Path(config_home), Path(key)), Path(key))
+        except Exception:
+            return None
+        _CATALOGS[key] = cat
+        return cat
+
+
+def session_catalog_for(codex_home: Path) -> Optional[SessionCatalog]:
+    if not _CATALOGS:
+        return None
+    return _CATALOGS.get(_home_key(codex_home))
+
+
+def close_session_catalogs() -> None:
+    with _CATALOGS_LOCK:
+        cats = list(_CATALOGS.values())
+        _CATALOGS.clear()
+    for cat in cats:
+        cat.close()
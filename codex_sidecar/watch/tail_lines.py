@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 
 
 def read_tail_lines(path: Path, *, last_lines: int, max_bytes: int = 32 * 1024 * 1024) -> List[bytes]:
@@ -12,12 +12,57 @@ def read_tail_lines(path: Path, *, last_lines: int, max_bytes: int = 32 * 1024 *
     - Behavior intentionally mirrors the previous watcher/offline implementations:
       when we start reading from a non-zero offset, we may drop the first partial line.
     """
+    buf, pos = _read_tail_block(path, last_lines=last_lines, max_bytes=max_bytes)
+    if not buf:
+        return []
+    lines = buf.splitlines()
+    if pos != 0 and lines:
+        lines = lines[1:]
+    ll = int(last_lines)
+    if ll <= 0:
+        return lines
+    return lines[-ll:]
+
+
+def read_tail_lines_at(path: Path, *, last_lines: int, max_bytes: int = 32 * 1024 * 1024) -> List[Tuple[int, bytes]]:
+    """
+    Same as read_tail_lines, but returns (byte_offset, line) pairs (lines split on \n,
+    a trailing \r is stripped). Offsets match what the incremental tailer reports, so
+    replayed and tailed lines share structural dedupe keys.
+    """
+    buf, pos = _read_tail_block(path, last_lines=last_lines, max_bytes=max_bytes)
+    if not buf:
+        return []
+    out: List[Tuple[int, bytes]] = []
+    off = pos
+    parts = buf.split(b"\n")
+    last = len(parts) - 1
+    for i, ln in enumerate(parts):
+        start = off
+        off += len(ln) + 1
+        if i == 0 and pos != 0:
+            continue
+        if i == last and not ln:
+            break
+        out.append((start, ln[:-1] if ln.endswith(b"\r") else ln))
+    ll = int(last_lines)
+    if ll <= 0:
+        return out
+    return out[-ll:]
+
+
+def _read_tail_block(path: Path, *, last_lines: int, max_bytes: int) -> Tuple[bytes, int]:
+    """
+    Read whole blocks backwards from EOF until N+1 newlines (or max_bytes) are covered.
+
+    Returns (buf, pos): buf starts at byte offset pos.
+    """
     try:
         size = int(path.stat().st_size)
     except Exception:
-        return []
+        return b"", 0
     if size <= 0:
-        return []
+        return b"", 0
 
     block = 256 * 1024
     want = max(1, int(last_lines) + 1)
@@ -39,17 +84,9 @@ def read_tail_lines(path: Path, *, last_lines: int, max_bytes: int = 32 * 1024 *
                 read_bytes += len(chunk)
                 nl += chunk.count(b"\n")
     except Exception:
-        return []
+        return b"", 0
 
     if not chunks:
-        return []
-
-    buf = b"".join(reversed(chunks))
-    lines = buf.splitlines()
-    if pos != 0 and lines:
-        lines = lines[1:]
-    ll = int(last_lines)
-    if ll <= 0:
-        return lines
-    return lines[-ll:]
+        return b"", 0
+    return b"".join(reversed(chunks)), pos
 
@@ -43,6 +43,12 @@ class TuiGateTailer:
         self._wait_toolcall: Optional[Dict[str, object]] = None
         self._wait_emitted = False
 
+    def has_pending_wait(self) -> bool:
+        """
+        True while a "waiting for tool gate" is observed but not yet emitted (delayed notify is time-based).
+        """
+        return bool(self._gate_waiting) and not bool(self._wait_emitted)
+
     def poll(
         self,
         *,
@@ -0,0 +1,94 @@
+"""
+Timer heap for the rollout watcher loop.
+
+Each task (follow-target scan, one per followed file, approval gates, TUI log) owns a
+single deadline on time.monotonic(). Rescheduling a task supersedes its previous entry
+(stale heap entries are skipped lazily), so the loop only sleeps until the earliest
+deadline or an external wake.
+"""
+
+import heapq
+import itertools
+from typing import Dict, Hashable, List, Optional, Tuple
+
+# Followed files that just produced data are polled at the hot cadence; idle ones back
+# off exponentially (x2 per empty poll) up to the cold cap chosen by the watcher.
+HOT_POLL_S = 0.05
+
+
+def next_poll_interval(prev_s: float, *, had_data: bool, hot_s: float = HOT_POLL_S, cold_s: float = 2.0) -> float:
+    hot = max(0.001, float(hot_s))
+    if had_data:
+        return hot
+    try:
+        prev = float(prev_s)
+    except Exception:
+        prev = 0.0
+    return min(max(hot, float(cold_s)), max(hot, prev * 2.0))
+
+
+class TimerHeap:
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._due: Dict[Hashable, Tuple[float, int]] = {}
+        self._counter = itertools.count()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._due
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def schedule(self, key: Hashable, at: float) -> None:
+        """
+        Set the deadline of `key` (replacing any earlier one).
+        """
+        n = next(self._counter)
+        self._due[key] = (float(at), n)
+        heapq.heappush(self._heap, (float(at), n, key))
+        if len(self._heap) > 64 and len(self._heap) > 4 * len(self._due):
+            self._compact()
+
+    def schedule_min(self, key: Hashable, at: float) -> None:
+        """
+        Move the deadline of `key` earlier (no-op when it is already due sooner).
+        """
+        cur = self._due.get(key)
+        if cur is None or float(at) < cur[0]:
+            self.schedule(key, at)
+
+    def cancel(self, key: Hashable) -> None:
+        self._due.pop(key, None)
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        cur = self._due.get(key)
+        return cur[0] if cur is not None else None
+
+    def next_deadline(self) -> Optional[float]:
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> List[Hashable]:
+        """
+        Remove and return every task whose deadline is <= now (earliest first).
+        """
+        out: List[Hashable] = []
+        while True:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return out
+            _, _, key = heapq.heappop(self._heap)
+            self._due.pop(key, None)
+            out.append(key)
+
+    def _drop_stale(self) -> None:
+        heap = self._heap
+        while heap:
+            at, n, key = heap[0]
+            if self._due.get(key) == (at, n):
+                return
+            heapq.heappop(heap)
+
+    def _compact(self) -> None:
+        self._heap = [(at, n, key) for key, (at, n) in self._due.items()]
+        heapq.heapify(self._heap)
@@ -6,10 +6,12 @@ Rollout watcher facade（向后兼容）。
   - from codex_sidecar.watcher import RolloutWatcher, HttpIngestClient
 """
 
+from .watch.local_ingest import LocalIngestClient
 from .watch.rollout_watcher import HttpIngestClient, RolloutWatcher
 
 __all__ = [
     "HttpIngestClient",
+    "LocalIngestClient",
     "RolloutWatcher",
 ]
 
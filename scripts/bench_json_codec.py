@@ -0,0 +1,109 @@
+"""
+Micro-benchmark for codex_sidecar.json_codec backends on real rollout lines.
+
+Usage:
+  python3 scripts/bench_json_codec.py [rollout-*.jsonl ...] [--max-lines N] [--repeat N]
+
+Without files, the newest rollout under $CODEX_HOME/sessions (default ~/.codex) is used,
+falling back to tests/fixtures/rollout_sample.jsonl.
+
+Reports per line decode cost (json.loads of the raw line) and per message encode cost
+(the UI message dict the sidecar builds from that line, as sent over SSE / ingest).
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from codex_sidecar import json_codec  # noqa: E402
+from codex_sidecar.watch.rollout_extract import extract_rollout_items  # noqa: E402
+from codex_sidecar.watch.rollout_paths import _latest_rollout_files  # noqa: E402
+
+
+def _default_files() -> List[Path]:
+    home = Path(os.environ.get("CODEX_HOME") or "~/.codex").expanduser()
+    try:
+        files = _latest_rollout_files(home, limit=1)
+    except Exception:
+        files = []
+    if files:
+        return files
+    return [Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "rollout_sample.jsonl"]
+
+
+def _messages(lines: List[bytes]) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    for i, bline in enumerate(lines, start=1):
+        try:
+            obj = json_codec.get_backend("stdlib")[1](bline)  # type: ignore[index]
+        except Exception:
+            continue
+        ts, items = extract_rollout_items(obj)
+        for it in items:
+            out.append(
+                {
+                    "id": f"{i:016x}",
+                    "seq": i,
+                    "ts": ts,
+                    "kind": it["kind"],
+                    "text": it["text"],
+                    "zh": "",
+                    "replay": False,
+                    "thread_id": "00000000-0000-0000-0000-000000000000",
+                    "file": "rollout.jsonl",
+                    "line": i,
+                }
+            )
+    return out
+
+
+def _bench(fn, items: List[Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        for x in items:
+            try:
+                fn(x)
+            except Exception:
+                pass
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("files", nargs="*", type=Path)
+    ap.add_argument("--max-lines", type=int, default=20000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    lines: List[bytes] = []
+    for p in args.files or _default_files():
+        lines.extend(ln for ln in p.read_bytes().split(b"\n") if ln.strip())
+    lines = lines[: max(1, args.max_lines)]
+    msgs = _messages(lines)
+    nbytes = sum(len(ln) for ln in lines)
+    print(f"lines={len(lines)} ({nbytes / 1e6:.1f} MB)  messages={len(msgs)}  selected={json_codec.BACKEND}")
+    print(f"{'backend':<10}{'decode us/line':>16}{'MB/s':>9}{'encode us/msg':>16}")
+    for name in ("stdlib", "orjson", "msgspec"):
+        pair = json_codec.get_backend(name)
+        if pair is None:
+            print(f"{name:<10}{'(not installed)':>16}")
+            continue
+        dumps, loads = pair
+        t_dec = _bench(loads, lines, args.repeat)
+        t_enc = _bench(dumps, msgs, args.repeat) if msgs else 0.0
+        print(
+            f"{name:<10}{t_dec / max(1, len(lines)) * 1e6:>16.2f}{nbytes / max(t_dec, 1e-9) / 1e6:>9.0f}"
+            f"{t_enc / max(1, len(msgs)) * 1e6:>16.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
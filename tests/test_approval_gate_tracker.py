@@ -1,4 +1,5 @@
 import json
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
@@ -82,3 +83,37 @@ def test_default_delay_emits_waiting_when_output_is_missing() -> None:
     assert em.items[0].get("kind") == "tool_gate"
     assert em.items[0].get("gate_status") == "waiting"
 
+
+
+def test_next_deadline_matches_poll_threshold() -> None:
+    em = _Emitter()
+    tr = _ApprovalGateTracker(dedupe=lambda _hid, kind: False, emit_ingest=em.emit)
+    assert tr.next_deadline() is None
+
+    args = {"command": "rm -rf build", "sandbox_permissions": "require_escalated", "justification": "x"}
+    text = "shell_command\ncall_id=call_dl\n{}".format(json.dumps(args, ensure_ascii=False))
+    tr.on_tool_call(
+        ts=_iso(datetime.now(timezone.utc)),
+        thread_id="t",
+        tool_call_text=text,
+        is_replay=False,
+        file_path=Path("/tmp/rollout.jsonl"),
+    )
+    at = tr.next_deadline()
+    assert at is not None
+    seen = tr._pending["call_dl"]["seen_mono"]
+    assert seen < at <= seen + 1.25 + 1e-6
+
+    # Already old rollout timestamp: due immediately.
+    tr.on_tool_call(
+        ts=_iso(datetime.now(timezone.utc) - timedelta(seconds=30)),
+        thread_id="t",
+        tool_call_text=text.replace("call_dl", "call_old"),
+        is_replay=False,
+        file_path=Path("/tmp/rollout.jsonl"),
+    )
+    assert tr.next_deadline() <= time.monotonic()
+    tr.poll()
+    assert len(em.items) == 1
+    # Emitted gates no longer contribute a deadline.
+    assert abs(tr.next_deadline() - at) < 0.5
@@ -0,0 +1,55 @@
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from codex_sidecar.controller import SidecarController
+from codex_sidecar.http.state import SidecarState
+
+
+class _SlowState(SidecarState):
+    def __init__(self) -> None:
+        super().__init__(max_messages=100)
+        self.release = threading.Event()
+
+    def add_many(self, msgs):  # type: ignore[override]
+        self.release.wait(timeout=2.0)
+        return super().add_many(msgs)
+
+    def add(self, msg):  # type: ignore[override]
+        self.release.wait(timeout=2.0)
+        return super().add(msg)
+
+
+class TestControllerIngestSink(unittest.TestCase):
+    def test_clear_drains_acknowledged_messages_first(self) -> None:
+        with TemporaryDirectory() as td:
+            st = _SlowState()
+            ctl = SidecarController(config_home=Path(td), server_url="http://127.0.0.1:1", state=st)
+            sink = ctl._ingest_sink
+            assert sink is not None
+            try:
+                for i in range(20):
+                    self.assertTrue(sink.ingest({"id": f"m{i}", "kind": "assistant_message", "text": "x"}))
+                threading.Timer(0.05, st.release.set).start()
+                ctl.clear_messages()
+                self.assertTrue(sink.flush(timeout_s=1.0))
+                self.assertEqual(st.list_messages(), [])
+            finally:
+                ctl.close()
+
+    def test_close_applies_pending_and_stops_sink(self) -> None:
+        with TemporaryDirectory() as td:
+            st = SidecarState(max_messages=100)
+            ctl = SidecarController(config_home=Path(td), server_url="http://127.0.0.1:1", state=st)
+            sink = ctl._ingest_sink
+            assert sink is not None
+            for i in range(5):
+                self.assertTrue(sink.ingest({"id": f"m{i}", "kind": "assistant_message", "text": "x"}))
+            ctl.close()
+            self.assertEqual([m.get("id") for m in st.list_messages()], [f"m{i}" for i in range(5)])
+            self.assertFalse(sink.ingest({"id": "late", "kind": "assistant_message", "text": "x"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from codex_sidecar.watch.dedupe_cache import DedupeCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.t = 100.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+class TestDedupeCache(unittest.TestCase):
+    def test_seen_and_structural_keys(self) -> None:
+        d = DedupeCache()
+        self.assertFalse(d("abc", kind="assistant_message"))
+        self.assertTrue(d("abc", kind="assistant_message"))
+        k = (1, 2, 4096, 0)
+        self.assertFalse(d(k))
+        self.assertTrue(d((1, 2, 4096, 0)))
+        self.assertFalse(d((1, 2, 4096, 1)))
+        self.assertFalse(d(""))
+        st = d.stats()
+        self.assertEqual(st["entries"], 3)
+        self.assertEqual(st["hits"], 2)
+        self.assertEqual(st["misses"], 3)
+
+    def test_lru_eviction_keeps_recently_hit_keys(self) -> None:
+        d = DedupeCache(max_bytes=1024)
+        keys = [(0, 0, i, 0) for i in range(64)]
+        d(keys[0])
+        for k in keys[1:]:
+            d(keys[0])  # keep the first key hot
+            d(k)
+        st = d.stats()
+        self.assertLessEqual(st["bytes"], st["max_bytes"])
+        self.assertGreater(st["evictions"], 0)
+        self.assertTrue(d(keys[0]))
+        self.assertTrue(d(keys[-1]))
+        self.assertFalse(d(keys[1]))
+
+    def test_entry_cap_evicts_oldest(self) -> None:
+        d = DedupeCache(3)
+        for k in ("a", "b", "c", "d"):
+            d(k)
+        self.assertEqual(len(d), 3)
+        self.assertTrue(d("d"))
+        self.assertFalse(d("a"))
+
+    def test_ttl_by_kind(self) -> None:
+        clk = _Clock()
+        d = DedupeCache(ttl_s_by_kind={"tool_gate": 5.0}, clock=clk)
+        self.assertFalse(d("g", kind="tool_gate"))
+        self.assertFalse(d("m", kind="assistant_message"))
+        clk.t += 4.0
+        self.assertTrue(d("g", kind="tool_gate"))
+        clk.t += 2.0
+        self.assertFalse(d("g", kind="tool_gate"))
+        self.assertTrue(d("g", kind="tool_gate"))
+        clk.t += 1000.0
+        self.assertTrue(d("m", kind="assistant_message"))
+        self.assertEqual(d.stats()["expired"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -139,13 +139,16 @@ class TestFollowPicker(unittest.TestCase):
                 return "bash"
 
             with patch("codex_sidecar.watch.follow_picker._proc_list_pids", side_effect=_list_pids), patch(
+                "codex_sidecar.watch.follow_picker._proc_read_stat",
+                side_effect=lambda pid: (1, int(pid)),
+            ), patch(
                 "codex_sidecar.watch.follow_picker._proc_read_exe_basename",
                 return_value="",
             ), patch(
                 "codex_sidecar.watch.follow_picker._proc_read_argv0_basename",
                 side_effect=_argv0,
             ), patch(
-                "codex_sidecar.watch.follow_picker._proc_iter_fd_targets_with_flags",
+                "codex_sidecar.watch.follow_picker._proc_list_fds",
                 return_value=[],
             ), patch(
                 "codex_sidecar.watch.follow_picker.FollowPicker._collect_process_tree",
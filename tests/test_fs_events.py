@@ -0,0 +1,87 @@
+import os
+import resource
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from codex_sidecar.watch import fs_events
+from codex_sidecar.watch.fs_events import IN_CREATE, IN_MODIFY, open_fs_event_source
+
+
+def _source_or_skip(test: unittest.TestCase, root: Path):
+    src = open_fs_event_source(root)
+    if src is None:
+        test.skipTest("inotify not available here")
+    return src
+
+
+class TestFsEvents(unittest.TestCase):
+    def test_append_to_watched_dir_wakes_wait(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            f = root / "rollout.jsonl"
+            f.write_text("", encoding="utf-8")
+            src = _source_or_skip(self, root)
+            try:
+                src.set_dirs([root])
+                self.assertEqual(src.watched_dirs(), 1)
+                with open(f, "a", encoding="utf-8") as fh:
+                    fh.write('{"a":1}\n')
+                t0 = time.monotonic()
+                mask = src.wait(5.0)
+                self.assertTrue(mask & IN_MODIFY)
+                self.assertLess(time.monotonic() - t0, 2.0)
+                self.assertEqual(src.take_changed_paths(), [f])
+                (root / "new.jsonl").write_text("", encoding="utf-8")
+                self.assertTrue(src.wait(5.0) & IN_CREATE)
+                self.assertEqual(src.take_changed_paths(), [root / "new.jsonl"])
+                self.assertEqual(src.take_changed_paths(), [])
+            finally:
+                src.close()
+
+    def test_wake_and_timeout(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            src = _source_or_skip(self, Path(td))
+            try:
+                src.set_dirs([Path(td), Path(td) / "missing"])
+                self.assertEqual(src.watched_dirs(), 1)
+                self.assertEqual(src.wait(0.05), 0)
+                threading.Timer(0.05, src.wake).start()
+                t0 = time.monotonic()
+                src.wait(5.0)
+                self.assertLess(time.monotonic() - t0, 2.0)
+                src.set_dirs([])
+                self.assertEqual(src.watched_dirs(), 0)
+            finally:
+                src.close()
+
+    def test_wait_readable_handles_high_and_invalid_fds(self) -> None:
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft <= 1100:
+            self.skipTest("RLIMIT_NOFILE too low for an fd >= 1024")
+        r, w = os.pipe()
+        high = os.dup2(r, 1090)
+        try:
+            # select() raises ValueError for fds >= FD_SETSIZE; poll() does not.
+            self.assertEqual(fs_events.wait_readable([high], 0.01), [])
+            os.write(w, b"x")
+            self.assertEqual(fs_events.wait_readable([high], 1.0), [high])
+        finally:
+            for fd in (r, w, high):
+                os.close(fd)
+        # A stale (closed) fd must not make callers spin: the timeout is still waited out.
+        t0 = time.monotonic()
+        self.assertEqual(fs_events.wait_readable([high], 0.2), [])
+        self.assertEqual(fs_events.wait_readable([-1], 0.2), [])
+        self.assertGreaterEqual(time.monotonic() - t0, 0.35)
+
+    def test_network_filesystems_fall_back_to_polling(self) -> None:
+        with mock.patch.object(fs_events, "_mount_fstype", return_value="9p"):
+            self.assertIsNone(open_fs_event_source(Path("/mnt/c/Users/x/.codex")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import json
+import socket
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+from codex_sidecar.http.aio_server import AsyncSidecarHTTPServer
+from codex_sidecar.http.sse import SseSession
+from codex_sidecar.http.state import SidecarState
+
+
+class _FakeController:
+    def get_config(self) -> dict:
+        return {}
+
+    def update_config(self, _patch: dict) -> dict:
+        return {}
+
+    def status(self) -> dict:
+        return {"ok": True}
+
+
+class TestHttpAioServer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.httpd = AsyncSidecarHTTPServer(("127.0.0.1", 0), max_workers=2)
+        self.httpd.state = SidecarState(max_messages=100)
+        self.httpd.controller = _FakeController()
+        self.port = int(self.httpd.server_address[1])
+        t = threading.Thread(target=self.httpd.serve_forever, name="test-aio-httpd", daemon=True)
+        t.start()
+        self._thread = t
+
+    def tearDown(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._thread.join(timeout=2.0)
+        self.assertFalse(self._thread.is_alive())
+
+    def _url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def test_api_routes_are_served_by_handler(self) -> None:
+        with urllib.request.urlopen(self._url("/health"), timeout=2.0) as resp:
+            self.assertEqual(resp.status, 200)
+            self.assertTrue(json.loads(resp.read()).get("ok"))
+
+        body = json.dumps({"id": "m1", "kind": "assistant_message", "text": "hi"}).encode("utf-8")
+        req = urllib.request.Request(self._url("/ingest"), data=body, method="POST", headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=2.0) as resp:
+            self.assertEqual(resp.status, 200)
+        with urllib.request.urlopen(self._url("/api/messages"), timeout=2.0) as resp:
+            msgs = json.loads(resp.read()).get("messages")
+        self.assertEqual([m.get("id") for m in msgs], ["m1"])
+
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            urllib.request.urlopen(urllib.request.Request(self._url("/health"), method="PUT"), timeout=2.0)
+        self.assertEqual(cm.exception.code, 501)
+
+    def test_bad_request_line(self) -> None:
+        with socket.create_connection(("127.0.0.1", self.port), timeout=2.0) as s:
+            s.sendall(b"garbage\r\n\r\n")
+            self.assertTrue(s.recv(4096).startswith(b"HTTP/1.0 400 "))
+
+    def test_sse_clients_do_not_hold_threads(self) -> None:
+        n_before = threading.active_count()
+        socks = []
+        files = []
+        try:
+            for _ in range(20):
+                s = socket.create_connection(("127.0.0.1", self.port), timeout=2.0)
+                s.sendall(b"GET /events?batch=1 HTTP/1.1\r\nHost: x\r\n\r\n")
+                socks.append(s)
+            files = [s.makefile("rb") for s in socks]
+            for f in files:
+                self.assertTrue(f.readline().startswith(b"HTTP/1."))
+                while f.readline() not in (b"\r\n", b""):
+                    pass
+                self.assertEqual(f.readline(), b":ok\n")
+                self.assertEqual(f.readline(), b"\n")
+            self.assertLessEqual(threading.active_count(), n_before + 1)
+
+            self.httpd.state.add({"id": "e1", "kind": "assistant_message", "text": "x"})
+            for f in files:
+                self.assertEqual(f.readline(), b"id: 1\n")
+                self.assertEqual(f.readline(), b"event: message\n")
+                self.assertEqual(json.loads(f.readline()[len(b"data: ") :]).get("id"), "e1")
+                self.assertEqual(f.readline(), b"\n")
+        finally:
+            for f in files:
+                f.close()
+            for s in socks:
+                s.close()
+        # Closed clients are noticed (EOF) and unsubscribed without waiting for a heartbeat.
+        deadline = time.monotonic() + 2.0
+        while self.httpd.state._broadcaster._subscribers and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(self.httpd.state._broadcaster._subscribers, [])
+
+    def test_sse_catchup_runs_off_the_event_loop(self) -> None:
+        for i in range(3):
+            self.httpd.state.add({"id": f"c{i}", "kind": "assistant_message", "text": "x"})
+        real = SseSession.catchup_chunks
+        ran_on = []
+
+        def slow_catchup(sess):
+            ran_on.append(threading.current_thread())
+            time.sleep(0.8)
+            return real(sess)
+
+        with mock.patch.object(SseSession, "catchup_chunks", slow_catchup):
+            with socket.create_connection(("127.0.0.1", self.port), timeout=5.0) as s:
+                s.sendall(b"GET /events HTTP/1.1\r\nHost: x\r\nLast-Event-ID: 1\r\n\r\n")
+                with s.makefile("rb") as f:
+                    while f.readline() not in (b":ok\n", b""):
+                        pass
+                    # A slow replay for one client must not stall other connections.
+                    t0 = time.monotonic()
+                    with urllib.request.urlopen(self._url("/health"), timeout=5.0) as resp:
+                        self.assertEqual(resp.status, 200)
+                    self.assertLess(time.monotonic() - t0, 0.5)
+                    ids = []
+                    while len(ids) < 2:
+                        line = f.readline()
+                        self.assertTrue(line)
+                        if line.startswith(b"data: "):
+                            ids.append(json.loads(line[len(b"data: ") :]).get("id"))
+        self.assertEqual(ids, ["c1", "c2"])
+        self.assertEqual(len(ran_on), 1)
+        self.assertIsNot(ran_on[0], self._thread)
+
+
+if __name__ == "__main__":
+    unittest.main()
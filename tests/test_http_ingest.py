@@ -1,14 +1,19 @@
+import http.client
 import json
+import socket
 import threading
+import time
 import unittest
 import urllib.error
 import urllib.request
 from http.server import ThreadingHTTPServer
 from pathlib import Path
 from typing import Any, Dict, Tuple
+from unittest import mock
 
 from codex_sidecar.http.handler import SidecarHandler
 from codex_sidecar.http.state import SidecarState
+from codex_sidecar.watch.ingest_client import HttpIngestClient
 
 
 class _FakeController:
@@ -93,6 +98,113 @@ class TestHttpIngest(unittest.TestCase):
         self.assertIsInstance(msg, dict)
         self.assertEqual(msg.get("zh"), "ZH")
 
+    def test_batch_ndjson_counts(self) -> None:
+        lines = [
+            json.dumps({"id": "a", "kind": "assistant_message", "text": "hi"}),
+            json.dumps({"op": "update", "id": "a", "zh": "ZH"}),
+            json.dumps({"id": "a", "kind": "assistant_message", "text": "hi"}),
+            "",
+            "{bad",
+            json.dumps({"id": "b", "kind": "tool_call"}),
+            json.dumps({"op": "update", "id": "missing", "zh": "x"}),
+        ]
+        body = ("\n".join(lines) + "\n").encode("utf-8")
+        st, data = _post_raw(self.port, "/ingest/batch", body, content_type="application/x-ndjson")
+        self.assertEqual(st, 200)
+        self.assertEqual(data.get("ok"), True)
+        self.assertEqual(data.get("accepted"), 2)
+        self.assertEqual(data.get("duplicate"), 1)
+        self.assertEqual(data.get("rejected"), 3)
+        self.assertEqual(data.get("errors"), [{"line": 5, "error": "invalid_json"}, {"line": 6, "error": "missing_fields"}])
+
+        msg = self.httpd.state.get_message("a")  # type: ignore[attr-defined]
+        self.assertEqual(msg.get("zh"), "ZH")
+
+    def test_batch_empty_body(self) -> None:
+        st, data = _post_raw(self.port, "/ingest/batch", b"")
+        self.assertEqual(st, 400)
+        self.assertEqual(data.get("error"), "empty_body")
+
+    def test_client_buffers_and_flushes_batch(self) -> None:
+        client = HttpIngestClient(server_url=f"http://127.0.0.1:{self.port}", batch_max=3, batch_interval_s=5.0)
+        self.assertTrue(client.ingest({"id": "x1", "kind": "tool_call", "text": "1"}))
+        self.assertTrue(client.ingest({"id": "x2", "kind": "tool_call", "text": "2"}))
+        self.assertEqual(client.stats().get("buffered"), 2)
+        self.assertIsNone(self.httpd.state.get_message("x1"))  # type: ignore[attr-defined]
+
+        # Third message hits batch_max and flushes synchronously.
+        self.assertTrue(client.ingest({"id": "x3", "kind": "tool_call", "text": "3"}))
+        self.assertEqual(client.stats().get("buffered"), 0)
+        for mid in ("x1", "x2", "x3"):
+            self.assertIsNotNone(self.httpd.state.get_message(mid))  # type: ignore[attr-defined]
+
+    def test_client_flushes_on_interval(self) -> None:
+        client = HttpIngestClient(server_url=f"http://127.0.0.1:{self.port}", batch_max=256, batch_interval_s=0.01)
+        self.assertTrue(client.ingest({"id": "t1", "kind": "tool_call", "text": "1"}))
+        deadline = time.monotonic() + 2.0
+        while time.monotonic() < deadline and self.httpd.state.get_message("t1") is None:  # type: ignore[attr-defined]
+            time.sleep(0.01)
+        self.assertIsNotNone(self.httpd.state.get_message("t1"))  # type: ignore[attr-defined]
+
+    def test_client_reports_failed_batches_and_retries(self) -> None:
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            dead_port = int(s.getsockname()[1])
+        client = HttpIngestClient(server_url=f"http://127.0.0.1:{dead_port}", batch_max=2, batch_interval_s=5.0, max_buffered=3)
+        self.assertTrue(client.ingest({"id": "r1", "kind": "tool_call", "text": "1"}))
+        # Batch send fails: still acknowledged (deferred), kept for a retry.
+        self.assertTrue(client.ingest({"id": "r2", "kind": "tool_call", "text": "2"}))
+        self.assertEqual(client.stats().get("buffered"), 2)
+        # While failing, ingest only buffers (the flusher retries); the oldest overflow is dropped.
+        self.assertTrue(client.ingest({"id": "r3", "kind": "tool_call", "text": "3"}))
+        self.assertTrue(client.ingest({"id": "r4", "kind": "tool_call", "text": "4"}))
+        self.assertEqual(client.stats().get("buffered"), 3)
+        self.assertEqual(client.stats().get("dropped"), 1)
+
+        client.server_url = f"http://127.0.0.1:{self.port}"
+        self.assertTrue(client.flush())
+        self.assertEqual(client.stats().get("buffered"), 0)
+        ids = [m.get("id") for m in self.httpd.state.list_messages()]  # type: ignore[attr-defined]
+        self.assertEqual(ids, ["r2", "r3", "r4"])
+
+    def test_client_drops_permanently_rejected_messages(self) -> None:
+        client = HttpIngestClient(server_url="http://127.0.0.1:1", batch_max=8, batch_interval_s=5.0)
+        sent = []
+
+        def fake_post(path: str, data: bytes, *, content_type: str):
+            if path == "/ingest/batch":
+                return 413
+            mid = json.loads(data).get("id")
+            sent.append(mid)
+            return 400 if mid == "bad" else 200
+
+        with mock.patch.object(client, "_post", side_effect=fake_post):
+            for mid in ("a", "bad", "b"):
+                client.ingest({"id": mid, "kind": "tool_call"})
+            # A non-retryable batch error is split per message: only the bad one is lost.
+            self.assertTrue(client.flush())
+        self.assertEqual(sent, ["a", "bad", "b"])
+        self.assertEqual(client.stats().get("buffered"), 0)
+        self.assertEqual(client.stats().get("dropped"), 1)
+
+    def test_client_per_message_mode_acks_buffered_messages(self) -> None:
+        client = HttpIngestClient(server_url="http://127.0.0.1:1", retry_interval_s=5.0)
+        statuses = [None, 400]
+        with mock.patch.object(client, "_post", side_effect=lambda *_a, **_k: statuses.pop(0)):
+            # Connection error: buffered for a retry and acknowledged.
+            self.assertTrue(client.ingest({"id": "p1", "kind": "tool_call"}))
+            self.assertEqual(client.stats().get("buffered"), 1)
+        # Rejected for good: not acknowledged.
+        client2 = HttpIngestClient(server_url="http://127.0.0.1:1")
+        with mock.patch.object(client2, "_post", return_value=400):
+            self.assertFalse(client2.ingest({"id": "p2", "kind": "tool_call"}))
+        self.assertEqual(client2.stats().get("dropped"), 1)
+
+    def test_client_treats_http_exceptions_as_transient(self) -> None:
+        client = HttpIngestClient(server_url="http://127.0.0.1:1")
+        with mock.patch("codex_sidecar.watch.ingest_client.pooled_urlopen", side_effect=http.client.IncompleteRead(b"")):
+            self.assertIsNone(client._post("/ingest", b"{}", content_type="application/json"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,179 @@
+import json
+import socket
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from unittest import mock
+
+from codex_sidecar.http.aio_server import AsyncSidecarHTTPServer
+from codex_sidecar.http.handler import SidecarHandler
+from codex_sidecar.http.state import SidecarState
+
+
+class _FakeController:
+    def get_config(self) -> dict:
+        return {}
+
+    def update_config(self, _patch: dict) -> dict:
+        return {}
+
+    def status(self) -> dict:
+        return {"ok": True}
+
+    def clear_messages(self) -> None:
+        return None
+
+
+def _read_response(f: BinaryIO) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+    """
+    Parse one Content-Length delimited response from a socket file (None on EOF).
+    """
+    line = f.readline()
+    if not line:
+        return None
+    status = int(line.split()[1])
+    headers: Dict[str, str] = {}
+    while True:
+        h = f.readline()
+        if h in (b"\r\n", b""):
+            break
+        k, _, v = h.decode("latin-1").partition(":")
+        headers[k.strip().lower()] = v.strip()
+    body = f.read(int(headers["content-length"]))
+    return status, headers, body
+
+
+def _get(path: str, extra: str = "") -> bytes:
+    return f"GET {path} HTTP/1.1\r\nHost: x\r\n{extra}\r\n".encode("latin-1")
+
+
+def _post(path: str, body: bytes) -> bytes:
+    head = f"POST {path} HTTP/1.1\r\nHost: x\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    return head.encode("latin-1") + body
+
+
+class _KeepAliveCases:
+    httpd: object
+    port: int
+
+    def _start(self) -> None:
+        raise NotImplementedError
+
+    def setUp(self) -> None:
+        self._start()
+        self.httpd.state = SidecarState(max_messages=100)  # type: ignore[attr-defined]
+        self.httpd.controller = _FakeController()  # type: ignore[attr-defined]
+        self.port = int(self.httpd.server_address[1])  # type: ignore[attr-defined]
+        t = threading.Thread(target=self.httpd.serve_forever, name="test-httpd-keepalive", daemon=True)  # type: ignore[attr-defined]
+        t.start()
+        self._thread = t
+
+    def tearDown(self) -> None:
+        try:
+            self.httpd.shutdown()  # type: ignore[attr-defined]
+            self.httpd.server_close()  # type: ignore[attr-defined]
+        except Exception:
+            pass
+        self._thread.join(timeout=2.0)
+
+    def _exchange(self, payload: bytes, *, timeout: float = 5.0) -> List[Tuple[int, Dict[str, str], bytes]]:
+        out = []
+        with socket.create_connection(("127.0.0.1", self.port), timeout=timeout) as s:
+            s.sendall(payload)
+            with s.makefile("rb") as f:
+                while True:
+                    r = _read_response(f)
+                    if r is None:
+                        break
+                    out.append(r)
+                    if r[1].get("connection", "").lower() == "close":
+                        self.assertEqual(f.read(1), b"")
+                        break
+        return out
+
+    def test_pipelined_requests_share_one_connection(self) -> None:
+        reqs = []
+        for i in range(30):
+            body = json.dumps({"id": f"m{i}", "kind": "assistant_message", "text": "x" * i}).encode("utf-8")
+            reqs.append(_post("/ingest", body))
+            reqs.append(_get("/health"))
+        # Bodies a route does not read must not be parsed as the next request.
+        reqs.append(_post("/api/control/clear", b'{"junk": "GET /health HTTP/1.1\\r\\n\\r\\n"}'))
+        reqs.append(_post("/nope", b"GET /health HTTP/1.1\r\n\r\n"))
+        reqs.append(_get("/api/messages"))
+        reqs.append(_get("/health", "Connection: close\r\n"))
+        res = self._exchange(b"".join(reqs))
+
+        self.assertEqual(len(res), 64)
+        for st, headers, body in res[:60]:
+            self.assertEqual(st, 200)
+            self.assertTrue(json.loads(body).get("ok"))
+            self.assertNotEqual(headers.get("connection", "").lower(), "close")
+        self.assertEqual(res[60][0], 200)
+        self.assertEqual(res[61][0], 404)
+        msgs = json.loads(res[62][2]).get("messages")
+        self.assertEqual([m.get("id") for m in msgs], [f"m{i}" for i in range(30)])
+        # `Connection: close` from the client: the server closes after the 64th response (EOF).
+        self.assertEqual(res[63][0], 200)
+
+    def test_error_responses_keep_connection_usable(self) -> None:
+        payload = _post("/api/config", b"{not json") + _get("/missing") + _get("/health", "Connection: close\r\n")
+        res = self._exchange(payload)
+        self.assertEqual([r[0] for r in res], [400, 404, 200])
+
+    def test_request_cap_closes_connection(self) -> None:
+        with mock.patch.object(SidecarHandler, "max_requests_per_connection", 3):
+            res = self._exchange(b"".join(_get("/health") for _ in range(5)))
+        self.assertEqual([r[0] for r in res], [200, 200, 200])
+        self.assertEqual(res[-1][1].get("connection"), "close")
+
+    def test_idle_connection_is_closed(self) -> None:
+        with mock.patch.object(SidecarHandler, "timeout", 0.3):
+            with socket.create_connection(("127.0.0.1", self.port), timeout=5.0) as s:
+                s.sendall(_get("/health"))
+                with s.makefile("rb") as f:
+                    r = _read_response(f)
+                    self.assertIsNotNone(r)
+                    t0 = time.monotonic()
+                    self.assertEqual(f.read(1), b"")
+                    self.assertLess(time.monotonic() - t0, 4.0)
+
+    def test_sse_stream_outlives_idle_timeout_with_slow_reader(self) -> None:
+        with mock.patch.object(SidecarHandler, "timeout", 0.2):
+            with socket.create_connection(("127.0.0.1", self.port), timeout=10.0) as s:
+                s.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 65536)
+                s.sendall(_get("/events"))
+                with s.makefile("rb") as f:
+                    self.assertTrue(f.readline().startswith(b"HTTP/1.1 200"))
+                    while f.readline() not in (b"\r\n", b""):
+                        pass
+                    self.assertEqual(f.readline(), b":ok\n")
+                    # The client stops reading: server writes block well past `timeout`.
+                    st = self.httpd.state  # type: ignore[attr-defined]
+                    n = 64
+                    for i in range(n):
+                        st.add({"id": f"s{i}", "kind": "assistant_message", "text": "y" * 65536})
+                    time.sleep(1.0)
+                    got = 0
+                    while got < n:
+                        line = f.readline()
+                        self.assertTrue(line, "stream closed early")
+                        if line.startswith(b"data: "):
+                            got += 1
+                    self.assertEqual(got, n)
+
+
+class TestHttpKeepAliveThreading(_KeepAliveCases, unittest.TestCase):
+    def _start(self) -> None:
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), SidecarHandler)
+
+
+class TestHttpKeepAliveAsyncio(_KeepAliveCases, unittest.TestCase):
+    def _start(self) -> None:
+        self.httpd = AsyncSidecarHTTPServer(("127.0.0.1", 0), max_workers=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from codex_sidecar.http_pool import HttpConnectionPool
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits: list = []
+
+    def log_message(self, _format: str, *_args) -> None:
+        return
+
+    def _redirect(self) -> bool:
+        if not self.path.startswith("/redir"):
+            return False
+        self.send_response(302)
+        self.send_header("Location", "/redir" if self.path == "/redir-loop" else "/x")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return True
+
+    def do_GET(self) -> None:
+        self.hits.append(("GET", self.path))
+        if self._redirect():
+            return
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or "0")
+        raw = self.rfile.read(length) if length > 0 else b""
+        self.hits.append(("POST", self.path))
+        if self._redirect():
+            return
+        status = 404 if self.path == "/missing" else 200
+        body = json.dumps({"port": self.client_address[1], "echo": raw.decode("utf-8")}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.path == "/drop":
+            # Close without "Connection: close" so the client keeps a now-stale socket.
+            self.close_connection = True
+
+
+class TestHttpPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        self.port = int(self.httpd.server_address[1])
+        t = threading.Thread(target=self.httpd.serve_forever, name="test-httpd-pool", daemon=True)
+        t.start()
+        self._thread = t
+        self.pool = HttpConnectionPool(max_per_host=2, idle_timeout_s=30.0)
+        _KeepAliveHandler.hits = []
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        try:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+        except Exception:
+            pass
+        self._thread.join(timeout=0.5)
+
+    def _post(self, path: str, data: bytes) -> dict:
+        req = urllib.request.Request(f"http://127.0.0.1:{self.port}{path}", data=data, method="POST")
+        req.add_header("Content-Type", "application/json")
+        with self.pool.urlopen(req, timeout=2.0) as resp:
+            self.assertEqual(resp.status, 200)
+            return json.loads(resp.read().decode("utf-8"))
+
+    def test_reuses_connection(self) -> None:
+        a = self._post("/x", b"1")
+        b = self._post("/x", b"2")
+        self.assertEqual(a.get("echo"), "1")
+        self.assertEqual(b.get("echo"), "2")
+        # Same client port => same TCP connection.
+        self.assertEqual(a.get("port"), b.get("port"))
+        st = self.pool.stats()
+        self.assertEqual(st.get("created"), 1)
+        self.assertEqual(st.get("reused"), 1)
+
+    def test_stale_socket_is_retried(self) -> None:
+        self._post("/drop", b"1")
+        time.sleep(0.05)
+        out = self._post("/x", b"2")
+        self.assertEqual(out.get("echo"), "2")
+        st = self.pool.stats()
+        self.assertEqual(st.get("created"), 2)
+        self.assertEqual(st.get("stale_retries"), 1)
+
+    def test_http_error_is_urllib_compatible(self) -> None:
+        req = urllib.request.Request(f"http://127.0.0.1:{self.port}/missing", data=b"{}", method="POST")
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            self.pool.urlopen(req, timeout=2.0)
+        self.assertEqual(cm.exception.code, 404)
+        self.assertIn(b"echo", cm.exception.read())
+        # The connection is still reusable after an error response.
+        self._post("/x", b"3")
+        self.assertEqual(self.pool.stats().get("created"), 1)
+
+    def test_connection_refused_raises_url_error(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        req = urllib.request.Request(f"http://127.0.0.1:{self.port}/x", data=b"{}", method="POST")
+        with self.assertRaises(urllib.error.URLError):
+            self.pool.urlopen(req, timeout=1.0)
+
+    def test_post_redirect_is_not_resent(self) -> None:
+        req = urllib.request.Request(f"http://127.0.0.1:{self.port}/redir", data=b"{}", method="POST")
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            self.pool.urlopen(req, timeout=2.0)
+        self.assertEqual(cm.exception.code, 302)
+        self.assertEqual(_KeepAliveHandler.hits, [("POST", "/redir")])
+
+    def test_get_redirect_is_followed_once(self) -> None:
+        req = urllib.request.Request(f"http://127.0.0.1:{self.port}/redir")
+        with self.pool.urlopen(req, timeout=2.0) as resp:
+            self.assertEqual(resp.status, 200)
+            self.assertTrue(resp.geturl().endswith("/x"))
+        with self.assertRaises(urllib.error.HTTPError):
+            self.pool.urlopen(urllib.request.Request(f"http://127.0.0.1:{self.port}/redir-loop"), timeout=2.0)
+        self.assertEqual(
+            _KeepAliveHandler.hits,
+            [("GET", "/redir"), ("GET", "/x"), ("GET", "/redir-loop"), ("GET", "/redir")],
+        )
+
+    def test_acquire_times_out_when_host_is_saturated(self) -> None:
+        pool = HttpConnectionPool(max_per_host=1)
+        key = ("http", "127.0.0.1", self.port)
+        conn, _ = pool._acquire(key, 1.0)
+        try:
+            t0 = time.monotonic()
+            with self.assertRaises(TimeoutError):
+                pool._acquire(key, 0.1)
+            self.assertLess(time.monotonic() - t0, 1.0)
+            self.assertEqual(pool.stats().get("active"), 1)
+        finally:
+            pool._release(key, conn, keep=False)
+        # A released slot is handed to the next caller.
+        conn2, _ = pool._acquire(key, 0.1)
+        pool._release(key, conn2, keep=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
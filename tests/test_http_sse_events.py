@@ -1,6 +1,7 @@
 import json
 import threading
 import unittest
+import urllib.error
 import urllib.request
 from http.server import ThreadingHTTPServer
 
@@ -104,6 +105,77 @@ class TestHttpSseEvents(unittest.TestCase):
             obj2 = json.loads(payload2)
             self.assertEqual(obj2.get("id"), "m2")
 
+    def test_events_stream_delta_updates(self) -> None:
+        self.httpd.state.add({"id": "m1", "kind": "reasoning_summary", "thread_id": "t1", "text": "long text"})  # type: ignore[attr-defined]
+        url = f"http://127.0.0.1:{int(self.port)}/events?delta=1"
+        with urllib.request.urlopen(urllib.request.Request(url, method="GET"), timeout=2.0) as resp:
+            self.assertEqual(resp.readline(), b":ok\n")
+            self.assertEqual(resp.readline(), b"\n")
+            self.httpd.state.update({"op": "update", "id": "m1", "zh": "译文"})  # type: ignore[attr-defined]
+            self.assertEqual(resp.readline(), b"event: message\n")
+            data_line = resp.readline()
+            obj = json.loads(data_line[len(b"data: ") :].decode("utf-8"))
+            self.assertEqual(obj.get("op"), "update")
+            self.assertEqual(obj.get("zh"), "译文")
+            self.assertEqual(obj.get("thread_id"), "t1")
+            self.assertNotIn("text", obj)
+
+    def test_events_stream_batch_frame_on_resume(self) -> None:
+        st = self.httpd.state  # type: ignore[attr-defined]
+        for i in range(4):
+            st.add({"id": f"b{i}", "kind": "assistant", "text": str(i)})
+        url = f"http://127.0.0.1:{int(self.port)}/events?batch=1"
+        req = urllib.request.Request(url, method="GET", headers={"Last-Event-ID": "1"})
+        with urllib.request.urlopen(req, timeout=2.0) as resp:
+            self.assertEqual(resp.readline(), b":ok\n")
+            self.assertEqual(resp.readline(), b"\n")
+            self.assertEqual(resp.readline(), b"id: 4\n")
+            self.assertEqual(resp.readline(), b"event: batch\n")
+            data_line = resp.readline()
+            arr = json.loads(data_line[len(b"data: ") :].decode("utf-8"))
+            self.assertEqual([m.get("id") for m in arr], ["b1", "b2", "b3"])
+
+    def test_events_stream_filtered_by_thread_and_control_endpoint(self) -> None:
+        st = self.httpd.state  # type: ignore[attr-defined]
+        url = f"http://127.0.0.1:{int(self.port)}/events?sid=tab1&threads=t1"
+        with urllib.request.urlopen(urllib.request.Request(url, method="GET"), timeout=2.0) as resp:
+            self.assertEqual(resp.readline(), b":ok\n")
+            self.assertEqual(resp.readline(), b"\n")
+            st.add({"id": "x1", "kind": "assistant", "thread_id": "t2", "text": "other"})
+            st.add({"id": "y1", "kind": "assistant", "thread_id": "t1", "text": "mine"})
+            resp.readline()  # id:
+            self.assertEqual(resp.readline(), b"event: message\n")
+            obj = json.loads(resp.readline()[len(b"data: ") :].decode("utf-8"))
+            self.assertEqual(obj.get("id"), "y1")
+            resp.readline()
+
+            body = json.dumps({"sid": "tab1", "threads": ["t2"]}).encode("utf-8")
+            ctl = urllib.request.Request(
+                f"http://127.0.0.1:{int(self.port)}/api/control/events_filter",
+                data=body,
+                method="POST",
+                headers={"Content-Type": "application/json"},
+            )
+            with urllib.request.urlopen(ctl, timeout=2.0) as r:
+                self.assertEqual(json.loads(r.read().decode("utf-8")).get("subscriptions"), 1)
+
+            st.add({"id": "y2", "kind": "assistant", "thread_id": "t1", "text": "mine"})
+            st.add({"id": "x2", "kind": "assistant", "thread_id": "t2", "text": "other"})
+            resp.readline()
+            self.assertEqual(resp.readline(), b"event: message\n")
+            obj = json.loads(resp.readline()[len(b"data: ") :].decode("utf-8"))
+            self.assertEqual(obj.get("id"), "x2")
+
+        bad = urllib.request.Request(
+            f"http://127.0.0.1:{int(self.port)}/api/control/events_filter",
+            data=json.dumps({"sid": "nope"}).encode("utf-8"),
+            method="POST",
+            headers={"Content-Type": "application/json"},
+        )
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            urllib.request.urlopen(bad, timeout=2.0)
+        self.assertEqual(cm.exception.code, 404)
+
 
 if __name__ == "__main__":
     unittest.main()
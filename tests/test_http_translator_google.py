@@ -36,7 +36,7 @@ class TestHttpTranslatorGoogle(unittest.TestCase):
             timeout_s=9.0,
             auth_token="SHOULD_NOT_BE_SENT",
         )
-        with patch("codex_sidecar.translators.http.urllib.request.urlopen", _urlopen):
+        with patch("codex_sidecar.translators.http.pooled_urlopen", _urlopen):
             out = tr.translate("Hello world!")
 
         self.assertEqual(out, "你好世界！")
@@ -67,7 +67,7 @@ class TestHttpTranslatorGoogle(unittest.TestCase):
             return _FakeResp(body)
 
         tr = HttpTranslator(url="https://translate.googleapis.com/translate_a/single?sl=auto&tl=zh-CN", timeout_s=9.0)
-        with patch("codex_sidecar.translators.http.urllib.request.urlopen", _urlopen):
+        with patch("codex_sidecar.translators.http.pooled_urlopen", _urlopen):
             out = tr.translate("Hello world!")
 
         self.assertEqual(out, "你好世界")
@@ -82,7 +82,7 @@ class TestHttpTranslatorGoogle(unittest.TestCase):
 
         tr = HttpTranslator(url="https://translate.googleapis.com/translate_a/single?sl=auto&tl=zh-CN", timeout_s=9.0)
         long = "x" * 2000
-        with patch("codex_sidecar.translators.http.urllib.request.urlopen", _urlopen):
+        with patch("codex_sidecar.translators.http.pooled_urlopen", _urlopen):
             out = tr.translate(long)
 
         self.assertEqual(out, "OK")
@@ -128,7 +128,7 @@ class TestHttpTranslatorGoogle(unittest.TestCase):
             timeout_s=9.0,
             profile_name="googlefree",
         )
-        with patch("codex_sidecar.translators.http.urllib.request.urlopen", _urlopen):
+        with patch("codex_sidecar.translators.http.pooled_urlopen", _urlopen):
             out = tr.translate(md)
 
         expect = (
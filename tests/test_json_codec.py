@@ -0,0 +1,41 @@
+import json
+import unittest
+from pathlib import Path
+
+from codex_sidecar import json_codec
+
+_FIXTURE = Path(__file__).parent / "fixtures" / "rollout_sample.jsonl"
+
+
+class TestJsonCodec(unittest.TestCase):
+    def test_backends_match_stdlib_semantics(self) -> None:
+        names = json_codec.available_backends()
+        self.assertIn("stdlib", names)
+        self.assertIn(json_codec.BACKEND, names)
+        lines = [ln for ln in _FIXTURE.read_bytes().split(b"\n") if ln]
+        for name in names:
+            dumps, loads = json_codec.get_backend(name)
+            with self.subTest(backend=name):
+                self.assertEqual(dumps({"a": "中文", "b": [1, None, True]}), '{"a":"中文","b":[1,null,true]}'.encode("utf-8"))
+                self.assertEqual(loads(dumps({1: "x"})), {"1": "x"})
+                self.assertEqual(loads(dumps({"n": 1 << 70})), {"n": 1 << 70})
+                # Invalid UTF-8 decodes with replacement (as the old call sites did).
+                self.assertEqual(loads(b'{"t":"a\xffb"}'), {"t": "a�b"})
+                with self.assertRaises(ValueError):
+                    loads(b'{"t":')
+                for ln in lines:
+                    try:
+                        want = json.loads(ln.decode("utf-8", errors="replace"))
+                    except ValueError:
+                        with self.assertRaises(ValueError):
+                            loads(ln)
+                        continue
+                    self.assertEqual(loads(ln), want)
+                    self.assertEqual(json.loads(dumps(want)), want)
+
+    def test_unknown_backend(self) -> None:
+        self.assertIsNone(json_codec.get_backend("nope"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from codex_sidecar.offline import build_offline_messages
+from codex_sidecar.watch.line_index import read_indexed_lines, update_line_index
+from codex_sidecar.watch.session_catalog import SessionCatalog
+
+
+def _lines(n: int, start: int = 0):
+    return [f'{{"n":{i},"pad":"{"x" * (i % 17)}"}}'.encode() for i in range(start, start + n)]
+
+
+class TestLineIndex(unittest.TestCase):
+    def test_random_access_matches_file_and_extends_incrementally(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "r.jsonl"
+            want = _lines(1000)
+            p.write_bytes(b"\n".join(want) + b"\n" + b'{"partial"')
+            idx, changed = update_line_index(p, None, stride=16)
+            self.assertTrue(changed)
+            self.assertEqual(idx.lines, 1000)
+            self.assertEqual(len(idx.offsets), 1000 // 16 + 1)
+            for start, count in ((0, 5), (15, 3), (16, 16), (500, 37), (990, 50), (1000, 5)):
+                self.assertEqual(read_indexed_lines(p, idx, start, count), want[start : start + count])
+
+            # Partial line completes + more lines: only the new bytes are scanned.
+            more = _lines(40, start=1001)
+            with open(p, "ab") as f:
+                f.write(b":1}\n" + b"\n".join(more) + b"\n")
+            idx2, changed = update_line_index(p, idx, stride=16)
+            self.assertTrue(changed)
+            self.assertEqual(idx2.lines, 1041)
+            full = want + [b'{"partial":1}'] + more
+            self.assertEqual(read_indexed_lines(p, idx2, 995, 100), full[995:])
+            self.assertEqual(read_indexed_lines(p, idx2, 1024, 2), full[1024:1026])
+            self.assertFalse(update_line_index(p, idx2, stride=16)[1])
+
+            # Replaced (shorter) file: rebuilt from scratch.
+            p.write_bytes(b"a\nb\n")
+            idx3, _ = update_line_index(p, idx2, stride=16)
+            self.assertEqual(idx3.lines, 2)
+            self.assertEqual(read_indexed_lines(p, idx3, 0, 10), [b"a", b"b"])
+
+    def test_catalog_persists_index_and_offline_uses_it(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            home = Path(td) / "codex"
+            p = home / "sessions" / "2026" / "01" / "01" / "rollout-2026-01-01T00-00-00-00000000-0000-0000-0000-000000000001.jsonl"
+            p.parent.mkdir(parents=True)
+            rows = [
+                {"type": "event_msg", "payload": {"type": "user_message", "message": f"m{i}"}} for i in range(600)
+            ]
+            p.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+            cat = SessionCatalog(Path(td) / "cat.sqlite3", home)
+            try:
+                idx = cat.line_index(p)
+                self.assertEqual(idx.lines, 600)
+                loaded = cat.load_line_index(str(p))
+                self.assertEqual((loaded.lines, list(loaded.offsets)), (600, list(idx.offsets)))
+
+                msgs = build_offline_messages(
+                    rel="sessions/2026/01/01/" + p.name, file_path=p, tail_lines=3, offline_key="", catalog=cat
+                )
+                self.assertEqual([m["text"] for m in msgs], ["m597", "m598", "m599"])
+                self.assertEqual([m["line"] for m in msgs], [598, 599, 600])
+                plain = build_offline_messages(rel="sessions/2026/01/01/" + p.name, file_path=p, tail_lines=3, offline_key="")
+                self.assertEqual([m["id"] for m in plain], [m["id"] for m in msgs])
+            finally:
+                cat.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
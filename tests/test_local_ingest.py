@@ -0,0 +1,54 @@
+import threading
+import unittest
+
+from codex_sidecar.http.state import SidecarState
+from codex_sidecar.watch.local_ingest import LocalIngestClient
+
+
+class _BlockingState:
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.added = []
+
+    def add(self, msg: dict) -> None:
+        self.release.wait(timeout=2.0)
+        self.added.append(msg)
+
+
+class TestLocalIngest(unittest.TestCase):
+    def test_add_then_update_applied_in_order(self) -> None:
+        st = SidecarState(max_messages=10)
+        sink = LocalIngestClient(st)
+        try:
+            self.assertTrue(sink.ingest({"id": "a", "kind": "reasoning_summary", "text": "hi"}))
+            self.assertTrue(sink.ingest({"op": "update", "id": "a", "zh": "ZH"}))
+            self.assertTrue(sink.flush(timeout_s=2.0))
+            msg = st.get_message("a")
+            self.assertIsInstance(msg, dict)
+            self.assertEqual(msg.get("zh"), "ZH")
+            self.assertEqual(msg.get("seq"), 1)
+            stats = sink.stats()
+            self.assertEqual(stats.get("accepted"), 2)
+            self.assertEqual(stats.get("applied"), 2)
+        finally:
+            sink.close()
+
+    def test_full_queue_applies_backpressure_then_rejects(self) -> None:
+        st = _BlockingState()
+        sink = LocalIngestClient(st, max_queue=16, put_timeout_s=0.01)
+        try:
+            ok = [sink.ingest({"id": str(i), "kind": "tool_call", "text": "x"}) for i in range(40)]
+            self.assertIn(False, ok)
+            self.assertGreater(sink.stats().get("dropped"), 0)
+        finally:
+            st.release.set()
+            sink.close()
+
+    def test_closed_sink_rejects(self) -> None:
+        sink = LocalIngestClient(SidecarState(max_messages=10))
+        sink.close()
+        self.assertFalse(sink.ingest({"id": "a", "kind": "tool_call", "text": "x"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
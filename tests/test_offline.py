@@ -3,7 +3,12 @@ import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
-from codex_sidecar.offline import build_offline_messages, offline_key_from_rel, resolve_offline_rollout_path
+from codex_sidecar.offline import (
+    build_offline_messages,
+    offline_key_from_rel,
+    page_offline_messages,
+    resolve_offline_rollout_path,
+)
 
 
 class TestOffline(unittest.TestCase):
@@ -63,6 +68,34 @@ class TestOffline(unittest.TestCase):
             self.assertEqual(m.get("kind"), "user_message")
             self.assertEqual(m.get("text"), "hi")
 
+    def test_page_offline_messages_line_cursors(self) -> None:
+        with TemporaryDirectory() as td:
+            p = Path(td) / "sessions" / "2026" / "01" / "20"
+            p.mkdir(parents=True, exist_ok=True)
+            name = "rollout-2026-01-20T23-44-00-01234567-89ab-cdef-0123-456789abcdef.jsonl"
+            file_path = p / name
+            rows = [{"type": "event_msg", "payload": {"type": "user_message", "message": f"m{i}"}} for i in range(1, 11)]
+            file_path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+            rel = "sessions/2026/01/20/" + name
+
+            page = page_offline_messages(rel=rel, file_path=file_path, offline_key="", limit=4)
+            self.assertEqual([m["text"] for m in page["messages"]], ["m7", "m8", "m9", "m10"])
+            self.assertEqual((page["prev"], page["next"], page["lines"]), (7, None, 10))
+
+            older = page_offline_messages(rel=rel, file_path=file_path, offline_key="", before=page["prev"], limit=4)
+            self.assertEqual([m["line"] for m in older["messages"]], [3, 4, 5, 6])
+            self.assertEqual((older["prev"], older["next"]), (3, 6))
+            # seq is line-based so rows from separate pages keep one ordering.
+            self.assertLess(older["messages"][-1]["seq"], page["messages"][0]["seq"])
+
+            first = page_offline_messages(rel=rel, file_path=file_path, offline_key="", before=older["prev"], limit=4)
+            self.assertEqual([m["line"] for m in first["messages"]], [1, 2])
+            self.assertIsNone(first["prev"])
+
+            newer = page_offline_messages(rel=rel, file_path=file_path, offline_key="", after=8, limit=4)
+            self.assertEqual([m["line"] for m in newer["messages"]], [9, 10])
+            self.assertIsNone(newer["next"])
+
 
 if __name__ == "__main__":
     unittest.main()
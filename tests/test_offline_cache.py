@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from codex_sidecar.offline import build_offline_messages, page_offline_messages
+from codex_sidecar.offline_cache import OfflineParseCache, offline_parse_cache
+
+
+def _row(i: int) -> str:
+    return json.dumps({"type": "event_msg", "payload": {"type": "user_message", "message": f"m{i}"}}) + "\n"
+
+
+class TestOfflineParseCache(unittest.TestCase):
+    def _parser(self, calls):
+        def _parse(lines, first_line_no):
+            calls.append((first_line_no, len(lines)))
+            return [{"line": first_line_no + i, "text": b.decode(), "id": str(first_line_no + i)} for i, b in enumerate(lines)]
+
+        return _parse
+
+    def test_hit_extend_prepend_and_rebuild(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "r.jsonl"
+            p.write_text("".join(f"{i}\n" for i in range(1, 101)), encoding="utf-8")
+            cache = OfflineParseCache()
+            calls = []
+            tail = lambda n: (lambda total: (max(0, total - n), total))  # noqa: E731
+
+            msgs, s, e, total = cache.get(p, tag="k", parse=self._parser(calls), resolve=tail(10))
+            self.assertEqual(([m["line"] for m in msgs][:2], s, e, total), ([91, 92], 90, 100, 100))
+            self.assertEqual(calls, [(91, 10)])
+
+            # Unchanged file: served without parsing.
+            cache.get(p, tag="k", parse=self._parser(calls), resolve=tail(10))
+            self.assertEqual(len(calls), 1)
+
+            # Appended lines: only the new ones are parsed.
+            with open(p, "a", encoding="utf-8") as f:
+                f.write("101\n102\n")
+            msgs, _, _, total = cache.get(p, tag="k", parse=self._parser(calls), resolve=tail(10))
+            self.assertEqual(calls[-1], (101, 2))
+            self.assertEqual((msgs[-1]["text"], total), ("102", 102))
+
+            # Older page: only the missing lines are parsed, then it is a hit.
+            msgs, s, e, _ = cache.get(p, tag="k", parse=self._parser(calls), resolve=lambda total: (80, 95))
+            self.assertEqual(calls[-1], (81, 10))
+            self.assertEqual(([m["line"] for m in msgs][0], [m["line"] for m in msgs][-1]), (81, 95))
+            n_calls = len(calls)
+            cache.get(p, tag="k", parse=self._parser(calls), resolve=lambda total: (85, 90))
+            self.assertEqual(len(calls), n_calls)
+            st = cache.stats()
+            self.assertEqual((st["misses"], st["extends"], st["hits"]), (1, 2, 2))
+
+            # Replaced file (new inode): rebuilt.
+            q = Path(td) / "new.jsonl"
+            q.write_text("a\nb\n", encoding="utf-8")
+            os.replace(q, p)
+            msgs, _, _, total = cache.get(p, tag="k", parse=self._parser(calls), resolve=tail(10))
+            self.assertEqual(([m["text"] for m in msgs], total), (["a", "b"], 2))
+
+    def test_budget_evicts_least_recently_used(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            files = []
+            for n in range(3):
+                p = Path(td) / f"{n}.jsonl"
+                p.write_text("x\n" * 10, encoding="utf-8")
+                files.append(p)
+            cache = OfflineParseCache(max_bytes=12 * 1000)
+            calls = []
+            for p in files:
+                cache.get(p, tag="k", parse=self._parser(calls), resolve=lambda total: (0, total))
+            st = cache.stats()
+            self.assertEqual((st["entries"], st["evictions"]), (2, 1))
+            self.assertLessEqual(st["bytes"], st["max_bytes"])
+            cache.set_budget(0)
+            self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_offline_apis_share_cached_parse(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            d = Path(td) / "sessions" / "2026" / "01" / "20"
+            d.mkdir(parents=True)
+            p = d / "rollout-2026-01-20T23-44-00-01234567-89ab-cdef-0123-456789abcdef.jsonl"
+            p.write_text("".join(_row(i) for i in range(1, 51)), encoding="utf-8")
+            rel = "sessions/2026/01/20/" + p.name
+            cache = offline_parse_cache()
+            before = cache.stats()
+            tail = build_offline_messages(rel=rel, file_path=p, tail_lines=5, offline_key="")
+            self.assertEqual([m["line"] for m in tail], [46, 47, 48, 49, 50])
+            page = page_offline_messages(rel=rel, file_path=p, offline_key="", limit=5)
+            self.assertEqual([m["id"] for m in page["messages"]], [m["id"] for m in tail])
+            # Callers get copies: mutating a result does not leak into the cache.
+            tail[0]["zh"] = "x"
+            again = build_offline_messages(rel=rel, file_path=p, tail_lines=5, offline_key="")
+            self.assertEqual(again[0]["zh"], "")
+            after = cache.stats()
+            self.assertEqual(after["misses"] - before["misses"], 1)
+            self.assertEqual(after["hits"] - before["hits"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from codex_sidecar.watch.pid_watch import PidWatch, pidfd_supported
+from codex_sidecar.watch.rollout_watcher import RolloutWatcher
+
+
+class _FakeIngest:
+    def ingest(self, _msg: dict) -> bool:
+        return True
+
+
+class _FakeTranslator:
+    def translate(self, _text: str) -> str:
+        return ""
+
+
+def _sleeper() -> "subprocess.Popen[bytes]":
+    return subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+
+
+@unittest.skipUnless(pidfd_supported(), "os.pidfd_open unavailable")
+class TestPidWatch(unittest.TestCase):
+    def test_exit_wakes_wait_and_stops_tracking(self) -> None:
+        pw = PidWatch()
+        proc = _sleeper()
+        try:
+            pw.sync([proc.pid, 0])
+            self.assertEqual(pw.pids(), [proc.pid])
+            self.assertEqual(pw.wait(0.01), [])
+            threading.Timer(0.1, proc.kill).start()
+            t0 = time.monotonic()
+            self.assertEqual(pw.wait(10.0), [proc.pid])
+            self.assertLess(time.monotonic() - t0, 5.0)
+            self.assertFalse(pw.active())
+        finally:
+            proc.kill()
+            proc.wait()
+            pw.close()
+
+    def test_sync_closes_untracked_and_wake_interrupts(self) -> None:
+        pw = PidWatch()
+        a, b = _sleeper(), _sleeper()
+        try:
+            pw.sync([a.pid, b.pid])
+            pw.sync([b.pid])
+            self.assertEqual(pw.pids(), [b.pid])
+            threading.Timer(0.1, pw.wake).start()
+            t0 = time.monotonic()
+            self.assertEqual(pw.wait(10.0), [])
+            self.assertLess(time.monotonic() - t0, 5.0)
+        finally:
+            for p in (a, b):
+                p.kill()
+                p.wait()
+            pw.close()
+
+    def test_wait_does_not_spin_on_a_stale_pidfd(self) -> None:
+        pw = PidWatch()
+        a = _sleeper()
+        try:
+            pw.sync([a.pid])
+            # The pidfd gets closed behind PidWatch's back (invalid fd in the poll set).
+            os.close(pw.fds()[0])
+            t0 = time.monotonic()
+            self.assertEqual(pw.wait(0.3), [])
+            self.assertGreaterEqual(time.monotonic() - t0, 0.25)
+        finally:
+            a.kill()
+            a.wait()
+            pw._fd_by_pid.clear()
+            pw._pid_by_fd.clear()
+            pw.close()
+
+    def test_watcher_rescans_when_tracked_codex_exits(self) -> None:
+        with TemporaryDirectory() as td:
+            w = RolloutWatcher(
+                codex_home=Path(td),
+                ingest=_FakeIngest(),
+                translator=_FakeTranslator(),
+                replay_last_lines=0,
+                watch_max_sessions=3,
+                translate_mode="auto",
+                poll_interval_s=0.5,
+                file_scan_interval_s=30.0,
+                fs_events=False,
+            )
+            proc = _sleeper()
+            try:
+                w._codex_candidate_pids = [proc.pid]
+                w._codex_detected = True
+                w._follow_mode = "process"
+                w._track_codex_pids()
+                w._last_file_scan_ts = time.time()
+                threading.Timer(0.1, proc.kill).start()
+                t0 = time.monotonic()
+                w._wait_next_tick(threading.Event())
+                self.assertLess(time.monotonic() - t0, 5.0)
+                self.assertEqual(w._last_file_scan_ts, 0.0)
+            finally:
+                proc.kill()
+                proc.wait()
+                w._pid_watch.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+import os
+import re
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Optional, Tuple
+
+from codex_sidecar.watch import proc_table
+from codex_sidecar.watch.follow_picker import FollowPicker
+from codex_sidecar.watch.proc_table import FdTable, ProcTable
+
+
+class _FakeProc:
+    def __init__(self) -> None:
+        # pid -> (ppid, starttime, argv0)
+        self.procs: Dict[int, Tuple[int, int, str]] = {}
+        self.uptime = 1000.0
+        self.reads: List[int] = []
+
+    def list_pids(self) -> List[int]:
+        return list(self.procs)
+
+    def read_stat(self, pid: int) -> Optional[Tuple[int, int]]:
+        p = self.procs.get(pid)
+        return (p[0], p[1]) if p else None
+
+    def argv0(self, pid: int) -> str:
+        self.reads.append(pid)
+        p = self.procs.get(pid)
+        return p[2] if p else ""
+
+    def table(self) -> ProcTable:
+        return ProcTable(
+            list_pids=self.list_pids,
+            read_stat=self.read_stat,
+            read_exe_basename=lambda _pid: "",
+            read_argv0_basename=self.argv0,
+            read_uptime_s=lambda: self.uptime,
+        )
+
+
+_OLD = 100  # starttime ticks: ~999s old at uptime=1000
+
+
+class TestProcTable(unittest.TestCase):
+    def test_only_new_pids_are_examined_and_dead_pids_pruned(self) -> None:
+        f = _FakeProc()
+        f.procs = {1: (0, _OLD, "init"), 10: (1, _OLD, "bash"), 11: (10, _OLD, "codex"), 12: (11, _OLD, "node")}
+        t = f.table()
+        pat = re.compile("codex")
+        t.refresh(pat)
+        self.assertEqual(t.matching(), [11])
+        self.assertEqual(t.tree([11]), [11, 12])
+        f.reads.clear()
+        t.refresh(pat)
+        self.assertEqual(f.reads, [])  # nothing new; matched pid only revalidated via stat
+        f.procs[13] = (11, _OLD, "rg")
+        del f.procs[12]
+        t.refresh(pat)
+        self.assertEqual(f.reads, [13])
+        self.assertEqual(t.tree([11]), [11, 13])
+        st = t.stats()
+        self.assertEqual((st["pids"], st["new"], st["gone"]), (4, 1, 1))
+
+    def test_pid_reuse_detected_by_starttime(self) -> None:
+        f = _FakeProc()
+        f.procs = {20: (1, _OLD, "codex"), 21: (20, _OLD, "sh")}
+        t = f.table()
+        pat = re.compile("codex")
+        t.refresh(pat)
+        self.assertEqual(t.matching(), [20])
+        f.procs[20] = (1, _OLD + 50, "vim")
+        t.refresh(pat)
+        self.assertEqual(t.matching(), [])
+        self.assertEqual(t.tree([20]), [20])
+
+    def test_young_process_rechecked_after_exec(self) -> None:
+        f = _FakeProc()
+        f.procs = {30: (1, _OLD, "bash"), 31: (30, int(999.5 * 100), "bash")}
+        t = f.table()
+        pat = re.compile("codex")
+        t.refresh(pat)
+        self.assertEqual(t.matching(), [])
+        f.procs[31] = (30, int(999.5 * 100), "codex")  # exec'd after fork
+        f.uptime = 1003.0
+        t.refresh(pat)
+        self.assertEqual(t.matching(), [31])
+        f.reads.clear()
+        t.refresh(pat)
+        self.assertEqual(f.reads, [])
+
+    def test_pattern_change_rematches_cached_entries(self) -> None:
+        f = _FakeProc()
+        f.procs = {40: (1, _OLD, "codex"), 41: (1, _OLD, "codex-dev")}
+        t = f.table()
+        t.refresh(re.compile("codex"))
+        self.assertEqual(t.matching(exclude_pid=99), [40])
+        t.refresh(re.compile("codex.*"))
+        self.assertEqual(t.matching(exclude_pid=40), [41])
+
+
+class _FakeFds:
+    def __init__(self) -> None:
+        self.fds: Dict[int, Dict[str, str]] = {}
+        self.links: List[Tuple[int, str]] = []
+        self.infos: List[Tuple[int, str]] = []
+
+    def table(self) -> FdTable:
+        return FdTable(
+            list_fds=lambda pid: list(self.fds[pid]) if pid in self.fds else None,
+            read_link=self._link,
+            read_flags=self._flags,
+        )
+
+    def _link(self, pid: int, fd: str) -> str:
+        self.links.append((pid, fd))
+        return self.fds.get(pid, {}).get(fd, "")
+
+    def _flags(self, pid: int, fd: str) -> int:
+        self.infos.append((pid, fd))
+        return os.O_WRONLY
+
+
+def _want(target: str) -> bool:
+    return target.endswith(".jsonl")
+
+
+class TestFdTable(unittest.TestCase):
+    def test_only_new_fds_readlinked_and_fdinfo_only_for_matches(self) -> None:
+        f = _FakeFds()
+        f.fds = {7: {str(i): f"socket:[{i}]" for i in range(50)}}
+        f.fds[7]["60"] = "/h/sessions/rollout-a.jsonl"
+        t = f.table()
+        self.assertEqual(t.scan([7], _want), {7: [("/h/sessions/rollout-a.jsonl", os.O_WRONLY)]})
+        self.assertEqual(len(f.links), 51)
+        self.assertEqual(f.infos, [(7, "60")])
+        f.links.clear()
+        f.fds[7]["61"] = "/h/sessions/rollout-b.jsonl"
+        out = t.scan([7], _want)
+        self.assertEqual(sorted(x[0] for x in out[7]), ["/h/sessions/rollout-a.jsonl", "/h/sessions/rollout-b.jsonl"])
+        # The new fd plus the cached rollout fd (rechecked every scan).
+        self.assertEqual(sorted(f.links), [(7, "60"), (7, "61")])
+        self.assertEqual(t.stats()["fds"], 52)
+
+    def test_closed_rollout_fd_and_dead_pid_dropped(self) -> None:
+        f = _FakeFds()
+        f.fds = {7: {"3": "/h/sessions/rollout-a.jsonl"}, 8: {"3": "/h/sessions/rollout-c.jsonl"}}
+        t = f.table()
+        self.assertEqual(sorted(t.scan([7, 8], _want)), [7, 8])
+        f.fds[7]["3"] = "/dev/null"  # fd number reused for something else
+        del f.fds[8]
+        self.assertEqual(t.scan([7, 8], _want), {})
+        self.assertEqual(t.scan([7], _want), {})
+        self.assertEqual(t.stats()["pids"], 1)
+
+    def test_periodic_full_revalidation_catches_reused_fd_numbers(self) -> None:
+        f = _FakeFds()
+        f.fds = {7: {"3": "/tmp/x.log"}}
+        t = f.table()
+        t.scan([7], _want)
+        f.fds[7]["3"] = "/h/sessions/rollout-new.jsonl"
+        found = None
+        for i in range(proc_table._FD_FULL_SCAN_EVERY):
+            out = t.scan([7], _want)
+            if out:
+                found = i
+                break
+        self.assertIsNotNone(found)
+
+    def test_requested_full_scan_catches_reused_fd_number_immediately(self) -> None:
+        f = _FakeFds()
+        f.fds = {7: {"3": "/tmp/x.log", "4": "socket:[1]"}}
+        t = f.table()
+        t.scan([7], _want)
+        # Same fd-number set: Codex closed fd 3 and opened its new rollout on it.
+        f.fds[7]["3"] = "/h/sessions/rollout-new.jsonl"
+        self.assertEqual(t.scan([7], _want), {})
+        t.request_full_scan()
+        f.links.clear()
+        self.assertEqual(t.scan([7], _want), {7: [("/h/sessions/rollout-new.jsonl", os.O_WRONLY)]})
+        self.assertEqual(sorted(f.links), [(7, "3"), (7, "4")])
+        self.assertEqual(t.stats()["full"], 1)
+        # One-shot: the following scan is incremental again (only the rollout fd is rechecked).
+        f.links.clear()
+        t.scan([7], _want)
+        self.assertEqual(f.links, [(7, "3")])
+
+    @unittest.skipUnless(os.path.isdir("/proc/self/fd"), "requires procfs")
+    def test_follow_picker_finds_rollout_opened_by_self(self) -> None:
+        with TemporaryDirectory() as td:
+            home = Path(td)
+            d = home / "sessions" / "2026" / "01" / "01"
+            d.mkdir(parents=True)
+            fp = d / "rollout-2026-01-01T00-00-00-11111111-1111-1111-1111-111111111111.jsonl"
+            fp.write_bytes(b"")
+            picker = FollowPicker(home, follow_codex_process=True, codex_process_regex="codex", only_follow_when_process=True)
+            with open(fp, "ab"), open(d / "other.txt", "wb"):
+                files, openers = picker._find_rollout_opened_by_pids([os.getpid()])
+                files2, _ = picker._find_rollout_opened_by_pids([os.getpid()])
+            self.assertEqual(files, [fp.resolve()])
+            self.assertEqual(files2, files)
+            self.assertEqual(openers, [os.getpid()])
+            st = picker.proc_stats()["fds"]
+            self.assertEqual(st["fdinfo_reads"], 1)
+            self.assertLess(st["readlinks"], st["fds"])
+
+
+if __name__ == "__main__":
+    unittest.main()
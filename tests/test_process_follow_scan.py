@@ -3,11 +3,9 @@ import re
 import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Iterable, List, Optional, Tuple
+from typing import Iterable, Tuple
 
 from codex_sidecar.watch.process_follow_scan import (
-    collect_process_tree,
-    detect_processes,
     find_rollout_opened_by_pids,
     pid_matches_regex,
 )
@@ -33,50 +31,6 @@ class TestProcessFollowScan(unittest.TestCase):
             )
         )
 
-    def test_detect_processes_excludes_self_and_honors_limit(self) -> None:
-        pat = re.compile("codex", flags=re.IGNORECASE)
-
-        def _list() -> List[int]:
-            return [1, 2, 3]
-
-        def _exe(_pid: int) -> str:
-            return ""
-
-        def _a0(pid: int) -> str:
-            if pid in (2, 3):
-                return "codex"
-            return "bash"
-
-        self.assertEqual(
-            detect_processes(
-                re_pat=pat,
-                list_pids=_list,
-                read_exe_basename=_exe,
-                read_argv0_basename=_a0,
-                exclude_pid=2,
-                limit=1,
-            ),
-            [3],
-        )
-
-    def test_collect_process_tree(self) -> None:
-        def _list() -> List[int]:
-            return [100, 101, 102, 103]
-
-        def _ppid(pid: int) -> Optional[int]:
-            if pid == 101:
-                return 100
-            if pid == 102:
-                return 101
-            if pid == 103:
-                return 999
-            return None
-
-        self.assertEqual(
-            collect_process_tree([100], list_pids=_list, read_ppid=_ppid),
-            [100, 101, 102],
-        )
-
     def test_find_rollout_opened_by_pids_filters_by_flags_and_codex_home(self) -> None:
         with TemporaryDirectory() as td:
             base = Path(td) / "codex_home"
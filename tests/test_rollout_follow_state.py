@@ -30,7 +30,7 @@ class TestRolloutFollowState(unittest.TestCase):
                 # Not used by this test stub.
                 return []
 
-            def _replay_tail(cur, *, last_lines: int, read_tail_lines, stop_requested, on_line):
+            def _replay_tail(cur, *, last_lines: int, read_tail_lines, stop_requested, on_line, read_tail_lines_at=None):
                 replay_calls.append((Path(cur.path), int(last_lines)))
                 # Simulate replay effect: line_no increments by the number of replayed lines.
                 for _ in range(int(last_lines)):
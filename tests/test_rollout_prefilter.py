@@ -0,0 +1,84 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from codex_sidecar.watch.rollout_extract import extract_rollout_items, rollout_line_may_have_items
+from codex_sidecar.watch.rollout_ingest import RolloutLineIngestor
+
+_FIXTURE = Path(__file__).parent / "fixtures" / "rollout_sample.jsonl"
+
+
+def _fixture_lines():
+    return _FIXTURE.read_bytes().split(b"\n")
+
+
+def _full_parse_items(bline: bytes):
+    try:
+        obj = json.loads(bline.decode("utf-8", errors="replace"))
+    except Exception:
+        return []
+    return extract_rollout_items(obj)[1]
+
+
+class TestRolloutPrefilter(unittest.TestCase):
+    def test_skipped_lines_never_produce_items(self) -> None:
+        skipped = 0
+        for bline in _fixture_lines():
+            if not rollout_line_may_have_items(bline):
+                skipped += 1
+                self.assertEqual(_full_parse_items(bline), [], bline[:120])
+        self.assertGreaterEqual(skipped, 20)
+
+    def test_every_item_line_passes(self) -> None:
+        for bline in _fixture_lines():
+            if _full_parse_items(bline):
+                self.assertTrue(rollout_line_may_have_items(bline), bline[:120])
+
+    def test_classifies_known_codex_layouts(self) -> None:
+        ts = '"timestamp":"2026-01-20T23:44:00.123Z"'
+        skip = [
+            '{%s,"type":"turn_context","payload":{"cwd":"/repo"}}' % ts,
+            '{%s,"type":"session_meta","payload":{"id":"x"}}' % ts,
+            '{%s,"type":"event_msg","payload":{"type":"token_count","info":null}}' % ts,
+            '{%s,"type":"event_msg","payload":{"type":"agent_message","message":"x"}}' % ts,
+            '{%s,"type":"response_item","payload":{"type":"message","role":"user","content":[]}}' % ts,
+            '{%s,"type":"response_item","payload":{"type":"ghost_snapshot"}}' % ts,
+        ]
+        keep = [
+            '{%s,"type":"event_msg","payload":{"type":"user_message","message":"x"}}' % ts,
+            '{%s,"type":"response_item","payload":{"type":"message","role":"assistant","content":[]}}' % ts,
+            '{%s,"type":"response_item","payload":{"type":"message","content":[],"role":"user"}}' % ts,
+            '{%s,"type":"response_item","payload":{"type":"function_call_output","call_id":"c"}}' % ts,
+            # Unknown layout / escapes: fall back to a full parse.
+            '{"payload":{"type":"token_count"},"type":"event_msg"}',
+            '{%s,"type":"turn\\u005fcontext","payload":{}}' % ts,
+            "not json",
+        ]
+        for s in skip:
+            self.assertFalse(rollout_line_may_have_items(s.encode()), s)
+        for s in keep:
+            self.assertTrue(rollout_line_may_have_items(s.encode()), s)
+
+    def test_ingestor_output_matches_full_parse(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            fp = Path(td) / "rollout-2026-01-20T23-44-00-01234567-89ab-cdef-0123-456789abcdef.jsonl"
+            fp.write_bytes(_FIXTURE.read_bytes())
+            emitted = []
+            ing = RolloutLineIngestor(
+                stop_requested=lambda: False,
+                dedupe=lambda _hid, kind="": False,
+                emit_ingest=lambda m: emitted.append(m) or True,
+                translate_enqueue=lambda **_kw: True,
+            )
+            for i, bline in enumerate(_fixture_lines(), start=1):
+                ing.handle_line(bline, file_path=fp, line_no=i, is_replay=True, thread_id="t", translate_mode="manual")
+            want = []
+            for bline in _fixture_lines():
+                want.extend((it["kind"], it["text"]) for it in _full_parse_items(bline))
+            got = [(m["kind"], m["text"]) for m in emitted if m.get("kind") != "tool_gate"]
+            self.assertEqual(got, want)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from codex_sidecar.watch import rollout_tailer
+from codex_sidecar.watch.rollout_tailer import close_cursor_fd, poll_one, replay_tail
+from codex_sidecar.watch.tail_lines import read_tail_lines, read_tail_lines_at
+
+
+class _Cur:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.thread_id = "t1"
+        self.offset = 0
+        self.line_no = 0
+
+
+def _poll(cur, lines, progress=None):
+    poll_one(
+        cur,
+        stop_requested=lambda: False,
+        on_line=lambda b, **kw: lines.append((b, kw["line_no"])) or 0,
+        on_primary_progress=(lambda off, n: progress.append((off, n))) if progress is not None else None,
+    )
+
+
+class TestPollOne(unittest.TestCase):
+    def test_partial_trailing_line_waits_for_newline(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "r.jsonl"
+            p.write_bytes(b'{"a":1}\n{"b":')
+            cur = _Cur(p)
+            lines = []
+            try:
+                _poll(cur, lines)
+                self.assertEqual(lines, [(b'{"a":1}', 1)])
+                self.assertEqual(cur.offset, 8)
+                with open(p, "ab") as f:
+                    f.write(b'2}\n')
+                _poll(cur, lines)
+                self.assertEqual(lines[-1], (b'{"b":2}', 2))
+                self.assertEqual(cur.offset, p.stat().st_size)
+            finally:
+                close_cursor_fd(cur)
+
+    def test_lines_spanning_chunks_and_progress_per_chunk(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "r.jsonl"
+            want = [(b"x" * (i % 37 + 1)) for i in range(200)]
+            p.write_bytes(b"".join(w + b"\n" for w in want))
+            cur = _Cur(p)
+            lines = []
+            progress = []
+            try:
+                with mock.patch.object(rollout_tailer, "_READ_CHUNK_BYTES", 64):
+                    _poll(cur, lines, progress)
+            finally:
+                close_cursor_fd(cur)
+            self.assertEqual([b for b, _ in lines], want)
+            self.assertEqual(lines[-1][1], 200)
+            self.assertLess(len(progress), len(want))
+            self.assertEqual(progress[-1], (p.stat().st_size, 200))
+
+    def test_truncated_file_restarts_and_replaced_file_reopens(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "r.jsonl"
+            p.write_bytes(b"a\nb\n")
+            cur = _Cur(p)
+            lines = []
+            try:
+                _poll(cur, lines)
+                fd1 = cur.fd
+                tmp = Path(td) / "r.tmp"
+                tmp.write_bytes(b"c\n")
+                tmp.replace(p)
+                _poll(cur, lines)
+                self.assertNotEqual(cur.fd_ident, None)
+                self.assertEqual([b for b, _ in lines], [b"a", b"b", b"c"])
+                self.assertGreaterEqual(cur.fd, 0)
+                self.assertTrue(fd1 >= 0)
+            finally:
+                close_cursor_fd(cur)
+            self.assertEqual(cur.fd, -1)
+
+    def test_budget_returns_early_and_resumes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "r.jsonl"
+            want = [(b"%04d" % i) * 10 for i in range(100)]
+            p.write_bytes(b"".join(w + b"\n" for w in want))
+            cur = _Cur(p)
+            lines = []
+            rounds = 0
+            try:
+                with mock.patch.object(rollout_tailer, "_MIN_BUDGET_CHUNK_BYTES", 100):
+                    while True:
+                        rounds += 1
+                        more = poll_one(
+                            cur,
+                            stop_requested=lambda: False,
+                            on_line=lambda b, **kw: lines.append(b) or 0,
+                            max_bytes=500,
+                        )
+                        if not more:
+                            break
+                        self.assertLess(len(lines), len(want))
+            finally:
+                close_cursor_fd(cur)
+            self.assertGreater(rounds, 5)
+            self.assertEqual(lines, want)
+            self.assertEqual(cur.offset, p.stat().st_size)
+
+
+class TestReplayTail(unittest.TestCase):
+    def _replay(self, p: Path, **readers):
+        seen = []
+        replay_tail(
+            _Cur(p),
+            last_lines=2,
+            stop_requested=lambda: False,
+            on_line=lambda b, **kw: seen.append((b, kw["offset"], kw["file_ident"])) or 0,
+            **readers,
+        )
+        return seen
+
+    def test_offsets_come_from_the_explicit_reader(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "r.jsonl"
+            p.write_bytes(b"aa\nb\nccc\n")
+            st = p.stat()
+            # A wrapped lines-only reader keeps working; offsets only come with read_tail_lines_at.
+            wrapped = lambda path, **kw: read_tail_lines(path, **kw)  # noqa: E731
+            self.assertEqual(self._replay(p, read_tail_lines=wrapped), [(b"b", -1, None), (b"ccc", -1, None)])
+            ident = (int(st.st_dev), int(st.st_ino))
+            self.assertEqual(
+                self._replay(p, read_tail_lines=wrapped, read_tail_lines_at=read_tail_lines_at),
+                [(b"b", 3, ident), (b"ccc", 5, ident)],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -41,6 +41,33 @@ class TestRolloutWatcherStatus(unittest.TestCase):
         self.assertEqual(len(st.get("follow_files") or []), 12)
         self.assertEqual(len(st.get("process_files") or []), 12)
         self.assertIsInstance(st.get("translate"), dict)
+        self.assertNotIn("proc_scan", st)
+
+    def test_build_watcher_status_includes_proc_scan_timings(self) -> None:
+        st = build_watcher_status(
+            current_file=None,
+            thread_id="",
+            offset=0,
+            line_no=0,
+            last_error="",
+            follow_mode="idle",
+            selection_mode="auto",
+            pinned_thread_id="",
+            pinned_file="",
+            watch_max_sessions=3,
+            replay_last_lines=0,
+            poll_interval_s=0.5,
+            file_scan_interval_s=2.0,
+            follow_files=[],
+            codex_detected=False,
+            codex_pids=[],
+            codex_candidate_pids=[],
+            codex_process_regex="codex",
+            process_file=None,
+            process_files=[],
+            proc_scan_stats={"procs": {"scan_ms": 1.5}, "fds": {"scan_ms": 0.2}},
+        )
+        self.assertEqual(st.get("proc_scan"), {"procs": {"scan_ms": 1.5}, "fds": {"scan_ms": 0.2}})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from codex_sidecar.offline import list_offline_rollout_files
+from codex_sidecar.watch.rollout_paths import _find_rollout_file_for_thread, _latest_rollout_files
+from codex_sidecar.watch import session_catalog
+from codex_sidecar.watch.session_catalog import SessionCatalog, close_session_catalogs, open_session_catalog
+
+
+def _tid(n: int) -> str:
+    return f"00000000-0000-0000-0000-{n:012d}"
+
+
+def _write_rollout(home: Path, day: str, n: int, *, mtime: float, lines=None) -> Path:
+    y, m, d = day.split("-")
+    p = home / "sessions" / y / m / d / f"rollout-{day}T00-00-00-{_tid(n)}.jsonl"
+    p.parent.mkdir(parents=True, exist_ok=True)
+    rows = lines if lines is not None else [{"type": "session_meta", "payload": {"source": "cli"}}]
+    p.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    os.utime(p, (mtime, mtime))
+    return p
+
+
+class TestSessionCatalog(unittest.TestCase):
+    def test_refresh_and_lookups(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            home = Path(td) / "codex"
+            _write_rollout(home, "2026-01-01", 1, mtime=1000.0)
+            sub = _write_rollout(
+                home,
+                "2026-01-02",
+                2,
+                mtime=2000.0,
+                lines=[
+                    {
+                        "type": "session_meta",
+                        "payload": {"source": {"subagent": {"thread_spawn": {"parent_thread_id": _tid(1), "depth": 1}}}},
+                    },
+                    {"type": "event_msg", "payload": {"type": "user_message", "message": "  fix the build  "}},
+                ],
+            )
+            cat = SessionCatalog(Path(td) / "cat.sqlite3", home)
+            try:
+                st = cat.refresh()
+                self.assertEqual(st["day_dirs"], 2)
+                self.assertEqual([r["thread_id"] for r in cat.latest(limit=0)], [_tid(2), _tid(1)])
+                row = cat.find_thread(_tid(2))
+                self.assertEqual(row["path"], str(sub))
+                self.assertEqual(row["source_kind"], "subagent")
+                self.assertEqual(row["parent_thread_id"], _tid(1))
+                self.assertEqual(row["first_user_message"], "fix the build")
+                self.assertEqual(cat.find_thread(_tid(1))["source_kind"], "cli")
+                self.assertEqual([r["day"] for r in cat.between_days("2026-01-01", "2026-01-01")], ["2026-01-01"])
+
+                # No day dir changed: nothing is re-listed.
+                self.assertEqual(cat.refresh()["rescanned_dirs"], 0)
+
+                # New file (day dir mtime changes) + append to an old file (only its mtime changes).
+                _write_rollout(home, "2026-01-02", 3, mtime=3000.0)
+                old = home / "sessions" / "2026" / "01" / "01" / f"rollout-2026-01-01T00-00-00-{_tid(1)}.jsonl"
+                with open(old, "a", encoding="utf-8") as f:
+                    f.write("{}\n")
+                os.utime(old, (4000.0, 4000.0))
+                st = cat.refresh()
+                self.assertEqual(st["rescanned_dirs"], 1)
+                self.assertEqual([r["thread_id"] for r in cat.latest(limit=2)], [_tid(1), _tid(3)])
+
+                sub.unlink()
+                cat.refresh()
+                self.assertIsNone(cat.find_thread(_tid(2)))
+            finally:
+                cat.close()
+
+            # Persisted: a fresh instance sees the rows without re-listing day dirs.
+            cat2 = SessionCatalog(Path(td) / "cat.sqlite3", home)
+            try:
+                self.assertEqual(len(cat2.latest(limit=0)), 2)
+                self.assertEqual(cat2.refresh()["rescanned_dirs"], 0)
+            finally:
+                cat2.close()
+
+    def test_append_to_old_session_updates_recency_without_full_restat(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            home = Path(td) / "codex"
+            old = _write_rollout(home, "2026-03-01", 1, mtime=1000.0)
+            tailed = _write_rollout(home, "2026-03-02", 2, mtime=2000.0)
+            _write_rollout(home, "2026-03-03", 3, mtime=3000.0)
+            cat = SessionCatalog(Path(td) / "cat.sqlite3", home, full_restat_s=3600.0)
+            try:
+                cat.refresh()
+                with mock.patch.object(session_catalog, "_HOT_ROWS", 1):
+                    # `codex resume`: append to an old file (its day dir mtime does not change).
+                    with open(old, "a", encoding="utf-8") as f:
+                        f.write("{}\n")
+                    os.utime(old, (4000.0, 4000.0))
+                    cat.refresh()
+                    self.assertEqual(cat.latest(limit=1)[0]["thread_id"], _tid(3))
+                    # The watcher saw the write (inotify): re-stat'ed right away.
+                    self.assertEqual(cat.note_paths([old]), 1)
+                    self.assertEqual([r["thread_id"] for r in cat.latest(limit=0)], [_tid(1), _tid(3), _tid(2)])
+
+                    # Followed / tailed files are re-stat'ed on every refresh.
+                    cat.set_hot_paths([tailed])
+                    with open(tailed, "a", encoding="utf-8") as f:
+                        f.write("{}\n")
+                    os.utime(tailed, (5000.0, 5000.0))
+                    cat.refresh()
+                    self.assertEqual(cat.latest(limit=1)[0]["thread_id"], _tid(2))
+            finally:
+                cat.close()
+
+    def test_registered_catalog_backs_rollout_paths(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            home = Path(td) / "codex"
+            _write_rollout(home, "2026-02-01", 1, mtime=1000.0)
+            _write_rollout(home, "2026-02-03", 2, mtime=2000.0)
+            try:
+                cat = open_session_catalog(config_home=Path(td) / "cfg", codex_home=home)
+                self.assertIsNotNone(cat)
+                self.assertTrue(cat.db_path.exists())
+                self.assertEqual([p.name for p in _latest_rollout_files(home, limit=1)], [f"rollout-2026-02-03T00-00-00-{_tid(2)}.jsonl"])
+                _write_rollout(home, "2026-02-04", 3, mtime=3000.0)
+                # Miss on a just-created thread forces one refresh.
+                self.assertIsNotNone(_find_rollout_file_for_thread(home, _tid(3)))
+                files = list_offline_rollout_files(home, limit=10, since_day="2026-02-02")
+                self.assertEqual([f["thread_id"] for f in files], [_tid(3), _tid(2)])
+                self.assertEqual(files[0]["rel"], f"sessions/2026/02/04/rollout-2026-02-04T00-00-00-{_tid(3)}.jsonl")
+            finally:
+                close_session_catalogs()
+            # Unregistered: glob fallback keeps working.
+            self.assertEqual(len(_latest_rollout_files(home, limit=0)), 3)
+
+    def test_thread_lookup_falls_back_to_glob_on_catalog_miss(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            home = Path(td) / "codex"
+            _write_rollout(home, "2026-02-01", 1, mtime=1000.0)
+            try:
+                cat = open_session_catalog(config_home=Path(td) / "cfg", codex_home=home)
+                self.assertIsNotNone(cat)
+                p = _write_rollout(home, "2026-02-01", 2, mtime=2000.0)
+                # The incremental refresh misses it (e.g. same-second day dir mtime).
+                with mock.patch.object(SessionCatalog, "refresh", return_value={}):
+                    self.assertEqual(_find_rollout_file_for_thread(home, _tid(2)), p)
+                    # The glob hit is indexed, so the next lookup is served by the catalog.
+                    self.assertEqual((cat.find_thread(_tid(2)) or {}).get("path"), str(p))
+                    self.assertIsNone(_find_rollout_file_for_thread(home, _tid(9)))
+                with mock.patch.object(SessionCatalog, "find_thread", side_effect=RuntimeError("db")):
+                    self.assertEqual(_find_rollout_file_for_thread(home, _tid(2)), p)
+            finally:
+                close_session_catalogs()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import json
+import unittest
+from unittest import mock
+
+from codex_sidecar.http import sse
+from codex_sidecar.http.sse import (
+    SseEvent,
+    sse_batch_bytes,
+    sse_event_from_message,
+    sse_message_event_bytes,
+    sse_resync_event,
+    sse_update_event,
+)
+from codex_sidecar.http.state import SidecarState
+
+
+def _payload(ev: SseEvent) -> dict:
+    for ln in ev.frame.split(b"\n"):
+        if ln.startswith(b"data: "):
+            return json.loads(ln[len(b"data: ") :].decode("utf-8"))
+    raise AssertionError(ev.frame)
+
+
+class TestSseEventFanout(unittest.TestCase):
+    def test_add_is_encoded_once_for_all_subscribers(self) -> None:
+        st = SidecarState(max_messages=100)
+        qs = [st.subscribe() for _ in range(3)]
+        with mock.patch.object(sse, "json_bytes", wraps=sse.json_bytes) as enc:
+            st.add({"id": "m1", "kind": "assistant_message", "text": "hi"})
+        self.assertEqual(enc.call_count, 1)
+        evs = [q.get_nowait() for q in qs]
+        self.assertTrue(all(ev is evs[0] for ev in evs))
+        ev = evs[0]
+        self.assertTrue(ev.frame.startswith(b"id: 1\nevent: message\ndata: "))
+        self.assertTrue(ev.frame.endswith(b"\n\n"))
+        self.assertEqual((ev.seq, ev.high, ev.msg_id), (1, True, "m1"))
+        self.assertEqual(_payload(ev)["text"], "hi")
+
+    def test_update_snapshot_has_no_id_and_is_immutable(self) -> None:
+        st = SidecarState(max_messages=100)
+        st.add({"id": "m1", "kind": "assistant_message", "text": "hi"})
+        q = st.subscribe()
+        st.update({"op": "update", "id": "m1", "zh": "你好"})
+        st.update({"op": "update", "id": "m1", "zh": "您好"})
+        first = q.get_nowait()
+        self.assertEqual(q.qsize(), 0)  # second update superseded the queued first one
+        st.update({"op": "update", "id": "m1", "zh": "您好"})
+        second = q.get_nowait()
+        self.assertEqual(first.seq, 0)
+        self.assertFalse(first.high)
+        self.assertTrue(first.frame.startswith(b"event: message\n"))
+        self.assertEqual(_payload(first), {"id": "m1", "kind": "assistant_message", "text": "hi", "seq": 1, "zh": "您好", "op": "update"})
+        self.assertEqual(_payload(second)["zh"], "您好")
+        # The stored message is patched in place, never tagged with op.
+        self.assertNotIn("op", st.get_message("m1") or {})
+
+    def test_no_subscribers_skips_encoding(self) -> None:
+        st = SidecarState(max_messages=100)
+        with mock.patch.object(sse, "json_bytes", wraps=sse.json_bytes) as enc:
+            st.add({"id": "m1", "kind": "assistant_message", "text": "hi"})
+            st.add_many([{"op": "update", "id": "m1", "text": "x"}, {"id": "m2", "kind": "tool_call"}])
+        self.assertEqual(enc.call_count, 0)
+
+    def test_delta_subscriber_gets_only_patched_fields(self) -> None:
+        st = SidecarState(max_messages=100)
+        st.add({"id": "m1", "kind": "reasoning_summary", "thread_id": "t1", "text": "x" * 4096})
+        q_full = st.subscribe()
+        q_delta = st.subscribe(delta=True)
+        st.update({"op": "update", "id": "m1", "zh": "译文", "translate_error": ""})
+        ev_full = q_full.get_nowait()
+        ev_delta = q_delta.get_nowait()
+        self.assertIs(ev_full, ev_delta)
+        self.assertEqual(len(_payload(ev_full)["text"]), 4096)
+        d = json.loads(ev_delta.frame_for(True).split(b"data: ", 1)[1])
+        self.assertEqual(
+            d,
+            {"id": "m1", "seq": 1, "thread_id": "t1", "kind": "reasoning_summary", "zh": "译文", "translate_error": "", "op": "update"},
+        )
+
+    def test_delta_only_subscribers_skip_full_encoding(self) -> None:
+        st = SidecarState(max_messages=100)
+        st.add({"id": "m1", "kind": "reasoning_summary", "text": "long"})
+        q = st.subscribe(delta=True)
+        st.add_many([{"op": "update", "id": "m1", "zh": "a"}])
+        ev = q.get_nowait()
+        self.assertEqual(ev.frame, b"")
+        self.assertEqual(ev.frame_for(False), b"")
+        self.assertNotIn(b"long", ev.frame_for(True))
+        # Adds are identical in both modes.
+        st.add({"id": "m2", "kind": "assistant_message", "text": "hi"})
+        ev2 = q.get_nowait()
+        self.assertEqual(ev2.frame_for(True), ev2.frame_for(False))
+
+    def test_delta_coalescing_keeps_uncovered_patches(self) -> None:
+        st = SidecarState(max_messages=100)
+        st.add({"id": "m1", "kind": "reasoning_summary", "text": "en"})
+        q = st.subscribe(delta=True)
+        st.update({"op": "update", "id": "m1", "zh": "a"})
+        st.update({"op": "update", "id": "m1", "translate_error": "boom"})
+        st.update({"op": "update", "id": "m1", "zh": "b"})
+        got = [json.loads(q.get_nowait().frame_for(True).split(b"data: ", 1)[1]) for _ in range(q.qsize())]
+        self.assertEqual([sorted(set(d) - {"id", "seq", "kind", "op"}) for d in got], [["translate_error"], ["zh"]])
+        self.assertEqual(got[-1]["zh"], "b")
+
+    def test_update_overflow_sends_resync_with_last_seq(self) -> None:
+        from codex_sidecar.http import state as state_mod
+
+        st = SidecarState(max_messages=100)
+        for i in range(5):
+            st.add({"id": f"m{i}", "kind": "reasoning_summary", "text": "en"})
+        q = st.subscribe()
+        with mock.patch.object(state_mod, "_SUB_MAX_UPDATES", 3):
+            for i in range(5):
+                st.update({"op": "update", "id": f"m{i}", "zh": "x"})
+        first = q.get_nowait()
+        self.assertTrue(first.resync)
+        self.assertTrue(first.frame.startswith(b"event: resync\ndata: "))
+        self.assertEqual(json.loads(first.frame.split(b"data: ", 1)[1]), {"op": "resync", "seq": 5})
+        self.assertEqual([q.get_nowait().msg_id for _ in range(q.qsize())], ["m0", "m1", "m2"])
+        self.assertEqual(q.stats()["lost"], 2)
+
+    def test_filtered_subscription_skips_non_matching_events(self) -> None:
+        st = SidecarState(max_messages=100)
+        q_kind = st.subscribe(kinds=frozenset({"tool_gate"}))
+        q_thread = st.subscribe(sid="s", threads=frozenset({"t1"}))
+        with mock.patch.object(sse, "json_bytes", wraps=sse.json_bytes) as enc:
+            st.add({"id": "a", "kind": "assistant_message", "thread_id": "t2", "text": "x"})
+        self.assertEqual(enc.call_count, 0)
+        st.add({"id": "b", "kind": "tool_gate", "thread_id": "t1", "text": "x"})
+        st.add({"id": "c", "kind": "reasoning_summary", "file": "/r/t1.jsonl", "text": "x"})
+        self.assertEqual([q_kind.get_nowait().msg_id for _ in range(q_kind.qsize())], ["b"])
+        self.assertEqual([q_thread.get_nowait().msg_id for _ in range(q_thread.qsize())], ["b"])
+        self.assertEqual(st.set_event_filter("s", frozenset({"/r/t1.jsonl"}), None), 1)
+        self.assertEqual(st.set_event_filter("missing", None, None), 0)
+        st.update({"op": "update", "id": "c", "zh": "z"})
+        st.update({"op": "update", "id": "b", "zh": "z"})
+        self.assertEqual([q_thread.get_nowait().msg_id for _ in range(q_thread.qsize())], ["c"])
+        # Updates are not encoded either when no subscriber's filter accepts the stored message.
+        st.add({"id": "d", "kind": "reasoning_summary", "thread_id": "t9", "text": "x"})
+        with mock.patch.object(sse, "json_bytes", wraps=sse.json_bytes) as enc:
+            st.update({"op": "update", "id": "d", "zh": "z"})
+            st.add_many([{"op": "update", "id": "d", "zh": "z2"}])
+        self.assertEqual(enc.call_count, 0)
+        self.assertEqual((st.get_message("d") or {}).get("zh"), "z2")
+
+    def test_batch_bytes(self) -> None:
+        a = sse_event_from_message({"id": "a", "seq": 3, "kind": "x"})
+        b = sse_update_event({"id": "b", "seq": 1, "kind": "y", "text": "t"}, {"zh": "z"}, full=True, delta=True)
+        r = sse_resync_event(9)
+        self.assertEqual(sse_batch_bytes([a, b], delta=False, batch=False), a.frame + b.frame)
+        self.assertEqual(sse_batch_bytes([a], delta=True, batch=True), a.frame)
+        out = sse_batch_bytes([r, a, b], delta=True, batch=True)
+        self.assertTrue(out.startswith(r.frame + b"id: 3\nevent: batch\ndata: ["))
+        arr = json.loads(out[len(r.frame) :].split(b"data: ", 1)[1])
+        self.assertEqual(arr[0], {"id": "a", "seq": 3, "kind": "x"})
+        self.assertEqual(arr[1], {"id": "b", "seq": 1, "kind": "y", "op": "update"})
+        self.assertEqual(json.loads(a.data_for(True)), arr[0])
+        self.assertEqual(json.loads(b.data_for(False)), dict(json.loads(b.data_for(True)), text="t"))
+        # A message whose kind happens to be "resync" is still a batched message.
+        c = sse_event_from_message({"id": "c", "seq": 4, "kind": "resync"})
+        out = sse_batch_bytes([a, c], delta=True, batch=True)
+        self.assertEqual([m["id"] for m in json.loads(out.split(b"data: ", 1)[1])], ["a", "c"])
+
+    def test_update_event_matches_reference_encoding(self) -> None:
+        cur = {"id": "x", "kind": "tool_call", "seq": 7}
+        ev = sse_update_event(cur)
+        self.assertEqual(_payload(ev), dict(cur, op="update"))
+        self.assertEqual(cur, {"id": "x", "kind": "tool_call", "seq": 7})
+        self.assertEqual(_payload(sse_update_event({})), {"op": "update"})
+        self.assertEqual(_payload(sse_event_from_message({"op": "update", "id": "x", "seq": 3})).get("seq"), 3)
+        id_line, body = sse_message_event_bytes({"id": "y", "seq": 4})
+        self.assertEqual(id_line, b"id: 4\n")
+        self.assertTrue(body.startswith(b"event: message\ndata: "))
+        self.assertIsNone(sse_message_event_bytes({"op": "update", "id": "y", "seq": 4})[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
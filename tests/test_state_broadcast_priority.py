@@ -9,9 +9,9 @@ class TestStateBroadcastPriority(unittest.TestCase):
         st = SidecarState(max_messages=1000)
         q = st.subscribe()
 
-        # Fill the subscriber queue with low-value noise (e.g. translation backfill updates).
+        # Fill the subscriber queue with low-value noise (op=update is coalesced per id, so use adds).
         for i in range(int(getattr(q, "maxsize", 0) or 0)):
-            q.put_nowait({"id": f"u{i}", "op": "update", "kind": "reasoning_summary", "text": "x"})
+            q.put_nowait({"id": f"n{i}", "kind": "tool_call", "text": "x"})
 
         st.add({"id": "tg1", "kind": "tool_gate", "text": "waiting"})
 
@@ -23,7 +23,7 @@ class TestStateBroadcastPriority(unittest.TestCase):
             except queue.Empty:
                 break
             drained += 1
-            if isinstance(m, dict) and m.get("id") == "tg1":
+            if getattr(m, "msg_id", None) == "tg1":
                 found = True
 
         # Queue was full; tool_gate should still be delivered by evicting one old item.
@@ -35,7 +35,7 @@ class TestStateBroadcastPriority(unittest.TestCase):
         q = st.subscribe()
 
         for i in range(int(getattr(q, "maxsize", 0) or 0)):
-            q.put_nowait({"id": f"u{i}", "op": "update", "kind": "reasoning_summary", "text": "x"})
+            q.put_nowait({"id": f"n{i}", "kind": "tool_call", "text": "x"})
 
         st.add({"id": "a1", "kind": "assistant_message", "text": "hello"})
 
@@ -45,7 +45,7 @@ class TestStateBroadcastPriority(unittest.TestCase):
                 m = q.get_nowait()
             except queue.Empty:
                 break
-            if isinstance(m, dict) and m.get("id") == "a1":
+            if getattr(m, "msg_id", None) == "a1":
                 found = True
         self.assertTrue(found)
 
@@ -54,19 +54,45 @@ class TestStateBroadcastPriority(unittest.TestCase):
         q = st.subscribe()
 
         for i in range(int(getattr(q, "maxsize", 0) or 0)):
-            q.put_nowait({"id": f"u{i}", "op": "update", "kind": "reasoning_summary", "text": "x"})
+            q.put_nowait({"id": f"n{i}", "kind": "tool_call", "text": "x"})
 
         st.add({"id": "c1", "kind": "tool_call", "text": "noisy"})
 
         found = False
+        kinds = []
         while True:
             try:
                 m = q.get_nowait()
             except queue.Empty:
                 break
-            if isinstance(m, dict) and m.get("id") == "c1":
+            kinds.append("resync" if m.resync else m.kind)
+            if getattr(m, "msg_id", None) == "c1":
                 found = True
         self.assertFalse(found)
+        # The loss is announced: resync first, then the events that were kept.
+        self.assertEqual(kinds[0], "resync")
+        self.assertEqual(kinds.count("resync"), 1)
+
+    def test_updates_coalesce_instead_of_dropping(self) -> None:
+        st = SidecarState(max_messages=1000)
+        for i in range(300):
+            st.add({"id": f"r{i}", "kind": "reasoning_summary", "text": "en"})
+        q = st.subscribe()
+        # Far more updates than the queue holds: one pending entry per id, last write wins.
+        for rnd in range(5):
+            for i in range(300):
+                st.update({"op": "update", "id": f"r{i}", "zh": f"zh{rnd}"})
+        self.assertEqual(q.qsize(), 300)
+        got = {}
+        while True:
+            try:
+                m = q.get_nowait()
+            except queue.Empty:
+                break
+            self.assertFalse(m.resync)
+            got[m.msg_id] = m.frame
+        self.assertEqual(len(got), 300)
+        self.assertTrue(all(b'"zh":"zh4"' in f for f in got.values()))
 
 
 if __name__ == "__main__":
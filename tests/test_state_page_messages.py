@@ -0,0 +1,43 @@
+import unittest
+
+from codex_sidecar.http.state import SidecarState
+
+
+def _seqs(page):
+    return [m["seq"] for m in page["messages"]]
+
+
+class TestStatePageMessages(unittest.TestCase):
+    def test_newest_page_then_older_and_newer(self) -> None:
+        st = SidecarState(max_messages=100)
+        for i in range(10):
+            st.add({"id": f"m{i}", "thread_id": "a" if i % 2 else "b"})
+
+        p = st.page_messages(limit=3)
+        self.assertEqual(_seqs(p), [8, 9, 10])
+        self.assertEqual((p["prev"], p["next"]), (8, None))
+
+        p = st.page_messages(before=p["prev"], limit=3)
+        self.assertEqual(_seqs(p), [5, 6, 7])
+        self.assertEqual((p["prev"], p["next"]), (5, 7))
+
+        p = st.page_messages(after=p["next"], limit=3)
+        self.assertEqual(_seqs(p), [8, 9, 10])
+        self.assertEqual((p["prev"], p["next"]), (8, None))
+
+        p = st.page_messages(after=1, limit=2)
+        self.assertEqual(_seqs(p), [2, 3])
+        self.assertEqual((p["prev"], p["next"]), (2, 3))
+
+    def test_thread_filter_and_history_start(self) -> None:
+        st = SidecarState(max_messages=100)
+        for i in range(10):
+            st.add({"id": f"m{i}", "thread_id": "a" if i % 2 else "b"})
+        p = st.page_messages(thread_id="a", before=6, limit=3)
+        self.assertEqual(_seqs(p), [2, 4])
+        self.assertEqual((p["prev"], p["next"]), (None, 4))
+        self.assertEqual(st.page_messages(before=1)["messages"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import random
+import time
+import unittest
+from typing import Dict, List
+from unittest import mock
+
+from codex_sidecar.http.state import SidecarState
+
+
+def _reference_threads(msgs: List[dict]) -> List[dict]:
+    # Full-scan aggregation (the previous list_threads implementation).
+    agg: Dict[str, dict] = {}
+    for m in msgs:
+        thread_id = str(m.get("thread_id") or "")
+        file_path = str(m.get("file") or "")
+        key = thread_id or file_path or "unknown"
+        a = agg.setdefault(
+            key,
+            {
+                "key": key,
+                "thread_id": thread_id,
+                "file": file_path,
+                "count": 0,
+                "last_ts": "",
+                "last_seq": 0,
+                "kinds": {},
+                "source_kind": "",
+                "parent_thread_id": "",
+                "subagent_depth": 0,
+            },
+        )
+        a["count"] += 1
+        ts = str(m.get("ts") or "")
+        if ts and (not a["last_ts"] or ts > a["last_ts"]):
+            a["last_ts"] = ts
+        seq = int(m.get("seq") or 0)
+        if seq > a["last_seq"]:
+            a["last_seq"] = seq
+        kind = str(m.get("kind") or "")
+        if kind:
+            a["kinds"][kind] = a["kinds"].get(kind, 0) + 1
+        sk = str(m.get("source_kind") or "").strip()
+        if sk and not a["source_kind"]:
+            a["source_kind"] = sk
+        pid = str(m.get("parent_thread_id") or "").strip()
+        if pid and not a["parent_thread_id"]:
+            a["parent_thread_id"] = pid
+        if isinstance(m.get("subagent_depth"), int):
+            a["subagent_depth"] = m["subagent_depth"]
+    items = list(agg.values())
+    items.sort(key=lambda x: (x["last_seq"], x["last_ts"]), reverse=True)
+    return items
+
+
+class TestStateThreadIndex(unittest.TestCase):
+    def test_matches_full_scan_under_eviction_and_patches(self) -> None:
+        rnd = random.Random(7)
+        st = SidecarState(max_messages=60)
+        threads = ["t1", "t2", "t3", ""]
+        for i in range(500):
+            tid = rnd.choice(threads)
+            m = {
+                "id": f"m{i}",
+                "thread_id": tid,
+                # A thread's messages may carry different files (resumed sessions): the summary
+                # reports the file of the oldest message still stored.
+                "file": rnd.choice(["/a.jsonl", "/b.jsonl", ""]),
+                "kind": rnd.choice(["assistant_message", "user_message", "tool_call"]),
+                "ts": f"2026-01-01T00:{rnd.randrange(60):02d}:00Z",
+            }
+            if rnd.random() < 0.1:
+                m["source_kind"] = "subagent"
+                m["parent_thread_id"] = "t1"
+                m["subagent_depth"] = rnd.randrange(1, 3)
+            st.add(m)
+            if rnd.random() < 0.2:
+                mid = f"m{rnd.randrange(i + 1)}"
+                patch = {"op": "update", "id": mid, "zh": "x"}
+                if rnd.random() < 0.3:
+                    patch["kind"] = "reasoning_summary"
+                if rnd.random() < 0.05:
+                    patch["thread_id"] = rnd.choice(threads)
+                if rnd.random() < 0.05:
+                    patch["file"] = rnd.choice(["/a.jsonl", "/c.jsonl"])
+                st.add(patch)
+            self.assertEqual(st.list_threads(), _reference_threads(st.list_messages()), msg=f"step {i}")
+            if i % 25 == 0:
+                for t in st.list_threads():
+                    if not t["thread_id"]:
+                        continue
+                    ref = [m for m in st.list_messages() if m.get("thread_id") == t["key"]]
+                    self.assertEqual(st.list_messages(t["key"]), ref, msg=f"step {i} {t['key']}")
+
+    def test_thread_move_does_not_rebuild_the_index(self) -> None:
+        st = SidecarState(max_messages=100)
+        for i in range(50):
+            st.add({"id": f"m{i}", "thread_id": "a" if i % 2 else "b", "kind": "tool_call"})
+        with mock.patch.object(st, "_index_locked", wraps=st._index_locked) as idx:
+            st.update({"op": "update", "id": "m10", "thread_id": "a"})
+            st.update({"op": "update", "id": "m0", "thread_id": "c"})
+        self.assertEqual(idx.call_count, 0)
+        self.assertEqual([m["id"] for m in st.list_messages("a")][:7], ["m1", "m3", "m5", "m7", "m9", "m10", "m11"])
+        self.assertEqual([m["id"] for m in st.list_messages("c")], ["m0"])
+        counts = {t["key"]: t["count"] for t in st.list_threads()}
+        self.assertEqual(counts, {"a": 26, "b": 23, "c": 1})
+        # Same thread key (file patched under a thread_id) together with an aggregate field.
+        st.update({"op": "update", "id": "m2", "file": "/x.jsonl", "kind": "reasoning_summary"})
+        b = [t for t in st.list_threads() if t["key"] == "b"][0]
+        self.assertEqual(b["kinds"], {"tool_call": 22, "reasoning_summary": 1})
+
+    def test_thread_filtered_messages_and_pages(self) -> None:
+        st = SidecarState(max_messages=10)
+        for i in range(15):
+            st.add({"id": f"m{i}", "thread_id": "a" if i % 3 == 0 else "b"})
+        a = st.list_messages("a")
+        self.assertEqual([m["id"] for m in a], ["m6", "m9", "m12"])
+        self.assertEqual(st.list_messages("missing"), [])
+        p = st.page_messages(thread_id="a", limit=2)
+        self.assertEqual([m["id"] for m in p["messages"]], ["m9", "m12"])
+        self.assertEqual(p["prev"], a[1]["seq"])
+        st.clear()
+        self.assertEqual(st.list_threads(), [])
+
+    def test_listing_cost_independent_of_history_size(self) -> None:
+        st = SidecarState(max_messages=100_000)
+        for i in range(100_000):
+            st.add({"id": f"m{i}", "thread_id": f"t{i % 20}", "kind": "assistant_message", "ts": str(i)})
+        t0 = time.perf_counter()
+        for _ in range(100):
+            items = st.list_threads()
+        per_call = (time.perf_counter() - t0) / 100
+        self.assertEqual(len(items), 20)
+        self.assertEqual(sum(x["count"] for x in items), 100_000)
+        self.assertLess(per_call, 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,7 @@ import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
-from codex_sidecar.watch.tail_lines import read_tail_lines
+from codex_sidecar.watch.tail_lines import read_tail_lines, read_tail_lines_at
 
 
 class TestTailLines(unittest.TestCase):
@@ -28,6 +28,13 @@ class TestTailLines(unittest.TestCase):
             out = read_tail_lines(p, last_lines=1, max_bytes=1024)
             self.assertTrue(out)
 
+    def test_read_tail_lines_at_offsets(self) -> None:
+        with TemporaryDirectory() as td:
+            p = Path(td) / "x.txt"
+            p.write_bytes(b"aa\r\nb\nccc")
+            self.assertEqual(read_tail_lines_at(p, last_lines=2), [(4, b"b"), (6, b"ccc")])
+            self.assertEqual(read_tail_lines_at(p, last_lines=9), [(0, b"aa"), (4, b"b"), (6, b"ccc")])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,78 @@
+import json
+import shutil
+import subprocess
+import unittest
+from pathlib import Path
+
+_TIMELINE = Path(__file__).resolve().parents[1] / "ui" / "app" / "events" / "timeline.js"
+
+# Drives ui/app/events/timeline.js under node with a fake rowIndex/renderMessage (no DOM needed).
+_SCRIPT = r"""
+const { applyMsgToList, rememberMsg } = await import(process.argv[1]);
+const out = {};
+
+function mkState() {
+  const rendered = [];
+  const state = { sseDelta: true, msgById: new Map(), rowIndex: new Map(), sseOverflow: new Set(), timeline: [] };
+  const renderMessage = (_dom, _state, msg, opt) => {
+    rendered.push(msg);
+    const row = (opt && opt.patchEl) || {};
+    row.__msg = msg;
+    if (msg.id) state.rowIndex.set(msg.id, row);
+  };
+  return { state, rendered, renderMessage };
+}
+
+// Base evicted from the bounded store, row still rendered: merge into the row's message.
+{
+  const { state, rendered, renderMessage } = mkState();
+  const add = { op: "add", id: "a1", thread_id: "t1", kind: "assistant_message", text: "hello", seq: 1 };
+  state.rowIndex.set("a1", { __msg: add });
+  applyMsgToList({}, state, { op: "update", id: "a1", thread_id: "t1", seq: 2, zh: "你好" }, renderMessage);
+  out.rowFallback = { rendered: rendered.map((m) => [m.text, m.zh, m.kind]), overflow: Array.from(state.sseOverflow) };
+  out.rowFallbackStored = state.msgById.get("a1") ? state.msgById.get("a1").zh : null;
+}
+
+// No base anywhere: the update is not rendered, and the thread key is marked for a source refresh.
+{
+  const { state, rendered, renderMessage } = mkState();
+  state.sseByKey = new Map([["t2", [{ op: "add", id: "x" }]]]);
+  applyMsgToList({}, state, { op: "update", id: "gone", thread_id: "t2", seq: 3, zh: "x" }, renderMessage);
+  out.missing = { rendered: rendered.length, overflow: Array.from(state.sseOverflow), buffered: state.sseByKey.has("t2") };
+}
+
+// Store hit still wins over the row.
+{
+  const { state, rendered, renderMessage } = mkState();
+  rememberMsg(state, { op: "add", id: "b1", thread_id: "t1", text: "store", seq: 1 });
+  state.rowIndex.set("b1", { __msg: { id: "b1", text: "row" } });
+  applyMsgToList({}, state, { op: "update", id: "b1", seq: 2, zh: "z" }, renderMessage);
+  out.storeFirst = rendered.map((m) => m.text);
+}
+
+console.log(JSON.stringify(out));
+"""
+
+
+@unittest.skipUnless(shutil.which("node"), "node not available")
+class TestUiTimelineMerge(unittest.TestCase):
+    def test_delta_update_without_stored_base(self) -> None:
+        p = subprocess.run(
+            ["node", "--input-type=module", "-e", _SCRIPT, _TIMELINE.as_uri()],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        self.assertEqual(p.returncode, 0, p.stderr)
+        out = json.loads(p.stdout.strip().splitlines()[-1])
+
+        self.assertEqual(out["rowFallback"]["rendered"], [["hello", "你好", "assistant_message"]])
+        self.assertEqual(out["rowFallback"]["overflow"], [])
+        self.assertEqual(out["rowFallbackStored"], "你好")
+
+        self.assertEqual(out["missing"], {"rendered": 0, "overflow": ["t2"], "buffered": False})
+        self.assertEqual(out["storeFirst"], ["store"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import threading
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from codex_sidecar.watch.rollout_watcher import RolloutWatcher
+from codex_sidecar.watch.watch_scheduler import TimerHeap, next_poll_interval
+
+
+class _FakeIngest:
+    def ingest(self, _msg: dict) -> bool:
+        return True
+
+
+class _FakeTranslator:
+    def translate(self, _text: str) -> str:
+        return ""
+
+
+class TestTimerHeap(unittest.TestCase):
+    def test_pop_due_in_deadline_order_and_reschedule(self) -> None:
+        h = TimerHeap()
+        h.schedule("a", 3.0)
+        h.schedule("b", 1.0)
+        h.schedule(("cursor", "x"), 2.0)
+        h.schedule("a", 0.5)  # supersedes the 3.0 entry
+        self.assertEqual(h.next_deadline(), 0.5)
+        self.assertEqual(h.pop_due(2.0), ["a", "b", ("cursor", "x")])
+        self.assertIsNone(h.next_deadline())
+        self.assertEqual(len(h), 0)
+
+    def test_cancel_and_schedule_min(self) -> None:
+        h = TimerHeap()
+        h.schedule("gates", 5.0)
+        h.schedule_min("gates", 9.0)
+        self.assertEqual(h.deadline("gates"), 5.0)
+        h.schedule_min("gates", 4.0)
+        self.assertEqual(h.deadline("gates"), 4.0)
+        h.cancel("gates")
+        self.assertNotIn("gates", h)
+        self.assertEqual(h.pop_due(100.0), [])
+
+    def test_many_reschedules_stay_compact(self) -> None:
+        h = TimerHeap()
+        for i in range(1000):
+            h.schedule(i % 3, float(i))
+        self.assertLess(len(h._heap), 100)
+        self.assertEqual(sorted(h.pop_due(1e9)), [0, 1, 2])
+
+    def test_next_poll_interval_hot_and_backoff(self) -> None:
+        self.assertEqual(next_poll_interval(1.6, had_data=True, hot_s=0.05, cold_s=2.0), 0.05)
+        iv = 0.05
+        seen = []
+        for _ in range(8):
+            iv = next_poll_interval(iv, had_data=False, hot_s=0.05, cold_s=2.0)
+            seen.append(iv)
+        self.assertEqual(seen[:3], [0.1, 0.2, 0.4])
+        self.assertEqual(seen[-1], 2.0)
+        self.assertEqual(next_poll_interval(0.0, had_data=False, hot_s=0.05, cold_s=2.0), 0.05)
+
+
+class TestWatcherWake(unittest.TestCase):
+    def test_control_change_wakes_polling_loop(self) -> None:
+        with TemporaryDirectory() as td:
+            w = RolloutWatcher(
+                codex_home=Path(td),
+                ingest=_FakeIngest(),
+                translator=_FakeTranslator(),
+                replay_last_lines=0,
+                watch_max_sessions=3,
+                translate_mode="auto",
+                poll_interval_s=0.5,
+                file_scan_interval_s=30.0,
+                fs_events=False,
+            )
+            w._sched.schedule("scan", time.monotonic() + 30.0)
+            stop = threading.Event()
+            threading.Timer(0.1, lambda: w.set_follow("pin", thread_id="x")).start()
+            t0 = time.monotonic()
+            w._wait_next_tick(stop)
+            self.assertLess(time.monotonic() - t0, 5.0)
+            self.assertTrue(w._follow_dirty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from codex_sidecar.watch import rollout_tailer, rollout_watcher
+from codex_sidecar.watch.rollout_tailer import close_cursor_fd
+from codex_sidecar.watch.rollout_watcher import RolloutWatcher, _FileCursor
+
+
+class _FakeIngest:
+    def ingest(self, _msg: dict) -> bool:
+        return True
+
+
+class _FakeTranslator:
+    def translate(self, _text: str) -> str:
+        return ""
+
+
+class TestWatcherPollFairness(unittest.TestCase):
+    def test_small_session_not_starved_by_backlog(self) -> None:
+        with TemporaryDirectory() as td:
+            big = Path(td) / "big.jsonl"
+            small = Path(td) / "small.jsonl"
+            big.write_bytes(b"".join(b"b%05d\n" % i for i in range(5000)))
+            small.write_bytes(b"s1\ns2\n")
+            w = RolloutWatcher(
+                codex_home=Path(td),
+                ingest=_FakeIngest(),
+                translator=_FakeTranslator(),
+                replay_last_lines=0,
+                watch_max_sessions=3,
+                translate_mode="auto",
+                poll_interval_s=0.5,
+                file_scan_interval_s=2.0,
+                fs_events=False,
+            )
+            seen = []
+            w._on_rollout_line = lambda bline, **kw: seen.append(bline) or 0  # type: ignore[method-assign]
+            w._follow_files = [big, small]
+            w._cursors = {p: _FileCursor(path=p, thread_id=p.stem, active=True) for p in (big, small)}
+            try:
+                with mock.patch.object(rollout_watcher, "_POLL_BUDGET_BYTES", 1024), mock.patch.object(
+                    rollout_tailer, "_MIN_BUDGET_CHUNK_BYTES", 1024
+                ):
+                    w._poll_follow_files()
+            finally:
+                for cur in w._cursors.values():
+                    close_cursor_fd(cur)
+            self.assertEqual(len(seen), 5002)
+            self.assertLess(seen.index(b"s2"), 400)
+            big_lines = [b for b in seen if b.startswith(b"b")]
+            self.assertEqual(big_lines, [b"b%05d" % i for i in range(5000)])
+            self.assertEqual(w._cursors[big].offset, big.stat().st_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -40,7 +40,8 @@ export function bufferForKey(state, key, msg) {
         const pop = String((prev.op) ? prev.op : "").trim().toLowerCase();
         const pid = (typeof prev.id === "string") ? prev.id : "";
         if (pop === "update" && pid === mid) {
-          buf[i] = msg;
+          // Field-level deltas: later fields win, earlier patched fields are kept.
+          buf[i] = Object.assign({}, prev, msg);
           state.sseByKey.set(k, buf);
           return;
         }
@@ -68,7 +69,7 @@ export function pushPending(state, msg) {
         const pop = String((prev.op) ? prev.op : "").trim().toLowerCase();
         const pid = (typeof prev.id === "string") ? prev.id : "";
         if (pop === "update" && pid === mid) {
-          buf[i] = msg;
+          buf[i] = Object.assign({}, prev, msg);
           return;
         }
       }
@@ -1,5 +1,5 @@
 import { keyOf, safeDomId } from "../utils.js";
-import { applyMsgToList } from "./timeline.js";
+import { applyMsgToList, mergeUpdate } from "./timeline.js";
 import { bufferForKey, pushPending, shouldBufferKey } from "./buffer.js";
 import { dismissCorner, notifyCorner } from "../utils/notify.js";
 import { flashToastAt } from "../utils/toast.js";
@@ -455,7 +455,10 @@ function _summarizeToolGateMsg(msg) {
 }
 
 export function connectEventStream(dom, state, upsertThread, renderTabs, renderMessage, setStatus, refreshList) {
-  state.uiEventSource = new EventSource("/events");
+  // delta=1: op=update events carry only the patched fields (merged via mergeUpdate).
+  // batch=1: several queued messages may arrive as one `event: batch` frame.
+  state.sseDelta = true;
+  state.uiEventSource = new EventSource("/events?delta=1&batch=1");
 
   let _tabsTimer = 0;
   let _tabsDirty = false;
@@ -505,6 +508,16 @@ export function connectEventStream(dom, state, upsertThread, renderTabs, renderM
 
   function _handleMsg(msg) {
     try {
+      const full = mergeUpdate(state, msg);
+      if (!full) {
+        // Delta without a base (evicted and not rendered): its thread is already marked for a
+        // refresh from source, so don't route/buffer the field-only patch as a message.
+        const mid = (msg && typeof msg.id === "string") ? msg.id : "";
+        try { if (mid && state.translateInFlight && typeof state.translateInFlight.delete === "function") state.translateInFlight.delete(mid); } catch (_) {}
+        try { if (mid && state.retranslatePending && typeof state.retranslatePending.delete === "function") state.retranslatePending.delete(mid); } catch (_) {}
+        return;
+      }
+      msg = full;
       const op = String((msg && msg.op) ? msg.op : "").trim().toLowerCase();
       // Clear manual translate in-flight state as soon as ZH arrives, so render can flip status immediately.
       try {
@@ -681,39 +694,67 @@ export function connectEventStream(dom, state, upsertThread, renderTabs, renderM
       state.sseHadError = false;
 
       // Only resync after a real disconnect/reconnect (avoid double-refresh on initial connect).
-      if (ever && hadError) {
-        try { setStatus(dom, "连接已恢复，正在同步…"); } catch (_) {}
-        try {
-          state.threadsDirty = true;
-          state.threadsLastSyncMs = 0;
-        } catch (_) {}
-
-        // Mark cached views as overflow so switching will refresh from source.
-        try {
-          if (state.viewCache && typeof state.viewCache.keys === "function") {
-            if (!state.sseOverflow || typeof state.sseOverflow.add !== "function") state.sseOverflow = new Set();
-            for (const k of state.viewCache.keys()) {
-              if (k && k !== "all") state.sseOverflow.add(k);
-            }
-          }
-        } catch (_) {}
-        // Drop buffered SSE during reconnect; we'll resync from source.
-        try { if (state.sseByKey && typeof state.sseByKey.clear === "function") state.sseByKey.clear(); } catch (_) {}
+      if (ever && hadError) _resyncFromSource("连接已恢复，正在同步…");
+    } catch (_) {}
+  });
 
-        try { Promise.resolve(refreshList()).catch(() => {}); } catch (_) {}
+  function _resyncFromSource(label) {
+    try { setStatus(dom, label); } catch (_) {}
+    try {
+      state.threadsDirty = true;
+      state.threadsLastSyncMs = 0;
+    } catch (_) {}
+
+    // Mark cached views as overflow so switching will refresh from source.
+    try {
+      if (state.viewCache && typeof state.viewCache.keys === "function") {
+        if (!state.sseOverflow || typeof state.sseOverflow.add !== "function") state.sseOverflow = new Set();
+        for (const k of state.viewCache.keys()) {
+          if (k && k !== "all") state.sseOverflow.add(k);
+        }
       }
     } catch (_) {}
-  });
+    // Drop buffered SSE; we'll resync from source.
+    try { if (state.sseByKey && typeof state.sseByKey.clear === "function") state.sseByKey.clear(); } catch (_) {}
 
-  state.uiEventSource.addEventListener("message", (ev) => {
+    try { Promise.resolve(refreshList()).catch(() => {}); } catch (_) {}
+  }
+
+  // Server-side subscriber queue overflowed (this tab fell behind and events were dropped):
+  // reload from /api/messages instead of silently missing updates.
+  state.uiEventSource.addEventListener("resync", () => {
     try {
-      const msg = JSON.parse(ev.data);
       if (state && typeof state === "object" && state.isRefreshing) {
-        pushPending(state, msg);
+        state.ssePendingOverflow = true;
         _scheduleFlush(50);
         return;
       }
-      _handleMsg(msg);
+      _resyncFromSource("事件积压，正在同步…");
+    } catch (_) {}
+  });
+
+  function _onStreamMsg(msg) {
+    if (state && typeof state === "object" && state.isRefreshing) {
+      pushPending(state, msg);
+      _scheduleFlush(50);
+      return;
+    }
+    _handleMsg(msg);
+  }
+
+  state.uiEventSource.addEventListener("message", (ev) => {
+    try {
+      _onStreamMsg(JSON.parse(ev.data));
+    } catch (e) {}
+  });
+  // batch=1: the server coalesces queued messages into one JSON array per flush (replay/import).
+  state.uiEventSource.addEventListener("batch", (ev) => {
+    try {
+      const msgs = JSON.parse(ev.data);
+      if (!Array.isArray(msgs)) return;
+      for (const msg of msgs) {
+        try { _onStreamMsg(msg); } catch (_) {}
+      }
     } catch (e) {}
   });
   state.uiEventSource.addEventListener("error", () => {
@@ -1,4 +1,4 @@
-import { tsToMs } from "../utils.js";
+import { keyOf, tsToMs } from "../utils.js";
 
 function _cmpKey(a, b) {
   const ta = a && a.ms;
@@ -37,10 +37,77 @@ function _findInsertIndex(timeline, item) {
   return lo;
 }
 
+// Latest full message per id (bounded): base for field-level op=update deltas.
+const _MSG_STORE_MAX = 2000;
+
+export function rememberMsg(state, msg) {
+  if (!state || typeof state !== "object") return;
+  const mid = (msg && typeof msg.id === "string") ? msg.id : "";
+  if (!mid) return;
+  if (!state.msgById || typeof state.msgById.get !== "function") state.msgById = new Map();
+  const store = state.msgById;
+  if (store.has(mid)) store.delete(mid);
+  store.set(mid, msg);
+  while (store.size > _MSG_STORE_MAX) {
+    const oldest = store.keys().next().value;
+    store.delete(oldest);
+  }
+}
+
+function _markKeyForResync(state, msg) {
+  const k = keyOf(msg);
+  if (!k || k === "unknown" || k === "all") return;
+  if (!state.sseOverflow || typeof state.sseOverflow.add !== "function") state.sseOverflow = new Set();
+  state.sseOverflow.add(k);
+  try { if (state.sseByKey && typeof state.sseByKey.delete === "function") state.sseByKey.delete(k); } catch (_) {}
+}
+
+// Apply an op=update onto the remembered message (adds are remembered as-is).
+// Delta streams (`/events?delta=1`) only carry the patched fields + id/seq/routing fields:
+// when the bounded store already evicted the base, fall back to the message the rendered row was
+// built from; if the row is not rendered either, mark its thread key so the view is refreshed from
+// source on the next switch (same path as `resync`) and return null.
+export function mergeUpdate(state, msg) {
+  if (!msg || typeof msg !== "object") return msg;
+  const op = String(msg.op ? msg.op : "").trim().toLowerCase();
+  const mid = (typeof msg.id === "string") ? msg.id : "";
+  if (op !== "update") {
+    rememberMsg(state, msg);
+    return msg;
+  }
+  if (!mid) return msg;
+  const store = (state && state.msgById && typeof state.msgById.get === "function") ? state.msgById : null;
+  let base = store ? store.get(mid) : null;
+  if (!base) {
+    try {
+      const row = (state && state.rowIndex && typeof state.rowIndex.get === "function") ? state.rowIndex.get(mid) : null;
+      const rowMsg = row ? row.__msg : null;
+      if (rowMsg && typeof rowMsg === "object" && rowMsg.id === mid) base = rowMsg;
+    } catch (_) {}
+  }
+  if (!base) {
+    if (!(state && state.sseDelta)) return msg;
+    try { _markKeyForResync(state, msg); } catch (_) {}
+    return null;
+  }
+  const merged = Object.assign({}, base, msg);
+  const stored = Object.assign({}, merged);
+  delete stored.op;
+  rememberMsg(state, stored);
+  return merged;
+}
+
 export function applyMsgToList(dom, state, msg, renderMessage) {
   const op = String((msg && msg.op) ? msg.op : "").trim().toLowerCase();
   const mid = (msg && typeof msg.id === "string") ? msg.id : "";
 
+  if (op === "update") {
+    msg = mergeUpdate(state, msg);
+    if (!msg) return;
+  } else {
+    rememberMsg(state, msg);
+  }
+
   if (op === "update" && mid && state.rowIndex && state.rowIndex.has(mid)) {
     const oldRow = state.rowIndex.get(mid);
     renderMessage(dom, state, msg, { patchEl: oldRow });
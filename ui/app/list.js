@@ -1,3 +1,3 @@
 export { refreshList } from "./list/refresh.js";
 export { bootstrap } from "./list/bootstrap.js";
-
+export { loadOlderPage, wireOlderPageLoader } from "./list/older.js";
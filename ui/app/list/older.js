@@ -0,0 +1,49 @@
+import { applyMsgToList } from "../events/timeline.js";
+import { backfillOfflineZh, indexToolCalls } from "./refresh.js";
+
+// 滚动到顶部附近时按 prev 游标加载更早一页（before=seq / 离线为行号），并保持视口锚定。
+export async function loadOlderPage(dom, state, renderMessage) {
+  if (!state || typeof state !== "object") return false;
+  if (state.isRefreshing) return false;
+  const key = String(state.currentKey || "");
+  const cur = (state.olderCursor && typeof state.olderCursor.get === "function") ? state.olderCursor.get(key) : null;
+  if (!cur || cur.before == null || cur.loading) return false;
+  const token = Number(state.refreshToken) || 0;
+  cur.loading = true;
+  try {
+    const url = `${cur.base}before=${encodeURIComponent(cur.before)}&limit=${encodeURIComponent(cur.limit)}`;
+    const resp = await fetch(url);
+    const data = await resp.json();
+    // 期间切换了会话或触发了全量刷新：丢弃该页（新视图有自己的游标）。
+    if (String(state.currentKey || "") !== key || (Number(state.refreshToken) || 0) !== token) return false;
+    const msgs = Array.isArray(data && data.messages) ? data.messages : [];
+    backfillOfflineZh(state, msgs);
+    indexToolCalls(state, msgs);
+    const h0 = document.body.scrollHeight;
+    const y0 = Number(window.scrollY) || 0;
+    for (const m of msgs) {
+      try { applyMsgToList(dom, state, m, renderMessage); } catch (_) {}
+    }
+    try { window.scrollTo(0, y0 + (document.body.scrollHeight - h0)); } catch (_) {}
+    cur.before = (data && data.prev != null) ? data.prev : null;
+    return msgs.length > 0;
+  } catch (_) {
+    return false;
+  } finally {
+    cur.loading = false;
+  }
+}
+
+export function wireOlderPageLoader(dom, state, renderMessage) {
+  let scheduled = false;
+  const check = () => {
+    scheduled = false;
+    if ((Number(window.scrollY) || 0) > 240) return;
+    loadOlderPage(dom, state, renderMessage);
+  };
+  window.addEventListener("scroll", () => {
+    if (scheduled) return;
+    scheduled = true;
+    requestAnimationFrame(check);
+  }, { passive: true });
+}
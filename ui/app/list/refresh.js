@@ -1,6 +1,7 @@
 import { inferToolName, parseToolCallText } from "../format.js";
 import { keyOf, safeJsonParse, tsToMs } from "../utils.js";
 import { refreshThreads } from "./threads.js";
+import { rememberMsg } from "../events/timeline.js";
 import { isOfflineKey, offlineRelFromKey } from "../offline.js";
 import { saveOfflineShowList, upsertOfflineShow } from "../offline_show.js";
 import { loadOfflineZhMap } from "../offline_zh.js";
@@ -18,6 +19,66 @@ function _yieldToBrowser(timeoutMs = 120) {
   });
 }
 
+export const LIVE_PAGE_LIMIT = 300;
+
+export function setOlderCursor(state, key, cursor) {
+  if (!state || typeof state !== "object") return;
+  if (!state.olderCursor || typeof state.olderCursor.get !== "function") state.olderCursor = new Map();
+  const k = String(key || "");
+  if (!k) return;
+  if (cursor && typeof cursor === "object") state.olderCursor.set(k, cursor);
+  else state.olderCursor.delete(k);
+}
+
+// 离线会话：回填本地译文缓存（localStorage offlineZh:${rel} + 内存 Map），不依赖后端 SidecarState。
+export function backfillOfflineZh(state, msgs) {
+  try {
+    if (isOfflineKey(state.currentKey)) {
+      const rel = offlineRelFromKey(state.currentKey);
+      const fromLs = rel ? loadOfflineZhMap(rel) : {};
+      if (!state.offlineZhById || typeof state.offlineZhById.get !== "function") state.offlineZhById = new Map();
+      for (const m of msgs) {
+        if (!m || typeof m !== "object") continue;
+        if (String(m.kind || "") !== "reasoning_summary") continue;
+        const mid = String(m.id || "").trim();
+        if (!mid) continue;
+        const curZh = String(m.zh || "").trim();
+        if (curZh) continue;
+
+        let zh = "";
+        try { zh = String(fromLs && fromLs[mid] ? fromLs[mid] : "").trim(); } catch (_) { zh = ""; }
+        if (!zh) {
+          const cached = state.offlineZhById.get(mid);
+          if (cached && typeof cached === "object") {
+            zh = String(cached.zh || "").trim();
+            const err = String(cached.err || "").trim();
+            if (err) m.translate_error = err;
+          }
+        }
+        if (zh) {
+          m.zh = zh;
+          try { state.offlineZhById.set(mid, { zh, err: "" }); } catch (_) {}
+        }
+      }
+    }
+  } catch (_) {}
+}
+
+export function indexToolCalls(state, msgs) {
+  for (const m of msgs) {
+    try {
+      if (!m || m.kind !== "tool_call") continue;
+      const parsed = parseToolCallText(m.text || "");
+      let toolName = parsed.toolName || "";
+      const callId = parsed.callId || "";
+      const argsRaw = parsed.argsRaw || "";
+      const argsObj = safeJsonParse(argsRaw);
+      toolName = inferToolName(toolName, argsRaw, argsObj);
+      if (callId) state.callIndex.set(callId, { tool_name: toolName, args_raw: argsRaw, args_obj: argsObj });
+    } catch (_) {}
+  }
+}
+
 export async function refreshList(dom, state, renderTabs, renderMessage, renderEmpty) {
   const token = (state && typeof state === "object")
     ? (state.refreshToken = (Number(state.refreshToken) || 0) + 1)
@@ -37,23 +98,35 @@ export async function refreshList(dom, state, renderTabs, renderMessage, renderE
     if (state && typeof state === "object") state.refreshAbort = ac;
 
     let url = "/api/messages";
+    // 分页：先取最新一页，更早的历史由滚动到顶部时按 prev 游标加载（见 older.js）。
+    // 前端过滤的 key（file/unknown）仍取全量，避免分页后过滤出稀疏页。
+    let pageBase = "/api/messages?";
+    let pageLimit = LIVE_PAGE_LIMIT;
     // 当前 key 为 thread_id 时，走服务端过滤；否则退化为前端过滤（例如 key=file/unknown）
     if (state.currentKey !== "all") {
+      pageBase = "";
       if (isOfflineKey(state.currentKey)) {
         const rel = offlineRelFromKey(state.currentKey);
         const tail = Math.max(0, Number(state.replayLastLines) || 0) || 200;
-        url = `/api/offline/messages?rel=${encodeURIComponent(rel)}&tail_lines=${encodeURIComponent(tail)}`;
+        pageBase = `/api/offline/messages?rel=${encodeURIComponent(rel)}&`;
+        pageLimit = tail;
       } else {
       const t = state.threadIndex.get(state.currentKey);
       if (t && t.thread_id) {
-        url = `/api/messages?thread_id=${encodeURIComponent(t.thread_id)}`;
+        pageBase = `/api/messages?thread_id=${encodeURIComponent(t.thread_id)}&`;
       }
       }
     }
+    if (pageBase) url = `${pageBase}limit=${encodeURIComponent(pageLimit)}`;
     const resp = await fetch(url, ac ? { signal: ac.signal } : undefined);
     if (token && state && state.refreshToken !== token) return;
     const data = await resp.json();
     const msgs = (data.messages || []);
+    setOlderCursor(state, state.currentKey, pageBase ? {
+      base: pageBase,
+      limit: pageLimit,
+      before: (data && data.prev != null) ? data.prev : null,
+    } : null);
     // 离线会话：回填“展示中”元信息（file/thread_id），便于标签与导出（不污染 threadIndex）。
     try {
       if (isOfflineKey(state.currentKey)) {
@@ -85,37 +158,7 @@ export async function refreshList(dom, state, renderTabs, renderMessage, renderE
         }
       }
     } catch (_) {}
-    // 离线会话：回填本地译文缓存（localStorage offlineZh:${rel} + 内存 Map），不依赖后端 SidecarState。
-    try {
-      if (isOfflineKey(state.currentKey)) {
-        const rel = offlineRelFromKey(state.currentKey);
-        const fromLs = rel ? loadOfflineZhMap(rel) : {};
-        if (!state.offlineZhById || typeof state.offlineZhById.get !== "function") state.offlineZhById = new Map();
-        for (const m of msgs) {
-          if (!m || typeof m !== "object") continue;
-          if (String(m.kind || "") !== "reasoning_summary") continue;
-          const mid = String(m.id || "").trim();
-          if (!mid) continue;
-          const curZh = String(m.zh || "").trim();
-          if (curZh) continue;
-
-          let zh = "";
-          try { zh = String(fromLs && fromLs[mid] ? fromLs[mid] : "").trim(); } catch (_) { zh = ""; }
-          if (!zh) {
-            const cached = state.offlineZhById.get(mid);
-            if (cached && typeof cached === "object") {
-              zh = String(cached.zh || "").trim();
-              const err = String(cached.err || "").trim();
-              if (err) m.translate_error = err;
-            }
-          }
-          if (zh) {
-            m.zh = zh;
-            try { state.offlineZhById.set(mid, { zh, err: "" }); } catch (_) {}
-          }
-        }
-      }
-    } catch (_) {}
+    backfillOfflineZh(state, msgs);
     state.callIndex.clear();
     if (state.rowIndex) state.rowIndex.clear();
     if (state.timeline && Array.isArray(state.timeline)) state.timeline.length = 0;
@@ -147,18 +190,7 @@ export async function refreshList(dom, state, renderTabs, renderMessage, renderE
       .map(x => x.m);
 
     // Pre-index tool_call so tool_output can always resolve tool_name even if order is odd.
-    for (const m of filtered) {
-      try {
-        if (!m || m.kind !== "tool_call") continue;
-        const parsed = parseToolCallText(m.text || "");
-        let toolName = parsed.toolName || "";
-        const callId = parsed.callId || "";
-        const argsRaw = parsed.argsRaw || "";
-        const argsObj = safeJsonParse(argsRaw);
-        toolName = inferToolName(toolName, argsRaw, argsObj);
-        if (callId) state.callIndex.set(callId, { tool_name: toolName, args_raw: argsRaw, args_obj: argsObj });
-      } catch (_) {}
-    }
+    indexToolCalls(state, filtered);
 
     state.lastRenderedMs = NaN;
     if (filtered.length === 0) renderEmpty(dom);
@@ -170,6 +202,7 @@ export async function refreshList(dom, state, renderTabs, renderMessage, renderE
       for (let i = 0; i < filtered.length; i++) {
         if (token && state && state.refreshToken !== token) return;
         const m = filtered[i];
+        rememberMsg(state, m);
         const deferDecorate = (filtered.length - i) > tailImmediate;
         renderMessage(dom, state, m, { list: frag, autoscroll: false, deferDecorate });
         const ms = tsToMs(m && m.ts);
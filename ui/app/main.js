@@ -1,7 +1,7 @@
 import { getDom } from "./dom.js";
 import { connectEventStream, drainBufferedForKey } from "./events.js";
 import { loadControl, maybeAutoStartOnce, setStatus, wireControlEvents } from "./control.js";
-import { bootstrap, refreshList } from "./list.js";
+import { bootstrap, refreshList, wireOlderPageLoader } from "./list.js";
 import { renderEmpty, renderMessage } from "./render.js";
 import { createState } from "./state.js";
 import { renderTabs, upsertThread } from "./sidebar.js";
@@ -147,4 +147,5 @@ export async function initApp() {
 
   await bootstrap(dom, state, renderTabsWrapper, renderMessage, renderEmpty);
   connectEventStream(dom, state, upsertThread, renderTabsWrapper, renderMessage, setStatus, refreshListWrapper);
+  wireOlderPageLoader(dom, state, renderMessage);
 }
@@ -180,6 +180,8 @@ export function renderMessage(dom, state, msg, opts = {}) {
   else decorateRow(row);
   if (mid) {
     row.dataset.msgId = mid;
+    // Base for op=update deltas once the bounded message store has evicted this id.
+    try { row.__msg = msg; } catch (_) {}
     try { row.id = `msg_${safeDomId(mid)}`; } catch (_) {}
   }
   if (replaceTarget && replaceTarget.parentNode === list) list.replaceChild(row, replaceTarget);
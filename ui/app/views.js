@@ -24,6 +24,7 @@ function _evictIfNeeded(dom, state, activeKey) {
     cache.delete(victim);
     try { if (state.sseByKey && typeof state.sseByKey.delete === "function") state.sseByKey.delete(victim); } catch (_) {}
     try { if (state.sseOverflow && typeof state.sseOverflow.delete === "function") state.sseOverflow.delete(victim); } catch (_) {}
+    try { if (state.olderCursor && typeof state.olderCursor.delete === "function") state.olderCursor.delete(victim); } catch (_) {}
     if (v && v.el && v.el.parentNode) {
       try { v.el.parentNode.removeChild(v.el); } catch (_) {}
     }
@@ -131,6 +132,7 @@ export function clearViews(dom, state) {
   }
   state.viewCache = new Map();
   state.viewLru = [];
+  state.olderCursor = new Map();
   state.activeList = null;
   state.activeViewKey = "";
   dom.list = host;